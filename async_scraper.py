@@ -0,0 +1,184 @@
+import asyncio
+import logging
+
+try:
+    import aiohttp
+except ImportError:  # 可选依赖，只有使用异步抓取引擎时才需要
+    aiohttp = None
+
+from page_fetcher import DEFAULT_HEADERS, classify_page
+from parse_pipeline import parse_page
+from rate_limiter import AdaptiveRateLimiter
+from company_cache import CompanyCache, normalize_company_url
+from job_extractors import new_company_data, is_training_ad, merge_company_details
+
+
+class NeedsBrowser(Exception):
+    """HTTP拿不到可用页面（验证码、页面不完整或请求失败），该职位需要交给浏览器抓取"""
+
+    def __init__(self, url, reason):
+        super().__init__(f"需要浏览器抓取({reason}): {url}")
+        self.url = url
+        self.reason = reason
+
+
+class AsyncHttpFetcher:
+    """基于aiohttp的异步页面获取，所有请求复用同一个连接池"""
+
+    def __init__(self, timeout=8, limit=100):
+        if aiohttp is None:
+            raise ImportError("异步抓取引擎需要安装aiohttp: pip install aiohttp")
+        self.timeout = timeout
+        self.limit = limit
+        self.session = None
+
+    async def fetch(self, url, kind):
+        """GET页面，返回 (结果, HTML)；结果为 ok/captcha/incomplete/error，只有ok时返回HTML"""
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                headers=DEFAULT_HEADERS,
+                connector=aiohttp.TCPConnector(limit=self.limit),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        try:
+            async with self.session.get(url) as response:
+                if response.status != 200:
+                    return "error", None
+                body = await response.read()
+                # 响应头未声明编码时按UTF-8解码，与HttpPageFetcher一致
+                page_source = body.decode(response.charset or 'utf-8', errors='replace')
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logging.info(f"异步获取页面失败: {e}")
+            return "error", None
+        result = classify_page(page_source, kind)
+        return result, page_source if result == "ok" else None
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+
+class AsyncEnhanced58JobScraper:
+    """基于asyncio的详情页抓取引擎
+
+    职位链接进入异步队列，concurrency个协程并发获取详情页和企业页，等待网络期间不占用线程；
+    HTML解析交给执行器（ParsePipeline的进程池，或事件循环默认的线程池），企业缓存的查询和写入
+    也在执行器中进行。解析和合并使用与Enhanced58JobScraper相同的函数，得到相同的job_data。
+    没有浏览器：HTTP拿不到可用页面的职位返回给调用方，由浏览器逐个抓取。
+    """
+
+    def __init__(self, concurrency=50, company_cache=None, parser=None, rate_limiter=None,
+                 parse_pipeline=None, fetcher=None):
+        self.concurrency = concurrency
+        self.company_cache = company_cache if company_cache is not None else CompanyCache()
+        self.parser = parser
+        self.rate_limiter = rate_limiter if rate_limiter is not None else AdaptiveRateLimiter()
+        self.executor = parse_pipeline.executor if parse_pipeline else None
+        self.fetcher = fetcher if fetcher is not None else AsyncHttpFetcher()
+        # 企业链接 -> 正在进行的企业详情任务，同一企业的多个职位并发出现时只抓取一次
+        self._company_tasks = {}
+        self.stats = {}
+
+    def count(self, kind, result):
+        """累加某类页面各种获取结果的次数"""
+        kind_stats = self.stats.setdefault(kind, {})
+        kind_stats[result] = kind_stats.get(result, 0) + 1
+
+    async def fetch_page_source(self, url, kind):
+        """按访问频率控制等待后获取页面，拿不到可用页面时抛出NeedsBrowser"""
+        await self.rate_limiter.wait_async(url)
+        result, page_source = await self.fetcher.fetch(url, kind)
+        self.count(kind, result)
+        if result == "ok":
+            self.rate_limiter.record_success(url)
+            return page_source
+        if result == "captcha":
+            self.rate_limiter.record_captcha(url)
+        raise NeedsBrowser(url, result)
+
+    async def parse(self, kind, page_source):
+        """在执行器中解析HTML，不阻塞事件循环"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, parse_page, kind, page_source, self.parser)
+
+    async def scrape_job_detail_page(self, job_url):
+        """抓取职位详情页及企业信息，返回与Enhanced58JobScraper.scrape_job_detail_page相同的job_data"""
+        page_source = await self.fetch_page_source(job_url, "detail")
+        # 解析出错时抛出异常，由on_result记为失败，不当作空数据保存
+        job_data, company_url = await self.parse("detail", page_source)
+        return await self.complete_job_data(job_data, company_url)
+
+    async def complete_job_data(self, job_data, company_url):
+        """过滤培训广告并合并企业详细信息，跳过的职位返回None"""
+        if is_training_ad(job_data):
+            logging.info(f"× 跳过培训广告职位: {job_data['岗位名称']}")
+            return None
+        if company_url and job_data["企业名称"]:
+            merge_company_details(job_data, await self.get_company_details(company_url))
+        return job_data
+
+    async def get_company_details(self, company_url):
+        """查询企业缓存，未命中时抓取企业详情页（同一企业同时只抓取一次）"""
+        key = normalize_company_url(company_url)
+        task = self._company_tasks.get(key)
+        if task is None:
+            task = self._company_tasks[key] = asyncio.ensure_future(self._load_company(company_url))
+            task.add_done_callback(lambda _: self._company_tasks.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _load_company(self, company_url):
+        loop = asyncio.get_running_loop()
+        company_details = await loop.run_in_executor(None, self.company_cache.get, company_url)
+        if company_details is not None:
+            return company_details
+        page_source = await self.fetch_page_source(company_url, "company")
+        try:
+            company_details = await self.parse("company", page_source)
+        except Exception as e:
+            logging.info(f"解析企业详情页失败: {e}")
+            company_details = new_company_data()
+        # 只缓存抓取到内容的企业，抓取失败的下次重试；新的企业链接按信用码并入已缓存的同一企业
+        if any(company_details.values()):
+            company_details = await loop.run_in_executor(None, self.company_cache.merge_known, company_details)
+            await loop.run_in_executor(None, self.company_cache.put, company_url, company_details)
+        return company_details
+
+    async def scrape_job_details(self, job_links, on_result):
+        """并发抓取一批详情页，返回需要浏览器抓取的链接（保持原始顺序）
+
+        on_result(序号, 链接, job_data, 异常) 按完成顺序在事件循环所在线程中调用，
+        与详情页抓取工作池的回调一致。
+        """
+        queue = asyncio.Queue()
+        for item in enumerate(job_links, 1):
+            queue.put_nowait(item)
+        needs_browser = []
+
+        async def worker():
+            while not queue.empty():
+                i, link = queue.get_nowait()
+                try:
+                    job_data = await self.scrape_job_detail_page(link)
+                except NeedsBrowser as e:
+                    logging.info(str(e))
+                    needs_browser.append((i, link))
+                    continue
+                except Exception as e:
+                    on_result(i, link, None, e)
+                    continue
+                on_result(i, link, job_data, None)
+
+        await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(job_links)))))
+        return [link for _, link in sorted(needs_browser)]
+
+    def run(self, job_links, on_result):
+        """在当前线程中运行事件循环抓取一批详情页，返回需要浏览器抓取的链接"""
+        return asyncio.run(self._run(job_links, on_result))
+
+    async def _run(self, job_links, on_result):
+        try:
+            return await self.scrape_job_details(job_links, on_result)
+        finally:
+            # 连接池绑定在本次事件循环上，结束时关闭
+            await self.fetcher.close()
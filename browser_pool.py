@@ -0,0 +1,345 @@
+import os
+import queue
+import shutil
+import threading
+import logging
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from page_fetcher import USER_AGENT
+
+# 缓存已解析的ChromeDriver路径，之后启动时不再联网查找
+DRIVER_PATH_CACHE = ".chromedriver_path"
+
+# 按资源类别划分的屏蔽规则（Network.setBlockedURLs 的通配符模式）
+RESOURCE_PATTERNS = {
+    "image": ["*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.svg*", "*.ico*"],
+    "font": ["*.woff*", "*.ttf*", "*.otf*", "*.eot*"],
+    "media": ["*.mp4*", "*.webm*", "*.mp3*", "*.m3u8*", "*.flv*"],
+    "stylesheet": ["*.css*"],
+    "tracker": ["*tracklog.58.com*", "*hm.baidu.com*", "*pos.baidu.com*", "*cpro.baidustatic.com*",
+                "*cnzz.com*", "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*"],
+}
+# 默认屏蔽的资源类别：只读取DOM，不需要图片、字体、媒体、样式和统计脚本
+DEFAULT_BLOCKED_RESOURCES = ("image", "font", "media", "stylesheet", "tracker")
+
+# 页面加载指标：传输字节数（主文档+子资源）、子资源数、DOMContentLoaded耗时
+PAGE_METRICS_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+return {
+    bytes: (nav ? nav.transferSize : 0) + resources.reduce((total, entry) => total + (entry.transferSize || 0), 0),
+    resources: resources.length,
+    dom_ready_ms: nav ? Math.round(nav.domContentLoadedEventEnd - nav.startTime) : null
+};
+"""
+
+
+def blocked_url_patterns(block=DEFAULT_BLOCKED_RESOURCES, allow=()):
+    """根据屏蔽列表和放行列表生成URL屏蔽模式
+
+    两个列表的元素既可以是资源类别（RESOURCE_PATTERNS的键），也可以是通配符模式；
+    放行列表优先，例如 block=("image", "*ads.58.com*"), allow=("*.png*",)。
+    """
+    def expand(names):
+        patterns = []
+        for name in names:
+            patterns.extend(RESOURCE_PATTERNS.get(name, [name]))
+        return patterns
+
+    allowed = set(expand(allow))
+    patterns = []
+    for pattern in expand(block):
+        if pattern not in allowed and pattern not in patterns:
+            patterns.append(pattern)
+    return patterns
+
+
+def apply_resource_blocking(driver, patterns):
+    """通过DevTools协议在网络层屏蔽匹配的请求，返回是否生效"""
+    if not patterns:
+        return False
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+        return True
+    except Exception as e:
+        logging.info(f"设置资源屏蔽失败: {e}")
+        return False
+
+
+def page_metrics(driver):
+    """读取当前页面的传输字节数和DOM就绪耗时，读取失败时返回None"""
+    try:
+        return driver.execute_script(PAGE_METRICS_SCRIPT)
+    except Exception:
+        return None
+
+
+class PageLoadStats:
+    """浏览器页面加载统计（按页面类型），多个浏览器工作线程共享同一个实例"""
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, kind, seconds, metrics=None):
+        with self._lock:
+            stats = self._stats.setdefault(kind, {"pages": 0, "seconds": 0.0, "bytes": 0})
+            stats["pages"] += 1
+            stats["seconds"] += seconds
+            if metrics:
+                stats["bytes"] += metrics.get("bytes") or 0
+
+    def summary(self):
+        """各类页面的页数、平均加载时间（秒）和平均传输量（KB）"""
+        with self._lock:
+            return {
+                kind: {
+                    "pages": stats["pages"],
+                    "avg_seconds": round(stats["seconds"] / stats["pages"], 2),
+                    "avg_kb": round(stats["bytes"] / stats["pages"] / 1024, 1),
+                }
+                for kind, stats in self._stats.items()
+            }
+
+
+def build_chrome_options(headless=True, user_data_dir=None, page_load_strategy="eager"):
+    """构建爬虫使用的Chrome选项"""
+    options = Options()
+    # eager：DOMContentLoaded后即返回，不等待图片等子资源全部加载
+    options.page_load_strategy = page_load_strategy
+    if headless:
+        options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-plugins")
+    options.add_argument("--disable-images")
+    # 禁用GPU相关错误信息
+    options.add_argument("--disable-gpu-sandbox")
+    options.add_argument("--disable-software-rasterizer")
+    options.add_argument("--disable-background-timer-throttling")
+    options.add_argument("--disable-backgrounding-occluded-windows")
+    options.add_argument("--disable-renderer-backgrounding")
+    options.add_argument("--disable-features=TranslateUI")
+    options.add_argument("--disable-ipc-flooding-protection")
+    # 禁用WebGL相关错误
+    options.add_argument("--disable-webgl")
+    options.add_argument("--disable-webgl2")
+    # 设置日志级别来减少错误输出
+    options.add_argument("--log-level=3")
+    options.add_argument("--silent")
+    options.add_argument("--disable-logging")
+    options.add_argument("--disable-dev-tools")
+    # options.add_argument("--disable-javascript")  # 注释掉，因为很多网站需要JavaScript
+    options.add_argument("--window-size=1920,1080")
+    # 添加更多性能优化选项
+    options.add_argument("--disable-web-security")
+    options.add_argument("--disable-features=VizDisplayCompositor")
+    options.add_argument("--disable-background-timer-throttling")
+    options.add_argument("--disable-renderer-backgrounding")
+    options.add_argument("--disable-backgrounding-occluded-windows")
+    options.add_argument("--disable-ipc-flooding-protection")
+    # 禁用CSS和字体加载以提高速度
+    prefs = {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+        "profile.managed_default_content_settings.stylesheets": 2
+    }
+    options.add_experimental_option("prefs", prefs)
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    options.add_argument(f"--user-agent={USER_AGENT}")
+    if user_data_dir:
+        # 持久化的浏览器配置目录，cookie等状态在浏览器重启和多次运行之间保留
+        options.add_argument(f"--user-data-dir={os.path.abspath(user_data_dir)}")
+    return options
+
+
+def resolve_driver_path(cache_file=DRIVER_PATH_CACHE):
+    """返回ChromeDriver路径：优先使用缓存，其次系统PATH，最后用webdriver-manager下载一次并缓存"""
+    if os.path.exists(cache_file):
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cached_path = f.read().strip()
+        if cached_path and os.path.isfile(cached_path):
+            return cached_path
+
+    driver_path = shutil.which("chromedriver")
+    if not driver_path:
+        try:
+            from webdriver_manager.chrome import ChromeDriverManager
+            driver_path = ChromeDriverManager().install()
+        except Exception as e:
+            logging.info(f"webdriver-manager获取ChromeDriver失败，交给Selenium自行查找: {e}")
+            return None
+
+    with open(cache_file, 'w', encoding='utf-8') as f:
+        f.write(driver_path)
+    return driver_path
+
+
+# 本进程中解析过的ChromeDriver路径（解析失败时为None，同样不再重试）
+_driver_path_lock = threading.Lock()
+_resolved_driver_path = []
+
+
+def get_driver_path():
+    """第一次启动浏览器时才解析ChromeDriver路径，结果（包括失败）在进程内缓存，之后的会话池不再联网查找"""
+    with _driver_path_lock:
+        if not _resolved_driver_path:
+            _resolved_driver_path.append(resolve_driver_path())
+        return _resolved_driver_path[0]
+
+
+def create_driver(options, driver_path=None, blocked_urls=None):
+    """启动Chrome并做统一的初始设置"""
+    if driver_path:
+        driver = webdriver.Chrome(service=Service(driver_path), options=options)
+    else:
+        driver = webdriver.Chrome(options=options)
+    # 设置页面加载超时
+    driver.set_page_load_timeout(15)  # 减少页面加载超时时间
+    # 不设置隐式等待：每次查找元素失败都会白等隐式等待时间，页面就绪由page_waits显式等待
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    apply_resource_blocking(driver, blocked_urls)
+    return driver
+
+
+# 本进程中正在使用的配置目录，同一个user-data-dir不能同时被两个Chrome使用
+_profiles_in_use = set()
+_profiles_lock = threading.Lock()
+
+
+def _claim_profile(profile_root):
+    with _profiles_lock:
+        n = 0
+        while os.path.join(profile_root, f"profile-{n}") in _profiles_in_use:
+            n += 1
+        path = os.path.join(profile_root, f"profile-{n}")
+        _profiles_in_use.add(path)
+    return path
+
+
+def _release_profile(path):
+    with _profiles_lock:
+        _profiles_in_use.discard(path)
+
+
+class BrowserSession:
+    """浏览器池中的一个会话：一个Chrome实例及其已访问的页面数"""
+
+    def __init__(self, driver, profile=None):
+        self.driver = driver
+        self.profile = profile
+        self.pages = 0
+
+    def is_healthy(self):
+        """浏览器是否仍可用（崩溃或会话失效时返回False）"""
+        try:
+            self.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+
+class BrowserPool:
+    """可复用的浏览器会话池
+
+    start()预先启动size个Chrome（创建会话池本身不启动浏览器，也不解析ChromeDriver路径），
+    ChromeDriver路径在第一次启动浏览器时解析一次并缓存到文件；每个会话使用
+    profile_root下固定的配置目录保留cookie；取出时做健康检查，访问max_pages个页面后
+    重启浏览器以控制Chrome内存增长。会话不足时按需新建。
+    每个浏览器通过DevTools协议屏蔽blocked_urls匹配的请求（None表示默认屏蔽列表）。
+    """
+
+    def __init__(self, size=1, headless=True, profile_root=None, max_pages=200, blocked_urls=None,
+                 page_load_strategy="eager"):
+        self.size = size
+        self.headless = headless
+        self.profile_root = profile_root
+        self.max_pages = max_pages
+        self.blocked_urls = blocked_url_patterns() if blocked_urls is None else blocked_urls
+        self.page_load_strategy = page_load_strategy
+        self._idle = queue.Queue()
+        self._sessions = []
+        self._lock = threading.Lock()
+
+    def start(self):
+        """预先启动浏览器"""
+        for _ in range(self.size - len(self._sessions)):
+            self._idle.put(self._launch())
+        return self
+
+    def _launch(self):
+        profile = _claim_profile(self.profile_root) if self.profile_root else None
+        try:
+            options = build_chrome_options(self.headless, profile, self.page_load_strategy)
+            driver = create_driver(options, get_driver_path(), self.blocked_urls)
+        except Exception:
+            if profile:
+                _release_profile(profile)
+            raise
+        session = BrowserSession(driver, profile)
+        with self._lock:
+            self._sessions.append(session)
+        return session
+
+    def _quit(self, session):
+        try:
+            session.driver.quit()
+        except Exception as e:
+            logging.info(f"关闭浏览器失败: {e}")
+        if session.profile:
+            _release_profile(session.profile)
+        with self._lock:
+            if session in self._sessions:
+                self._sessions.remove(session)
+
+    def acquire(self):
+        """取出一个健康的会话，没有空闲会话时新建"""
+        try:
+            session = self._idle.get_nowait()
+        except queue.Empty:
+            return self._launch()
+        if not session.is_healthy():
+            logging.info("浏览器会话已失效，重新启动")
+            self._quit(session)
+            return self._launch()
+        return session
+
+    def release(self, session):
+        """归还会话"""
+        self._idle.put(session)
+
+    def recycle_if_needed(self, session):
+        """会话访问页面数达到上限时重启浏览器，返回可继续使用的会话"""
+        if session.pages < self.max_pages:
+            return session
+        logging.info(f"浏览器已访问 {session.pages} 个页面，重启以释放内存")
+        self._quit(session)
+        return self._launch()
+
+    @contextmanager
+    def session(self):
+        """with pool.session() as driver: 取出会话，用完自动归还"""
+        session = self.acquire()
+        try:
+            session = self.recycle_if_needed(session)
+            yield session.driver
+            session.pages += 1
+        finally:
+            self.release(session)
+
+    def close(self):
+        """关闭池中所有浏览器"""
+        with self._lock:
+            sessions = list(self._sessions)
+        for session in sessions:
+            self._quit(session)
+        self._idle = queue.Queue()
@@ -0,0 +1,109 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit, urlunsplit
+
+
+def normalize_company_url(company_url):
+    """规范化企业链接：统一https、去掉查询参数和锚点，作为缓存键"""
+    parts = urlsplit(company_url.strip())
+    scheme = 'https' if parts.scheme in ('http', 'https', '') else parts.scheme
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((scheme, parts.netloc.lower(), path, '', ''))
+
+
+class CompanyCache:
+    """企业详情缓存
+
+    进程内LRU缓存 + 可选的SQLite磁盘缓存（带TTL）。以规范化的企业链接为主键，
+    抓到社会信用码后同时以信用码为键保存，重复出现的企业不再访问企业详情页；
+    同一企业换了企业链接时，解析出信用码后与之前缓存的详情合并。
+    """
+
+    def __init__(self, max_size=2000, db_path=None, ttl=7 * 24 * 3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.conn = None
+        if db_path:
+            self.conn = sqlite3.connect(db_path, check_same_thread=False)
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS company_cache ("
+                "cache_key TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self.conn.commit()
+
+    def get(self, company_url):
+        """按企业链接查询缓存，未命中或已过期返回None"""
+        return self._get('url:' + normalize_company_url(company_url))
+
+    def get_by_credit_code(self, credit_code, count=True):
+        """按社会信用码查询缓存；count=False 时不计入命中/未命中统计"""
+        return self._get('credit:' + credit_code, count)
+
+    def merge_known(self, company_data):
+        """企业页解析后按社会信用码查找同一企业之前缓存的详情（来自其他企业链接），
+        补全本次没有解析到的字段，返回合并后的详情"""
+        credit_code = company_data.get("社会信用码")
+        # 企业页已经抓取过，这次查询不计入命中/未命中统计
+        known = self.get_by_credit_code(credit_code, count=False) if credit_code else None
+        if known:
+            for key, value in known.items():
+                if value and not company_data.get(key):
+                    company_data[key] = value
+        return company_data
+
+    def put(self, company_url, company_data):
+        """保存企业详情，有社会信用码时同时以信用码为键保存"""
+        keys = ['url:' + normalize_company_url(company_url)]
+        if company_data.get("社会信用码"):
+            keys.append('credit:' + company_data["社会信用码"])
+        now = time.time()
+        with self._lock:
+            for key in keys:
+                self._remember(key, dict(company_data), now)
+            if self.conn:
+                data = json.dumps(company_data, ensure_ascii=False)
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO company_cache (cache_key, data, updated_at) VALUES (?, ?, ?)",
+                    [(key, data, now) for key in keys]
+                )
+                self.conn.commit()
+
+    def _get(self, key, count=True):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and now - entry[1] < self.ttl:
+                self._memory.move_to_end(key)
+                self.hits += count
+                return dict(entry[0])
+
+            if self.conn:
+                row = self.conn.execute(
+                    "SELECT data, updated_at FROM company_cache WHERE cache_key = ?", (key,)
+                ).fetchone()
+                if row and now - row[1] < self.ttl:
+                    company_data = json.loads(row[0])
+                    self._remember(key, company_data, row[1])
+                    self.hits += count
+                    return dict(company_data)
+
+            self.misses += count
+            return None
+
+    def _remember(self, key, company_data, updated_at):
+        self._memory[key] = (company_data, updated_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
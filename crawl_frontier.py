@@ -0,0 +1,107 @@
+import sqlite3
+import threading
+import time
+
+PENDING = 'pending'
+IN_FLIGHT = 'in_flight'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class CrawlFrontier:
+    """持久化抓取进度（SQLite）
+
+    按城市记录每个列表页和职位链接的状态（pending/in_flight/done/failed）及尝试次数。
+    程序中断后使用 --resume 重新启动时，已完成的页面和职位不再抓取，
+    中断时正在处理的链接恢复为pending重新抓取，失败的链接在尝试次数用完前继续重试。
+    """
+
+    def __init__(self, db_path="crawl_frontier.db", max_attempts=3):
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS frontier ("
+            "url TEXT PRIMARY KEY, city TEXT, kind TEXT NOT NULL, position INTEGER NOT NULL, "
+            "status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, error TEXT, updated_at REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_frontier_city_kind ON frontier (city, kind, position)")
+        self.conn.commit()
+
+    def add(self, city, kind, urls):
+        """登记链接（已存在的保持原状态），kind为list或job"""
+        now = time.time()
+        with self._lock:
+            start = self.conn.execute("SELECT COUNT(*) FROM frontier").fetchone()[0]
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO frontier (url, city, kind, position, status, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                [(url, city, kind, start + n, PENDING, now) for n, url in enumerate(urls)]
+            )
+            self.conn.commit()
+
+    def urls(self, city, kind):
+        """按登记顺序返回某城市某类链接"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT url FROM frontier WHERE city = ? AND kind = ? ORDER BY position", (city, kind)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def should_fetch(self, url):
+        """未完成且尝试次数未用完的链接需要抓取"""
+        with self._lock:
+            row = self.conn.execute("SELECT status, attempts FROM frontier WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return True
+        status, attempts = row
+        return status != DONE and attempts < self.max_attempts
+
+    def is_done(self, url):
+        with self._lock:
+            row = self.conn.execute("SELECT status FROM frontier WHERE url = ?", (url,)).fetchone()
+        return row is not None and row[0] == DONE
+
+    def claim(self, urls):
+        """标记为正在处理，尝试次数加1"""
+        self._update(urls, "status = ?, attempts = attempts + 1, updated_at = ?", (IN_FLIGHT, time.time()))
+
+    def mark_done(self, urls):
+        self._update(urls, "status = ?, error = NULL, updated_at = ?", (DONE, time.time()))
+
+    def mark_failed(self, url, error):
+        self._update([url], "status = ?, error = ?, updated_at = ?", (FAILED, str(error)[:500], time.time()))
+
+    def _update(self, urls, assignments, values):
+        if not urls:
+            return
+        with self._lock:
+            self.conn.executemany(
+                f"UPDATE frontier SET {assignments} WHERE url = ?", [values + (url,) for url in urls]
+            )
+            self.conn.commit()
+
+    def reset_in_flight(self):
+        """把上次中断时正在处理的链接恢复为pending，返回恢复的数量"""
+        with self._lock:
+            cursor = self.conn.execute(
+                "UPDATE frontier SET status = ?, updated_at = ? WHERE status = ?", (PENDING, time.time(), IN_FLIGHT)
+            )
+            self.conn.commit()
+        return cursor.rowcount
+
+    def clear(self):
+        """清空所有进度（不使用 --resume 重新开始抓取时调用）"""
+        with self._lock:
+            self.conn.execute("DELETE FROM frontier")
+            self.conn.commit()
+
+    def stats(self):
+        """返回 {(kind, status): 数量}"""
+        with self._lock:
+            rows = self.conn.execute("SELECT kind, status, COUNT(*) FROM frontier GROUP BY kind, status").fetchall()
+        return {(kind, status): count for kind, status, count in rows}
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
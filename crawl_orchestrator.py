@@ -0,0 +1,166 @@
+import os
+import copy
+import queue
+import threading
+import logging
+from collections import namedtuple
+
+import yaml
+
+# 没有配置文件时使用的默认配置（与原先main()中写死的城市列表一致）
+DEFAULT_CONFIG = {
+    "categories": ["hulianwangtx"],
+    "max_pages": 5,
+    "workers": 1,
+    "max_browsers": 7,
+    "headless": True,
+    "cities": {
+        "北京": "bj",
+        "上海": "sh",
+        "广州": "gz",
+        "深圳": "sz",
+        "成都": "cd",
+        "西安": "xa",
+        "郑州": "zz",
+    },
+}
+
+# 一个抓取任务：一个城市的一个职位类别
+CrawlTask = namedtuple("CrawlTask", ["city", "category", "base_url", "max_pages", "workers"])
+
+
+def load_crawl_config(path=None):
+    """读取YAML抓取配置，缺少的项使用DEFAULT_CONFIG；文件不存在时返回默认配置"""
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    if path and os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            config.update(yaml.safe_load(f) or {})
+    return config
+
+
+def build_tasks(config):
+    """把配置展开为抓取任务，按类别轮流排列各城市，使并发运行的任务分散在不同城市（不同域名）
+
+    cities 的值可以是城市代码（如 bj），也可以是覆盖全局设置的字典：
+    {code: bj, categories: [...], max_pages: 10, workers: 2}
+    """
+    per_city = []
+    for city, city_config in config["cities"].items():
+        if not isinstance(city_config, dict):
+            city_config = {"code": city_config}
+        code = city_config["code"]
+        per_city.append([
+            CrawlTask(city, category, f"https://{code}.58.com/{category}/",
+                      city_config.get("max_pages", config["max_pages"]),
+                      city_config.get("workers", config["workers"]))
+            for category in city_config.get("categories", config["categories"])
+        ])
+    tasks = []
+    for round_tasks in _interleave(per_city):
+        tasks.extend(round_tasks)
+    return tasks
+
+
+def _interleave(per_city):
+    """依次取每个城市的第1个任务、第2个任务……"""
+    depth = max((len(city_tasks) for city_tasks in per_city), default=0)
+    for i in range(depth):
+        yield [city_tasks[i] for city_tasks in per_city if i < len(city_tasks)]
+
+
+def browsers_needed(workers):
+    """一个任务占用的浏览器数：列表页浏览器，加上并行抓取详情页的工作浏览器"""
+    return 1 + (workers if workers > 1 else 0)
+
+
+class BrowserBudget:
+    """全局浏览器数量上限：任务开始前取得所需数量的名额，结束后归还"""
+
+    def __init__(self, capacity):
+        self.capacity = max(1, capacity)
+        self.available = self.capacity
+        self._condition = threading.Condition()
+
+    def acquire(self, n):
+        """阻塞直到有n个名额（超过上限时按上限计），返回实际取得的数量"""
+        n = min(n, self.capacity)
+        with self._condition:
+            while self.available < n:
+                self._condition.wait()
+            self.available -= n
+        return n
+
+    def release(self, n):
+        with self._condition:
+            self.available += n
+            self._condition.notify_all()
+
+
+class MultiCityOrchestrator:
+    """多城市并发抓取
+
+    每个任务（城市×类别）使用 scraper_factory(task) 创建的独立爬虫和浏览器，多个线程从共享队列
+    领取任务，先完成的线程继续领取下一个城市，使各线程的工作量保持均衡；同时运行的浏览器总数
+    不超过max_browsers。各城市域名不同，访问频率控制按域名分别进行，互不拖慢。
+    """
+
+    def __init__(self, scraper_factory, max_browsers=7):
+        self.scraper_factory = scraper_factory
+        self.budget = BrowserBudget(max_browsers)
+
+    def run(self, tasks, on_task_done=None):
+        """运行全部任务，返回 {城市: 职位列表}；on_task_done(task, jobs) 在每个任务完成后调用"""
+        pending = queue.Queue()
+        for task in tasks:
+            pending.put(task)
+        results = {task.city: [] for task in tasks}
+        results_lock = threading.Lock()
+        threads = [
+            threading.Thread(target=self._run_tasks, args=(pending, results, results_lock, on_task_done),
+                             name=f"crawl-{n}", daemon=True)
+            for n in range(min(len(tasks), self.budget.capacity))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def _run_tasks(self, pending, results, results_lock, on_task_done):
+        while True:
+            try:
+                task = pending.get_nowait()
+            except queue.Empty:
+                return
+            granted = self.budget.acquire(browsers_needed(task.workers))
+            try:
+                # 全局上限小于任务所需时，减少该任务的详情页工作浏览器
+                if granted < browsers_needed(task.workers):
+                    task = task._replace(workers=granted - 1 if granted > 2 else 1)
+                jobs = self._run_task(task)
+            finally:
+                self.budget.release(granted)
+            with results_lock:
+                results[task.city].extend(jobs)
+            if on_task_done:
+                on_task_done(task, jobs)
+
+    def _run_task(self, task):
+        logging.info(f"开始抓取{task.city}的{task.category}职位信息（最多{task.max_pages}页）...")
+        try:
+            scraper = self.scraper_factory(task)
+        except Exception as e:
+            logging.error(f"{task.city}启动浏览器失败: {e}")
+            return []
+        try:
+            jobs = scraper.scrape_multiple_pages(task.base_url, max_pages=task.max_pages, city=task.city)
+            for job in jobs:
+                # 为每个职位添加城市标识
+                job['抓取城市'] = task.city
+            logging.info(f"{task.city}（{task.category}）成功抓取到 {len(jobs)} 个职位信息")
+            return jobs
+        except Exception as e:
+            logging.error(f"{task.city}抓取出错: {e}")
+            return []
+        finally:
+            scraper.close()
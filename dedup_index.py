@@ -0,0 +1,106 @@
+import hashlib
+import math
+import os
+import re
+import threading
+from urllib.parse import urlsplit, parse_qs
+
+# 58职位详情页链接中的信息ID，如 https://bj.58.com/hulianwangtx/46000000000001x.shtml?PGTID=...&ClickID=1
+JOB_ID_PATTERN = re.compile(r'/(\d+)x\.shtml')
+# 推广跳转链接（如 jump.zhineng.58.com）把信息ID放在entinfo参数中，形如 entinfo=46000000000001_q
+ENTINFO_PATTERN = re.compile(r'^(\d+)')
+
+
+def extract_job_id(url):
+    """从职位链接中提取58信息ID，忽略PGTID、ClickID等跟踪参数；无法识别时退回不带参数的链接"""
+    match = JOB_ID_PATTERN.search(url)
+    if match:
+        return match.group(1)
+    parts = urlsplit(url)
+    for entinfo in parse_qs(parts.query).get('entinfo', []):
+        match = ENTINFO_PATTERN.match(entinfo)
+        if match:
+            return match.group(1)
+    return f"{parts.netloc.lower()}{parts.path}"
+
+
+class BloomFilter:
+    """简单的布隆过滤器，历史记录很大时代替set节省内存（有极小的误判率，不会漏判）"""
+
+    def __init__(self, capacity=1000000, error_rate=0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = hashlib.sha1(key.encode('utf-8')).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:16], 'little') | 1
+        return [(h1 + n * h2) % self.size for n in range(self.hash_count)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def __len__(self):
+        return self.count
+
+
+class JobDedupIndex:
+    """跨页面、跨城市、跨运行的职位去重索引
+
+    以58信息ID为键，内存中使用set（或布隆过滤器），已处理的ID追加写入文本文件，
+    下次运行时重新加载。已知职位在进入详情页之前就被跳过。
+    """
+
+    def __init__(self, path=None, bloom=False, capacity=1000000, error_rate=0.001):
+        self.path = path
+        self._lock = threading.Lock()
+        self._new_ids = (lambda: BloomFilter(capacity, error_rate)) if bloom else set
+        self._ids = self._new_ids()
+        self.skipped = 0
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    job_id = line.strip()
+                    if job_id:
+                        self._ids.add(job_id)
+
+    def seen(self, url):
+        """职位是否已处理过"""
+        with self._lock:
+            return extract_job_id(url) in self._ids
+
+    def filter_new(self, urls):
+        """过滤掉已处理过的职位链接，返回新链接"""
+        new_urls = [url for url in urls if not self.seen(url)]
+        self.skipped += len(urls) - len(new_urls)
+        return new_urls
+
+    def add(self, urls):
+        """记录已处理的职位并追加到索引文件"""
+        with self._lock:
+            new_ids = []
+            for url in urls:
+                job_id = extract_job_id(url)
+                if job_id not in self._ids:
+                    self._ids.add(job_id)
+                    new_ids.append(job_id)
+            if self.path and new_ids:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write('\n'.join(new_ids) + '\n')
+
+    def clear(self):
+        """清空索引（重新抓取全部职位时调用）"""
+        with self._lock:
+            self._ids = self._new_ids()
+            if self.path and os.path.exists(self.path):
+                os.remove(self.path)
+
+    def __len__(self):
+        return len(self._ids)
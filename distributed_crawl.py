@@ -0,0 +1,225 @@
+"""
+分布式抓取：多台机器共享同一个任务队列（work_queue.WorkQueue）
+
+    # 协调进程：按配置登记列表页，并作为唯一的写入者保存各工作进程的抓取结果
+    python distributed_crawl.py --queue /mnt/shared/work_queue.db coordinator --dedup-index /mnt/shared/job_index.txt
+    # 每台机器上启动一个或多个工作进程（在协调进程启动之后）
+    python distributed_crawl.py --queue /mnt/shared/work_queue.db worker --dedup-index /mnt/shared/job_index.txt
+
+队列文件需要放在支持文件锁的共享存储上（如SMB或开启锁服务的NFS）；职位索引也放在共享存储上时，
+工作进程在登记职位前就跳过历史运行中已处理过的职位，不再进入详情页。
+"""
+
+import argparse
+import logging
+import os
+import socket
+import threading
+import time
+
+from enhanced_job_scraper import Enhanced58JobScraper
+from work_queue import WorkQueue, LIST_QUEUE, JOB_QUEUE
+from crawl_orchestrator import load_crawl_config, build_tasks
+from pagination import page_url
+from company_cache import CompanyCache
+from rate_limiter import AdaptiveRateLimiter
+from dedup_index import JobDedupIndex
+from job_extractors import available_parsers
+from job_warehouse import JobWarehouse
+
+OUTPUT_FILE = "58同城多城市职位详细信息.xlsx"
+# 被过滤（如培训广告）的职位交给写入者的结果，写入者只把链接标记为已处理，增量抓取时不再重复获取
+SKIPPED_RESULT = {"_skipped": True}
+
+
+class LeaseKeeper(threading.Thread):
+    """后台线程：定时为工作进程正在处理的任务续租，处理时间超过租约也不会被重新分配"""
+
+    def __init__(self, work_queue, worker, interval):
+        super().__init__(name="lease-keeper", daemon=True)
+        self.work_queue = work_queue
+        self.worker = worker
+        self.interval = interval
+        self._held = set()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def hold(self, task_ids):
+        with self._lock:
+            self._held.update(task_ids)
+
+    def drop(self, task_id):
+        with self._lock:
+            self._held.discard(task_id)
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            with self._lock:
+                task_ids = list(self._held)
+            try:
+                renewed = self.work_queue.heartbeat(self.worker, task_ids)
+                if renewed < len(task_ids):
+                    logging.warning(f"{len(task_ids) - renewed} 个任务的租约已失效，将由其他工作进程重新处理")
+            except Exception as e:
+                logging.warning(f"续租失败: {e}")
+
+    def stop(self):
+        self._stopped.set()
+
+
+def process_task(scraper, work_queue, task):
+    """处理一个任务，返回要交给写入者的结果列表"""
+    if task.queue == LIST_QUEUE:
+        # 列表页：读取职位链接登记到职位队列（同一职位只登记一次），由各工作进程领取
+        job_links = scraper.get_job_links(scraper.fetch_list_page(task.url), task.url)
+        # 历史运行中已处理过的职位在进入详情页之前跳过
+        new_links = scraper.dedup_index.filter_new(job_links) if scraper.dedup_index is not None else job_links
+        added = work_queue.put(JOB_QUEUE, new_links, task.city)
+        print(f"{task.city} 列表页 {task.url}: 找到 {len(job_links)} 个职位链接，"
+              f"跳过已处理的 {len(job_links) - len(new_links)} 个，新登记 {added} 个")
+        return []
+    job_data = scraper.scrape_job_detail_page(task.url)
+    if job_data is None:
+        return [SKIPPED_RESULT]
+    if not any(job_data.values()):
+        # 没有解析出任何内容，按失败处理，由队列重试
+        raise ValueError("详情页没有解析出任何内容")
+    job_data['抓取城市'] = task.city
+    return [job_data]
+
+
+def save_result(scraper, url, job_data):
+    """写入者处理一个工作进程的结果，返回是否保存了职位"""
+    # 结果至少交付一次，写入者重启后可能再次读到已保存的结果
+    if scraper.dedup_index.seen(url):
+        return False
+    if job_data == SKIPPED_RESULT:
+        scraper.mark_job_processed(url)
+        return False
+    return scraper.save_job_result(url, job_data, OUTPUT_FILE, city=job_data.get('抓取城市'))
+
+
+def run_worker(args):
+    worker = args.worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    work_queue = WorkQueue(args.queue, lease_seconds=args.lease)
+    # 协调进程的职位索引（放在共享存储上时各工作进程只读），用于登记职位前去重
+    dedup_index = JobDedupIndex(args.dedup_index) if args.dedup_index else None
+    scraper = Enhanced58JobScraper(headless=True, parser=args.parser, dedup_index=dedup_index,
+                                   company_cache=CompanyCache(db_path=args.company_cache or None),
+                                   rate_limiter=AdaptiveRateLimiter(rate=args.rate),
+                                   profile_dir=args.profile_dir or None)
+    keeper = LeaseKeeper(work_queue, worker, args.lease / 3)
+    keeper.start()
+    print(f"工作进程 {worker} 已启动，任务队列: {args.queue}")
+    idle_since = None
+    try:
+        while True:
+            # 优先处理职位任务，职位队列空了再领取列表页补充
+            tasks = work_queue.lease(JOB_QUEUE, worker, args.batch) or work_queue.lease(LIST_QUEUE, worker, 1)
+            if not tasks:
+                if work_queue.is_drained():
+                    idle_since = idle_since or time.monotonic()
+                    if time.monotonic() - idle_since >= args.idle_exit:
+                        print("任务队列已处理完，工作进程退出")
+                        break
+                time.sleep(args.poll)
+                continue
+            idle_since = None
+            keeper.hold(task.id for task in tasks)
+            for task in tasks:
+                try:
+                    if not work_queue.complete(task, worker, process_task(scraper, work_queue, task)):
+                        logging.warning(f"任务租约已失效，结果未提交: {task.url}")
+                except Exception as e:
+                    print(f"处理任务失败（第{task.attempts}次）: {task.url} - {e}")
+                    work_queue.fail(task, worker, e)
+                finally:
+                    keeper.drop(task.id)
+    finally:
+        keeper.stop()
+        scraper.close()
+        work_queue.close()
+
+
+def run_coordinator(args):
+    work_queue = WorkQueue(args.queue, lease_seconds=args.lease)
+    dedup_index = JobDedupIndex(args.dedup_index or None)
+    warehouse = JobWarehouse(args.warehouse) if args.warehouse else None
+    # 写入者只保存结果，不打开页面，不会启动浏览器
+    scraper = Enhanced58JobScraper(http_first=False, dedup_index=dedup_index, warehouse=warehouse)
+    if not args.resume:
+        work_queue.clear()
+        scraper.clear_excel_data(OUTPUT_FILE)
+        if not args.incremental:
+            # 与单机抓取一致：重新开始时清空职位索引，否则已处理过的职位不会出现在新的输出中
+            dedup_index.clear()
+
+    config = load_crawl_config(args.config)
+    for task in build_tasks(config):
+        # 列表页按 /pnN/ 规则登记，空页由工作进程处理时得到0个职位
+        work_queue.put(LIST_QUEUE, [page_url(task.base_url, n) for n in range(1, task.max_pages + 1)], task.city)
+    print(f"已登记任务: {work_queue.stats()}")
+
+    saved = 0
+    last_checkpoint = time.monotonic()
+    try:
+        while True:
+            results = work_queue.results()
+            if results:
+                for _, url, job_data in results:
+                    if save_result(scraper, url, job_data):
+                        saved += 1
+                # 落盘后再删除，写入者中断也不会丢失结果
+                scraper.get_sink(OUTPUT_FILE).flush()
+                work_queue.ack_results([result_id for result_id, _, _ in results])
+            elif work_queue.is_drained():
+                break
+            else:
+                time.sleep(args.poll)
+            if time.monotonic() - last_checkpoint >= args.checkpoint_interval:
+                scraper.checkpoint_output(OUTPUT_FILE)
+                last_checkpoint = time.monotonic()
+        print(f"\n所有任务已完成，共保存 {saved} 个职位，任务状态: {work_queue.stats()}")
+    finally:
+        scraper.close()
+        work_queue.close()
+        if warehouse:
+            warehouse.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="58同城分布式抓取（协调进程/工作进程）")
+    parser.add_argument("--queue", default="work_queue.db", help="共享任务队列文件（SQLite，放在共享存储上）")
+    parser.add_argument("--lease", type=float, default=120, help="任务租约时长（秒），工作进程失联超过该时间后任务重新分配")
+    parser.add_argument("--poll", type=float, default=2, help="队列为空时的轮询间隔（秒）")
+    subparsers = parser.add_subparsers(dest="role", required=True)
+
+    coordinator = subparsers.add_parser("coordinator", help="登记列表页并保存所有工作进程的抓取结果")
+    coordinator.add_argument("--config", default="crawl_config.yaml", help="抓取配置文件（城市、职位类别、页数）")
+    coordinator.add_argument("--resume", action="store_true", help="保留队列中已有的任务和输出文件，继续抓取")
+    coordinator.add_argument("--dedup-index", default="job_index.txt",
+                             help="已保存职位的信息ID索引文件（放在共享存储上，工作进程据此跳过已处理的职位）")
+    coordinator.add_argument("--incremental", action="store_true", help="不续抓时保留职位索引，只抓取之前没有处理过的新职位")
+    coordinator.add_argument("--warehouse", default=None, help="同时把保存的职位upsert到SQLite职位仓库")
+    coordinator.add_argument("--checkpoint-interval", type=float, default=300, help="生成Excel和JSON成品文件的间隔（秒）")
+
+    worker = subparsers.add_parser("worker", help="领取任务抓取列表页和详情页")
+    worker.add_argument("--worker-id", default=None, help="工作进程标识（默认 主机名-进程号）")
+    worker.add_argument("--batch", type=int, default=5, help="每次领取的职位任务数")
+    worker.add_argument("--idle-exit", type=float, default=60, help="队列处理完后空闲多少秒退出")
+    worker.add_argument("--parser", choices=available_parsers(), default=None, help="HTML解析后端")
+    worker.add_argument("--dedup-index", default="job_index.txt",
+                        help="协调进程的职位索引文件（共享存储上的同一个文件），登记职位前跳过已处理的职位；传空字符串则不过滤")
+    worker.add_argument("--company-cache", default="company_cache.db", help="本机企业详情缓存文件")
+    worker.add_argument("--rate", type=float, default=2.0, help="本机每个域名的初始访问速率（次/秒）")
+    worker.add_argument("--profile-dir", default="chrome_profiles", help="浏览器配置目录")
+    args = parser.parse_args()
+
+    if args.role == "coordinator":
+        run_coordinator(args)
+    else:
+        run_worker(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,38 @@
 import time
 import json
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 from datetime import datetime
 import re
 import logging
 import os
 import sys
+import threading
+import argparse
+from functools import partial
+from job_sink import JsonlJobSink
+from worker_pool import DetailWorkerPool
+from page_fetcher import HttpPageFetcher, is_captcha_page
+from company_cache import CompanyCache
+from fixture_recorder import FixtureRecorder
+from crawl_frontier import CrawlFrontier
+from dedup_index import JobDedupIndex
+from pagination import PaginationPlanner
+from rate_limiter import AdaptiveRateLimiter
+from captcha_solver import CaptchaSolver, CaptchaUnresolved
+from page_waits import wait_for_page
+import region_normalizer
+import parquet_store
+from job_warehouse import JobWarehouse
+import async_scraper
+from async_scraper import AsyncEnhanced58JobScraper
+from crawl_orchestrator import MultiCityOrchestrator, load_crawl_config, build_tasks, browsers_needed
+from browser_pool import BrowserPool, PageLoadStats, DEFAULT_BLOCKED_RESOURCES, blocked_url_patterns, page_metrics
+from job_extractors import (
+    make_soup, extract_job_links, new_company_data, parse_job_detail_html, parse_company_detail_html,
+    standardize_company_scale, standardize_company_type, available_parsers, extract_job_from_item,
+    is_training_ad, merge_company_details
+)
+from parse_pipeline import ParsePipeline
 
 # 配置日志
 def setup_logging():
@@ -58,427 +76,420 @@ print(f"日志将保存到: {log_filename}")
 original_print = print
 print = log_print
 
+# 手动处理验证码时的互斥锁（多浏览器并行时只允许一个线程等待输入）
+MANUAL_CAPTCHA_LOCK = threading.Lock()
+# 多个城市的爬虫共享输出写入器时，创建写入器的互斥锁
+SINKS_LOCK = threading.Lock()
+
 class Enhanced58JobScraper:
-    def __init__(self, headless=True):
-        self.options = Options()
-        if headless:
-            self.options.add_argument("--headless")
-        self.options.add_argument("--no-sandbox")
-        self.options.add_argument("--disable-dev-shm-usage")
-        self.options.add_argument("--disable-blink-features=AutomationControlled")
-        self.options.add_argument("--disable-gpu")
-        self.options.add_argument("--disable-extensions")
-        self.options.add_argument("--disable-plugins")
-        self.options.add_argument("--disable-images")
-        # 禁用GPU相关错误信息
-        self.options.add_argument("--disable-gpu-sandbox")
-        self.options.add_argument("--disable-software-rasterizer")
-        self.options.add_argument("--disable-background-timer-throttling")
-        self.options.add_argument("--disable-backgrounding-occluded-windows")
-        self.options.add_argument("--disable-renderer-backgrounding")
-        self.options.add_argument("--disable-features=TranslateUI")
-        self.options.add_argument("--disable-ipc-flooding-protection")
-        # 禁用WebGL相关错误
-        self.options.add_argument("--disable-webgl")
-        self.options.add_argument("--disable-webgl2")
-        # 设置日志级别来减少错误输出
-        self.options.add_argument("--log-level=3")
-        self.options.add_argument("--silent")
-        self.options.add_argument("--disable-logging")
-        self.options.add_argument("--disable-dev-tools")
-        # self.options.add_argument("--disable-javascript")  # 注释掉，因为很多网站需要JavaScript
-        self.options.add_argument("--window-size=1920,1080")
-        # 添加更多性能优化选项
-        self.options.add_argument("--disable-web-security")
-        self.options.add_argument("--disable-features=VizDisplayCompositor")
-        self.options.add_argument("--disable-background-timer-throttling")
-        self.options.add_argument("--disable-renderer-backgrounding")
-        self.options.add_argument("--disable-backgrounding-occluded-windows")
-        self.options.add_argument("--disable-ipc-flooding-protection")
-        # 禁用CSS和字体加载以提高速度
-        prefs = {
-            "profile.managed_default_content_settings.images": 2,
-            "profile.default_content_setting_values.notifications": 2,
-            "profile.managed_default_content_settings.stylesheets": 2
-        }
-        self.options.add_experimental_option("prefs", prefs)
-        self.options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        self.options.add_experimental_option('useAutomationExtension', False)
-        self.options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-        
-        # 尝试使用系统PATH中的ChromeDriver，如果失败则使用webdriver-manager
+    def __init__(self, headless=True, workers=1, http_first=True, company_cache=None, parser=None, recorder=None,
+                 parse_pipeline=None, frontier=None, dedup_index=None, rate_limiter=None, manual_captcha=False,
+                 browser_pool=None, profile_dir=None, blocked_urls=None, page_stats=None, sinks=None,
+                 async_engine=None, warehouse=None):
+        self.workers = workers  # 详情页并行抓取的浏览器数量，1为单浏览器顺序抓取
+        self.parser = parser  # HTML解析后端（lxml/html.parser），None表示使用可用的最快后端
+        # 企业详情缓存，同一企业只抓取一次企业详情页（工作线程共享同一个缓存）
+        self.company_cache = company_cache if company_cache is not None else CompanyCache()
+        # 按域名的自适应访问频率控制，取代固定延时（工作线程共享同一个实例）
+        self.rate_limiter = rate_limiter if rate_limiter is not None else AdaptiveRateLimiter()
+        # 验证码自动处理（有时间上限）；未通过时默认暂缓该链接稍后重试，manual_captcha=True时等待手动处理
+        self.captcha_solver = CaptchaSolver()
+        self.manual_captcha = manual_captcha
+        self.parked_urls = []  # 因验证码暂缓、等待重试的职位链接
+        # 详情页和企业页优先用HTTP直接获取，失败再回退到浏览器
+        self.fetcher = HttpPageFetcher() if http_first else None
+        # 异步详情页抓取引擎（async_scraper.AsyncEnhanced58JobScraper），None表示逐个同步抓取
+        self.async_engine = async_engine
+        # 抓取时把原始页面保存为离线样本（FixtureRecorder），供解析基准测试回放
+        self.recorder = recorder
+        # HTML解析进程池（ParsePipeline），None表示在当前线程中解析（工作线程共享同一个进程池）
+        self.parse_pipeline = parse_pipeline
+        # 持久化抓取进度（CrawlFrontier），用于中断后 --resume 续抓
+        self.frontier = frontier
+        # 跨页面、跨城市、跨运行的职位去重索引（JobDedupIndex），已处理的职位不再进入详情页
+        self.dedup_index = dedup_index
+        self.worker_pool = None
+        
+        # 浏览器来自会话池（browser_pool.BrowserPool）：ChromeDriver路径已缓存，不再每次联网查找；
+        # profile_dir下的配置目录保留cookie，访问一定页面数后自动重启浏览器
+        self.profile_dir = profile_dir
+        # 浏览器通过DevTools协议屏蔽的请求（图片、字体、样式、统计脚本等），None表示默认屏蔽列表
+        self.blocked_urls = blocked_url_patterns() if blocked_urls is None else blocked_urls
+        # 浏览器页面加载时间和传输量统计（工作线程共享同一个实例）
+        self.page_stats = page_stats if page_stats is not None else PageLoadStats()
+        self._owns_browser_pool = browser_pool is None
+        self.browser_pool = browser_pool if browser_pool is not None else BrowserPool(
+            headless=headless, profile_root=profile_dir, blocked_urls=self.blocked_urls)
+        # 第一次打开页面时才从会话池取出浏览器（只通过HTTP获取页面的爬虫不占用浏览器）
+        self.browser_session = None
+        self.driver = None
+        
+        # 每个输出文件对应一个增量写入器；多个城市的爬虫可共享同一个字典（此时也应共享frontier和dedup_index）
+        self.sinks = sinks if sinks is not None else {}
+        # SQLite职位仓库（job_warehouse.JobWarehouse），实时保存的职位同时upsert到仓库；None表示不使用
+        self.warehouse = warehouse
+        
+    def get_sink(self, filename):
+        """获取（或创建）输出文件对应的增量写入器"""
+        with SINKS_LOCK:
+            if filename not in self.sinks:
+                sink = JsonlJobSink(filename)
+                sink.flush_listeners.append(self._commit_saved_jobs)
+                self.sinks[filename] = sink
+            return self.sinks[filename]
+    
+    def _commit_saved_jobs(self, urls):
+        """增量日志落盘后，把已写入的职位在抓取进度和去重索引中标记为完成"""
+        if urls:
+            if self.frontier:
+                self.frontier.mark_done(urls)
+            if self.dedup_index is not None:
+                self.dedup_index.add(urls)
+    
+    def mark_job_processed(self, link):
+        """标记没有数据需要落盘的职位（数据为空或被过滤）为已处理"""
+        self._commit_saved_jobs([link])
+    
+    def save_job_result(self, link, job_data, filename="58同城多城市职位详细信息.xlsx", city=None):
+        """实时保存一个职位，并在数据落盘后更新抓取进度；city为抓取城市（写入职位仓库）"""
+        if not any(job_data.values()):
+            # 没有解析出任何内容（如分布式工作进程获取页面失败），记为失败，不能标记为已处理
+            log_error(f"× 跳过保存：没有解析出任何内容的职位 - {link}")
+            if self.frontier:
+                self.frontier.mark_failed(link, "没有解析出任何内容")
+            return False
         try:
-            self.driver = webdriver.Chrome(options=self.options)
+            # 链接随记录交给写入器，该记录落盘时才标记完成
+            saved = self.save_single_job_to_excel(job_data, filename, key=link)
         except Exception as e:
-            print(f"使用系统ChromeDriver失败，尝试使用webdriver-manager: {e}")
+            if self.frontier:
+                self.frontier.mark_failed(link, e)
+            raise
+        if not saved:
+            self.mark_job_processed(link)
+        elif self.warehouse is not None:
             try:
-                service = Service(ChromeDriverManager().install())
-                self.driver = webdriver.Chrome(service=service, options=self.options)
-            except Exception as e2:
-                print(f"webdriver-manager也失败了: {e2}")
-                raise e2
+                self.warehouse.upsert_job(link, job_data, city)
+            except Exception as e:
+                # 仓库只是副本，写入失败不影响增量日志和抓取进度
+                log_error(f"写入职位仓库失败: {e}")
+        return saved
+    
+    def get_worker_pool(self):
+        """获取（或创建）详情页抓取工作池，每个工作线程使用独立的无头浏览器"""
+        if self.worker_pool is None:
+            self.worker_pool = DetailWorkerPool(
+                lambda: Enhanced58JobScraper(headless=True, http_first=self.fetcher is not None,
+                                             company_cache=self.company_cache, parser=self.parser,
+                                             recorder=self.recorder, parse_pipeline=self.parse_pipeline,
+                                             rate_limiter=self.rate_limiter, profile_dir=self.profile_dir,
+                                             blocked_urls=self.blocked_urls, page_stats=self.page_stats,
+                                             manual_captcha=self.manual_captcha),
+                workers=self.workers,
+                job_delay=0  # 访问间隔由共享的rate_limiter控制
+            )
+        return self.worker_pool
+    
+    def checkpoint_output(self, filename=None, skip_empty=False):
+        """根据增量日志生成Excel和JSON成品文件，不指定文件名时处理所有输出
+
+        skip_empty=True 时跳过没有任何记录的日志（刚清空或本次没有写入），不用空数据覆盖已有的成品文件。
+        """
+        filenames = [filename] if filename else list(self.sinks)
+        for name in filenames:
+            if skip_empty and self.get_sink(name).is_empty():
+                continue
+            try:
+                count = self.get_sink(name).checkpoint()
+                print(f"✓ 已生成 {name} 及对应JSON文件，共 {count} 条记录")
+            except Exception as e:
+                log_error(f"生成输出文件 {name} 失败: {e}")
         
-        # 设置页面加载超时
-        self.driver.set_page_load_timeout(15)  # 减少页面加载超时时间
-        self.driver.implicitly_wait(5)  # 减少隐式等待时间
-        self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    def handle_captcha(self):
+        """自动处理验证码页面：一次脚本探测验证码和已知按钮，总耗时不超过CaptchaSolver.budget"""
+        print("\n尝试自动处理验证码...")
+        if self.captcha_solver.solve(self.driver):
+            print("✓ 验证码处理成功！")
+            return True
+        print(f"自动处理验证码失败（已用时上限 {self.captcha_solver.budget:.0f} 秒）")
+        return False
         
-    def handle_captcha(self, max_retries=3):
-        """自动处理验证码页面"""
-        for attempt in range(max_retries):
+    def navigate(self, url, kind="list", wait=True):
+        """浏览器打开页面并等待该类页面的就绪信号
+
+        先按访问频率控制等待（wait=False 表示调用方已为本次页面获取取得令牌），
+        浏览器访问页面数达到上限时先重启；记录加载时间和传输量。
+        """
+        if wait:
+            self.rate_limiter.wait(url)
+        if self.browser_session is None:
+            self.browser_session = self.browser_pool.acquire()
+        self.browser_session = self.browser_pool.recycle_if_needed(self.browser_session)
+        self.driver = self.browser_session.driver
+        started = time.monotonic()
+        self.driver.get(url)
+        wait_for_page(self.driver, kind)
+        self.page_stats.record(kind, time.monotonic() - started, page_metrics(self.driver))
+        self.browser_session.pages += 1
+        
+    def fetch_page_source(self, url, kind):
+        """获取页面源码：优先使用HTTP直接请求，验证码页或页面不完整时回退到浏览器"""
+        if self.fetcher:
+            self.rate_limiter.wait(url)
+            page_source = self.fetcher.fetch(url, kind)
+            if page_source is not None:
+                self.rate_limiter.record_success(url)
+                self.fetcher.count(kind, "http")
+                self.record_fixture(kind, url, page_source)
+                return page_source
+            if self.fetcher.last_result == "captcha":
+                self.rate_limiter.record_captcha(url)
+        
+        # 浏览器兜底：一次页面获取只取一个令牌，HTTP请求已经取过时不再等待
+        self.navigate(url, kind, wait=not self.fetcher)
+        
+        # 检测验证码并尝试自动处理
+        page_source = self.resolve_captcha(self.driver.page_source, url)
+        if self.fetcher:
+            self.fetcher.count(kind, "browser")
+            # 浏览器可能刚通过验证码，把cookie同步给HTTP层
+            self.fetcher.sync_cookies(self.driver)
+        self.record_fixture(kind, url, page_source)
+        return page_source
+    
+    def record_fixture(self, kind, url, page_source):
+        """开启样本录制时保存页面源码，验证码页面不保存"""
+        if self.recorder and not is_captcha_page(page_source):
             try:
-                print(f"\n尝试自动处理验证码 (第{attempt + 1}次)...")
-                
-                # 尝试查找并点击跳过按钮或验证按钮
-                skip_buttons = [
-                    "//input[@id='btnSubmit']",  # 58同城验证码页面的特定按钮
-                    "//button[@id='btnSubmit']",
-                    "//input[@class='btn_tj']",
-                    "//button[@class='btn_tj']",
-                    "//input[@value='点击按钮进行验证']",
-                    "//button[contains(text(), '跳过')]",
-                    "//a[contains(text(), '跳过')]",
-                    "//span[contains(text(), '跳过')]",
-                    "//div[contains(text(), '跳过')]",
-                    "//button[contains(@class, 'skip')]",
-                    "//a[contains(@class, 'skip')]",
-                    "//button[contains(text(), '继续访问')]",
-                    "//a[contains(text(), '继续访问')]",
-                    "//button[contains(text(), '返回')]",
-                    "//a[contains(text(), '返回')]",
-                    "//button[contains(text(), '确定')]",
-                    "//a[contains(text(), '确定')]",
-                    "//button[contains(text(), '点击按钮进行验证')]",
-                    "//a[contains(text(), '点击按钮进行验证')]",
-                    "//button[contains(text(), '进行验证')]",
-                    "//a[contains(text(), '进行验证')]",
-                    "//button[contains(text(), '验证')]",
-                    "//a[contains(text(), '验证')]",
-                    "//button[contains(@class, 'verify')]",
-                    "//a[contains(@class, 'verify')]",
-                    "//button[contains(@class, 'btn')]",
-                    "//a[contains(@class, 'btn')]",
-                    "//input[@type='submit']",
-                    "//button[@type='submit']",
-                    "//input[@type='button']",
-                    "//button",
-                    "//a[@href='javascript:;']"
-                ]
-                
-                button_found = False
-                for xpath in skip_buttons:
-                    try:
-                        button = WebDriverWait(self.driver, 2).until(
-                            EC.element_to_be_clickable((By.XPATH, xpath))
-                        )
-                        button.click()
-                        print(f"✓ 成功点击跳过按钮: {xpath}")
-                        button_found = True
-                        time.sleep(0.3)
-                        break
-                    except:
-                        continue
-                
-                if not button_found:
-                    # 如果没有找到跳过按钮，尝试刷新页面
-                    print("未找到跳过按钮，尝试刷新页面...")
-                    self.driver.refresh()
-                    time.sleep(1.5)
-                
-                # 检查是否还在验证码页面
-                page_source = self.driver.page_source
-                if "访问过于频繁，本次访问做以下验证码校验" not in page_source and "验证码校验" not in page_source:
-                    print("✓ 验证码处理成功！")
-                    return True
-                    
+                self.recorder.record(kind, url, page_source)
             except Exception as e:
-                print(f"自动处理验证码失败: {e}")
-                
-        print("自动处理验证码失败，需要手动处理...")
-        return False
+                logging.info(f"保存页面样本失败: {e}")
+    
+    def print_fetch_stats(self):
+        """打印各类页面分别由HTTP和浏览器获取的次数、各域名的访问频率控制状态和浏览器页面加载情况"""
+        if self.fetcher and self.fetcher.stats:
+            print("\n=== 页面获取统计 ===")
+            for kind, kind_stats in self.fetcher.stats.items():
+                print(f"  {kind}: " + ", ".join(f"{layer}={count}" for layer, count in kind_stats.items()))
+        metrics = self.rate_limiter.metrics()
+        if metrics:
+            print("\n=== 访问频率控制 ===")
+            for host, host_metrics in metrics.items():
+                print(f"  {host}: 当前速率 {host_metrics['rate']} 次/秒, 请求 {host_metrics['requests']} 次, "
+                      f"验证码 {host_metrics['captchas']} 次, 累计等待 {host_metrics['waited']} 秒")
+        if self.async_engine and self.async_engine.stats:
+            print("\n=== 异步引擎页面获取 ===")
+            for kind, kind_stats in self.async_engine.stats.items():
+                print(f"  {kind}: " + ", ".join(f"{result}={count}" for result, count in kind_stats.items()))
+        page_summary = self.page_stats.summary()
+        if page_summary:
+            print("\n=== 浏览器页面加载 ===")
+            for kind, kind_summary in page_summary.items():
+                print(f"  {kind}: {kind_summary['pages']} 页, 平均加载 {kind_summary['avg_seconds']} 秒, "
+                      f"平均传输 {kind_summary['avg_kb']} KB")
+    
+    def resolve_captcha(self, page_source, url=None):
+        """检测验证码页面并处理，返回处理后的页面源码；同时把结果反馈给访问频率控制"""
+        url = url or self.driver.current_url
+        if not is_captcha_page(page_source):
+            self.rate_limiter.record_success(url)
+            return page_source
+        
+        print("\n检测到验证码页面...")
+        self.rate_limiter.record_captcha(url)
+        # 先尝试自动处理验证码
+        if self.handle_captcha():
+            print("验证码自动处理成功，继续执行...")
+        elif not self.manual_captcha:
+            # 无人值守时不阻塞等待输入，由调用方暂缓该链接稍后重试
+            raise CaptchaUnresolved(url)
+        else:
+            # 多个浏览器工作线程同时遇到验证码时，依次等待手动处理
+            with MANUAL_CAPTCHA_LOCK:
+                print("自动处理失败，请手动完成验证码验证...")
+                print("验证完成后，请按回车键继续...")
+                input()  # 等待用户按回车
+                print("继续执行...")
+        # 重新获取页面源码
+        return self.driver.page_source
         
     def standardize_company_scale(self, scale_text):
         """
         将企业规模数字范围映射到标准化区间
         例如：10-49 -> 20-99
         """
-        try:
-            # 提取数字范围
-            if '-' in scale_text or '~' in scale_text:
-                # 处理范围格式，如 "10-49" 或 "10~49"
-                numbers = re.findall(r'\d+', scale_text)
-                if len(numbers) >= 2:
-                    max_num = int(numbers[1])  # 使用范围的最大值进行匹配
-                else:
-                    max_num = int(numbers[0])
-            else:
-                # 处理单个数字
-                numbers = re.findall(r'\d+', scale_text)
-                if numbers:
-                    max_num = int(numbers[0])
-                else:
-                    return scale_text  # 无法解析，返回原值
-            
-            # 根据最大值映射到标准区间
-            if max_num <= 20:
-                return "0-20"
-            elif max_num <= 99:
-                return "20-99"
-            elif max_num <= 499:
-                return "100-499"
-            elif max_num <= 999:
-                return "500-999"
-            elif max_num <= 9999:
-                return "1000-9999"
-            else:
-                return "10000+"
-                
-        except (ValueError, IndexError):
-            # 解析失败，返回原值
-            return scale_text
+        return standardize_company_scale(scale_text)
     
     def standardize_company_type(self, type_text):
         """
         将企业类型映射到标准化类型
         """
-        if not type_text:
-            return type_text
-            
-        # 标准企业类型列表
-        standard_types = [
-            "国有企业",
-            "集体所有制企业", 
-            "私营企业",
-            "联营企业",
-            "外商投资企业",
-            "股份制企业",
-            "个人独资企业",
-            "合伙企业",
-            "有限责任公司",
-            "股份有限公司",
-            "非法人组织企业",
-            "农民专业合作组织"
-        ]
-        
-        # 直接匹配
-        for standard_type in standard_types:
-            if standard_type in type_text:
-                return standard_type
-        
-        # 模糊匹配规则
-        type_text_lower = type_text.lower()
-        
-        # 有限责任公司的各种表述
-        if any(keyword in type_text for keyword in ["有限责任公司", "有限公司", "责任有限公司"]):
-            return "有限责任公司"
-        
-        # 股份有限公司的各种表述
-        if any(keyword in type_text for keyword in ["股份有限公司", "股份公司"]):
-            return "股份有限公司"
-        
-        # 私营企业相关
-        if any(keyword in type_text for keyword in ["私营", "民营", "私人"]):
-            return "私营企业"
-        
-        # 国有企业相关
-        if any(keyword in type_text for keyword in ["国有", "国营", "央企", "国企"]):
-            return "国有企业"
-        
-        # 外商投资企业相关
-        if any(keyword in type_text for keyword in ["外商", "外资", "合资", "独资"]):
-            return "外商投资企业"
-        
-        # 股份制企业相关
-        if any(keyword in type_text for keyword in ["股份制", "股份合作"]):
-            return "股份制企业"
-        
-        # 集体所有制企业相关
-        if any(keyword in type_text for keyword in ["集体", "集体所有制"]):
-            return "集体所有制企业"
-        
-        # 个人独资企业相关
-        if any(keyword in type_text for keyword in ["个人独资", "独资"]):
-            return "个人独资企业"
-        
-        # 合伙企业相关
-        if any(keyword in type_text for keyword in ["合伙", "普通合伙", "有限合伙"]):
-            return "合伙企业"
-        
-        # 联营企业相关
-        if any(keyword in type_text for keyword in ["联营"]):
-            return "联营企业"
-        
-        # 农民专业合作组织相关
-        if any(keyword in type_text for keyword in ["合作社", "合作组织", "农民专业合作"]):
-            return "农民专业合作组织"
-        
-        # 非法人组织企业相关
-        if any(keyword in type_text for keyword in ["非法人", "分公司", "分支机构"]):
-            return "非法人组织企业"
-        
-        # 如果都不匹配，返回原值
-        return type_text
-        
-    def get_job_list_from_page(self, url):
-        """从58同城列表页获取职位链接并进入详情页抓取信息"""
+        return standardize_company_type(type_text)
+        
+    def fetch_list_page(self, url):
+        """用浏览器打开列表页，处理验证码后返回页面源码"""
+        self.navigate(url)
+        page_source = self.resolve_captcha(self.driver.page_source, url)
+        self.record_fixture("list", url, page_source)
+        return page_source
+    
+    def get_job_list_from_page(self, url, city=None, pager=None, page_key=None):
+        """从58同城列表页获取职位链接并进入详情页抓取信息
+
+        pager(soup, 职位链接数) 用于分页规划读取本页的分页区域（与提取职位链接共用同一个soup）；
+        page_key 为抓取进度中列表页的键（默认即url）。
+        """
+        page_key = page_key or url
         print(f"正在访问: {url}")
-        self.driver.get(url)
-        time.sleep(0.2)  # 进一步减少页面访问延时
         
         jobs_data = []
         try:
-            # 等待页面加载
-            WebDriverWait(self.driver, 5).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            
-            # 检测验证码并尝试自动处理
-            page_source = self.driver.page_source
-            if "访问过于频繁，本次访问做以下验证码校验" in page_source or "验证码校验" in page_source:
-                print("\n检测到验证码页面...")
-                # 先尝试自动处理验证码
-                if self.handle_captcha():
-                    print("验证码自动处理成功，继续执行...")
-                else:
-                    print("自动处理失败，请手动完成验证码验证...")
-                    print("验证完成后，请按回车键继续...")
-                    input()  # 等待用户按回车
-                    print("继续执行...")
+            # 列表页只解析一次，职位链接和分页区域都从同一个soup读取
+            soup = make_soup(self.fetch_list_page(url), self.parser)
             
             # 获取所有职位链接
-            job_links = self.get_job_links()
+            job_links = self.get_job_links(soup, url)
             print(f"找到 {len(job_links)} 个职位链接")
+            if pager:
+                pager(soup, len(job_links))
+            
+            if self.dedup_index is not None and job_links:
+                # 跳过之前页面、其他城市或历史运行中已处理过的职位
+                new_links = self.dedup_index.filter_new(job_links)
+                if len(new_links) < len(job_links):
+                    print(f"跳过 {len(job_links) - len(new_links)} 个重复职位")
+                job_links = new_links
+            
+            if self.frontier and job_links:
+                # 跳过已完成（或重试次数用完）的职位，其余标记为正在处理
+                self.frontier.add(city, "job", job_links)
+                remaining = [link for link in job_links if self.frontier.should_fetch(link)]
+                if len(remaining) < len(job_links):
+                    print(f"跳过 {len(job_links) - len(remaining)} 个已处理的职位")
+                job_links = remaining
+                self.frontier.claim(job_links)
+            
+            # 处理当前页面的所有职位，结果按原始顺序交给回调保存
+            retrying = False
+            def on_result(i, link, job_data, error):
+                if isinstance(error, CaptchaUnresolved) and not retrying:
+                    print(f"第{i}个职位遇到验证码，暂缓到本页最后重试")
+                    self.parked_urls.append(link)
+                elif error:
+                    print(f"处理第{i}个职位失败: {error}")
+                    if self.frontier:
+                        self.frontier.mark_failed(link, error)
+                elif job_data:
+                    jobs_data.append(job_data)
+                    # 实时保存每个职位数据
+                    self.save_job_result(link, job_data, city=city)
+                    print(f"成功抓取第{i}个职位: {job_data.get('岗位名称', 'N/A')}")
+                else:
+                    print(f"第{i}个职位数据为空")
+                    self.mark_job_processed(link)
             
-            # 处理当前页面的所有职位
-            if job_links:
+            if job_links and self.async_engine:
+                # 详情页由异步引擎并发获取，HTTP拿不到可用页面的职位再由浏览器逐个抓取
+                browser_links = self.async_engine.run(job_links, on_result)
+                for i, link in enumerate(browser_links, 1):
+                    try:
+                        print(f"\n浏览器抓取第{i}个职位: {link}")
+                        on_result(i, link, self.scrape_job_detail_page(link), None)
+                    except Exception as e:
+                        on_result(i, link, None, e)
+            elif job_links and self.workers > 1:
+                # 多浏览器并行抓取详情页，结果由写入线程按原始顺序保存
+                self.get_worker_pool().run(job_links, on_result)
+            elif job_links and self.parse_pipeline:
+                # 单浏览器抓取，解析交给进程池，与下一个页面的获取重叠
+                self.scrape_job_details_pipelined(job_links, on_result)
+            elif job_links:
                 for i, link in enumerate(job_links, 1):
                     try:
                         print(f"\n正在处理第{i}个职位")
-                        job_data = self.scrape_job_detail_page(link)
-                        if job_data:
-                            jobs_data.append(job_data)
-                            # 实时保存每个职位数据
-                            self.save_single_job_to_excel(job_data, "58同城多城市职位详细信息.xlsx")
-                            print(f"成功抓取第{i}个职位: {job_data.get('岗位名称', 'N/A')}")
-                        else:
-                            print(f"第{i}个职位数据为空")
+                        on_result(i, link, self.scrape_job_detail_page(link), None)
                         
-                        # 职位间延时，避免访问过于频繁
-                        if i < len(job_links):
-                            time.sleep(0.2)
-                            
                     except Exception as e:
-                        print(f"处理第{i}个职位失败: {e}")
+                        on_result(i, link, None, e)
                         continue
             else:
                 print("当前页面没有找到职位链接")
+            
+            if self.parked_urls:
+                # 因验证码暂缓的职位在本页最后重试一次（访问频率控制已降速），仍失败则留待 --resume
+                parked, self.parked_urls = self.parked_urls, []
+                retrying = True
+                print(f"\n重试 {len(parked)} 个因验证码暂缓的职位")
+                for i, link in enumerate(parked, 1):
+                    try:
+                        on_result(i, link, self.scrape_job_detail_page(link), None)
+                    except Exception as e:
+                        on_result(i, link, None, e)
+            
+            if self.frontier or self.dedup_index is not None:
+                # 本页职位全部落盘，后续页面即可跳过本页已处理的职位
+                self.get_sink("58同城多城市职位详细信息.xlsx").flush()
+            if self.frontier:
+                self.frontier.mark_done([page_key])
                     
         except Exception as e:
             print(f"获取职位列表失败: {e}")
+            if self.frontier:
+                self.frontier.mark_failed(page_key, e)
             
         return jobs_data
     
     def generate_page_urls(self, base_url, max_pages=5):
-        """生成多页URL列表 - 通过点击下一页按钮获取真实的下一页链接"""
-        url_list = [base_url]  # 第一页
-        
+        """生成多页URL列表 - 访问一次第一页，从分页区域读取后续页链接，读不到的按 /pnN/ 规则生成"""
         print(f"\n=== 开始生成 {max_pages} 页的URL列表 ===")
-        print(f"第 1 页URL: {base_url}")
+        planner = PaginationPlanner(base_url, max_pages)
         
         if max_pages > 1:
-            # 访问第一页
-            self.driver.get(base_url)
-            time.sleep(3)
-            
-            for page_num in range(2, max_pages + 1):
-                try:
-                    # 查找分页区域
-                    from selenium.webdriver.common.by import By
-                    from selenium.webdriver.support.ui import WebDriverWait
-                    from selenium.webdriver.support import expected_conditions as EC
-                    
-                    # 等待分页区域加载
-                    wait = WebDriverWait(self.driver, 10)
-                    pagination = wait.until(EC.presence_of_element_located((By.CLASS_NAME, 'pagesout')))
-                    
-                    # 查找下一页按钮或具体页码链接
-                    page_links = pagination.find_elements(By.TAG_NAME, 'a')
-                    
-                    next_page_element = None
-                    for link in page_links:
-                        text = link.text.strip()
-                        href = link.get_attribute('href')
-                        
-                        # 优先查找具体页码
-                        if text == str(page_num) and href and f'pn{page_num}' in href:
-                            next_page_element = link
-                            break
-                        # 备选：查找"下一页"按钮
-                        elif text in ['下一页', '下页', '>'] and href:
-                            next_page_element = link
-                    
-                    if next_page_element:
-                        # 点击下一页
-                        self.driver.execute_script("arguments[0].click();", next_page_element)
-                        time.sleep(1.5)
-                        
-                        # 获取当前页面URL
-                        current_url = self.driver.current_url
-                        url_list.append(current_url)
-                        print(f"第 {page_num} 页URL: {current_url}")
-                    else:
-                        print(f"未找到第 {page_num} 页链接，停止生成")
-                        break
-                        
-                except Exception as e:
-                    print(f"获取第 {page_num} 页链接失败: {e}")
-                    # 尝试使用默认格式
-                    base_part = base_url.rstrip('/')
-                    fallback_url = f"{base_part}/pn{page_num}/"
-                    url_list.append(fallback_url)
-                    print(f"第 {page_num} 页URL (默认格式): {fallback_url}")
-                    
-                    # 尝试访问默认URL
-                    try:
-                        self.driver.get(fallback_url)
-                        time.sleep(1)
-                    except:
-                        pass
+            try:
+                self.navigate(base_url)
+                planner.observe(1, self.resolve_captcha(self.driver.page_source, base_url))
+            except Exception as e:
+                print(f"读取分页区域失败，按默认格式生成: {e}")
         
+        url_list = planner.url_list()
+        for i, url in enumerate(url_list, 1):
+            print(f"第 {i} 页URL: {url}")
         print(f"\n=== URL列表生成完成，共 {len(url_list)} 个URL ===")
         return url_list
     
-    def scrape_multiple_pages(self, base_url, max_pages=5):
-        """抓取多页职位数据 - 先生成URL列表，再批量抓取"""
-        # 第一步：生成所有页面的URL列表
-        url_list = self.generate_page_urls(base_url, max_pages)
-        
-        # 第二步：批量抓取所有URL的数据
+    def scrape_multiple_pages(self, base_url, max_pages=5, city=None):
+        """抓取多页职位数据 - 边抓取边从分页区域规划下一页，检测到最后一页即停止"""
+        city = city or base_url
+        planner = PaginationPlanner(base_url, max_pages)
         all_jobs_data = []
         
-        print(f"\n=== 开始批量抓取 {len(url_list)} 页的职位数据 ===")
+        print(f"\n=== 开始抓取最多 {max_pages} 页的职位数据 ===")
         
-        for i, url in enumerate(url_list, 1):
+        for i, url, page_key in planner:
             try:
+                if self.frontier:
+                    self.frontier.add(city, "list", [page_key])
+                    if not self.frontier.should_fetch(page_key):
+                        print(f"\n--- 第 {i} 页已处理，跳过 ---")
+                        continue
+                    self.frontier.claim([page_key])
+                
                 print(f"\n--- 正在抓取第 {i} 页 ---")
                 print(f"URL: {url}")
                 
-                # 抓取当前页面数据
-                page_data = self.get_job_list_from_page(url)
+                # 抓取当前页面数据，同时读取分页区域规划后续页面
+                page_data = self.get_job_list_from_page(url, city, pager=partial(planner.observe, i), page_key=page_key)
                 
                 if page_data:
                     all_jobs_data.extend(page_data)
                     print(f"第 {i} 页成功抓取到 {len(page_data)} 个职位")
                     print(f"当前总计抓取职位数: {len(all_jobs_data)}")
                 else:
-                    print(f"第 {i} 页没有抓取到数据，可能已到最后一页")
-                    if i > 1:  # 如果不是第一页且没有数据，可能已到最后一页
-                        print(f"检测到第 {i} 页无数据，但继续抓取剩余页面")
+                    print(f"第 {i} 页没有抓取到新数据")
                 
-                # 页面间延时，避免访问过于频繁
-                if i < len(url_list):
-                    print(f"等待 1 秒后继续下一页...")
-                    time.sleep(0.3)  # 进一步减少页面间延时
+                if planner.last_page is not None and i >= planner.last_page:
+                    print(f"第 {i} 页已是最后一页，停止翻页")
+                    break
                     
             except Exception as e:
                 print(f"抓取第 {i} 页时出错: {e}")
@@ -487,57 +498,18 @@ class Enhanced58JobScraper:
         print(f"\n=== 多页抓取完成，总共抓取到 {len(all_jobs_data)} 个职位 ===")
         return all_jobs_data
     
-    def get_job_links(self):
-        """获取当前页面所有职位的详情链接"""
+    def get_job_links(self, page_source=None, base_url=None):
+        """获取当前页面所有职位的详情链接
+
+        只解析一次页面源码，不再对每个元素发起WebDriver调用；page_source 也可以是已解析的soup。
+        """
         job_links = []
         try:
-            # 尝试多种方式获取职位链接
-            link_selectors = [
-                "span.name",  # 用户指定的span.name元素
-                "a[href*='shtml']",  # 58同城职位详情页通常以.shtml结尾
-                "a[href*='job']",
-                "a[href*='zhaopin']",
-                ".job_name a",
-                ".job-title a",
-                ".title a"
-            ]
-            
-            for selector in link_selectors:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    if selector == "span.name":
-                        # 对于span.name元素，需要找到其父级或相关的链接
-                        try:
-                            # 尝试找到包含该span的链接元素
-                            parent_link = element.find_element(By.XPATH, "./ancestor::a[1]")
-                            href = parent_link.get_attribute('href')
-                        except:
-                            # 如果span不在链接内，尝试找到同级或相邻的链接
-                            try:
-                                sibling_link = element.find_element(By.XPATH, "./following-sibling::a[1] | ./preceding-sibling::a[1]")
-                                href = sibling_link.get_attribute('href')
-                            except:
-                                # 如果都找不到，尝试点击span元素本身看是否可点击
-                                try:
-                                    element.click()
-                                    time.sleep(2)
-                                    current_url = self.driver.current_url
-                                    if current_url != self.driver.current_url:
-                                        href = current_url
-                                    else:
-                                        href = None
-                                except:
-                                    href = None
-                    else:
-                        href = element.get_attribute('href')
-                    
-                    if href and ('shtml' in href or 'job' in href or 'zhaopin' in href or 'detail' in href):
-                        if href not in job_links:
-                            job_links.append(href)
-                            
-                if job_links:  # 如果找到链接就停止尝试其他选择器
-                    break
-                    
+            if page_source is None:
+                page_source = self.driver.page_source
+            if base_url is None:
+                base_url = self.driver.current_url
+            job_links = extract_job_links(make_soup(page_source, self.parser), base_url)
         except Exception as e:
             print(f"获取职位链接失败: {e}")
             
@@ -545,837 +517,98 @@ class Enhanced58JobScraper:
     
     def scrape_job_detail_page(self, job_url):
         """进入职位详情页面抓取完整信息"""
-        job_data = {
-            "企业名称": "",
-            "企业类型": "",
-            "社会信用码": "",
-            "企业规模": "",
-            "注册资本(万)": "",
-            "所属区域": "",
-            "联系人": "",
-            "联系方式": "",
-            "联系邮箱": "",
-            "办公地址": "",
-            "企业简介": "",
-            "营业执照": "",
-            "企业相册": "",
-            "岗位名称": "",
-            "薪资类型": "",
-            "薪资范围起": "",
-            "薪资范围至": "",
-            "工作地点": "",
-            "岗位要求": "",
-            "学历要求": "",
-            "招聘人数": "",
-            "发布时间": "",
-            "结束时间": "",
-            "工作职责": "",
-            "任职要求": ""
-        }
-        
-        try:
-            # 访问职位详情页
-            self.driver.get(job_url)
-            time.sleep(0.3)
-            
-            # 等待页面加载
-            WebDriverWait(self.driver, 4).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            
-            # 检测验证码并尝试自动处理
-            page_source = self.driver.page_source
-            if "访问过于频繁，本次访问做以下验证码校验" in page_source or "验证码校验" in page_source:
-                print("\n检测到验证码页面...")
-                # 先尝试自动处理验证码
-                if self.handle_captcha():
-                    print("验证码自动处理成功，继续执行...")
-                else:
-                    print("自动处理失败，请手动完成验证码验证...")
-                    print("验证完成后，请按回车键继续...")
-                    input()  # 等待用户按回车
-                    print("继续执行...")
-                # 重新获取页面源码
-                page_source = self.driver.page_source
-            
-            # 获取页面源码
-            soup = BeautifulSoup(page_source, "html.parser")
-            
-            # 移除"您可能感兴趣的职位"等推荐区域
-            for unwanted in soup.find_all(['div', 'section'], class_=lambda x: x and ('recommend' in x.lower() or 'interest' in x.lower() or 'similar' in x.lower())):
-                unwanted.decompose()
-            
-            # 移除包含"您可能感兴趣"文本的区域
-            for element in soup.find_all(string=lambda text: text and '您可能感兴趣' in text):
-                parent = element.parent
-                while parent and parent.name != 'body':
-                    if parent.name in ['div', 'section', 'aside']:
-                        parent.decompose()
-                        break
-                    parent = parent.parent
-            
-            # 只保留主要内容区域
-            main_content = soup.find('div', class_=lambda x: x and ('main' in x.lower() or 'content' in x.lower() or 'detail' in x.lower()))
-            if main_content:
-                page_text = main_content.get_text()
-            else:
-                page_text = soup.get_text()
-            
-            # 提取岗位名称 - 基于实际HTML结构的选择器
-            title_selectors = [
-                ".pos_title", ".job-title", ".job_title", ".title", "h1", ".name",
-                "[class*='title']:not([class*='recommend']):not([class*='similar'])",
-                "[class*='name']:not([class*='recommend']):not([class*='similar'])"
-            ]
-            for selector in title_selectors:
-                title_element = soup.select_one(selector)
-                if title_element and title_element.get_text().strip():
-                    title_text = title_element.get_text().strip()
-                    # 过滤掉包含推荐信息和培训广告的文本
-                    if ('您可能感兴趣' not in title_text and '推荐职位' not in title_text and 
-                        '培训广告' not in title_text):
-                        job_data["岗位名称"] = title_text
-                        break
-            
-            # 提取企业名称和企业链接 - 基于实际HTML结构的选择器
-            company_url = None
-            company_selectors = [
-                ".baseInfo_link a", ".baseInfo_link", ".company-name", ".company_name", ".company", ".corp-name",
-                "h1 + .company", ".job-company", ".employer-name",
-                "[class*='company']:not([class*='recommend']):not([class*='similar'])"
-            ]
-            for selector in company_selectors:
-                company_element = soup.select_one(selector)
-                if company_element and company_element.get_text().strip():
-                    company_text = company_element.get_text().strip()
-                    # 过滤掉包含推荐信息和特定开头的文本，以及不包含"公司"字的企业名称
-                    # 同时检查企业名称长度（3-20个字）和非空
-                    if (company_text and len(company_text) >= 3 and len(company_text) <= 20 and
-                        '您可能感兴趣' not in company_text and '推荐职位' not in company_text and 
-                        not company_text.startswith('微信扫一扫快速求职') and '公司' in company_text):
-                        job_data["企业名称"] = company_text
-                        # 提取企业链接
-                        if company_element.name == 'a' and company_element.get('href'):
-                            company_url = company_element.get('href')
-                            if not company_url.startswith('http'):
-                                company_url = 'https:' + company_url if company_url.startswith('//') else 'https://58.com' + company_url
-                        break
-            
-            # 如果没找到企业名称，用正则表达式从页面文本中提取
-            if not job_data["企业名称"]:
-                # 从页面文本的前半部分提取，避免推荐区域
-                text_lines = page_text.split('\n')[:50]  # 只取前50行
-                first_half_text = '\n'.join(text_lines)
-                
-                # 只匹配包含"公司"字的企业名称
-                company_patterns = [
-                    r'([\u4e00-\u9fa5]{2,20}公司)',
-                    r'([A-Za-z\s]{2,30}(?:公司|Company))'
-                ]
-                for pattern in company_patterns:
-                    match = re.search(pattern, first_half_text)
-                    if match:
-                        company_name = match.group(1).strip()
-                        # 过滤掉以特定内容开头的企业名称，确保包含"公司"字
-                        # 同时检查企业名称长度（3-20个字）和非空
-                        if (company_name and len(company_name) >= 3 and len(company_name) <= 20 and
-                            not company_name.startswith('微信扫一扫快速求职') and '公司' in company_name):
-                            job_data["企业名称"] = company_name
-                            break
-            
-            # 提取薪资信息 - 基于实际HTML结构和文本模式
-            # 首先尝试从CSS选择器提取
-            salary_element = soup.select_one(".pos_salary")
-            if salary_element:
-                salary_text = salary_element.get_text().strip()
-                salary_match = re.search(r'(\d+)-(\d+)', salary_text)
-                if salary_match:
-                    job_data["薪资范围起"] = salary_match.group(1)
-                    job_data["薪资范围至"] = salary_match.group(2)
-            
-            # 如果CSS选择器没找到，使用正则表达式
-            if not job_data["薪资范围起"]:
-                salary_patterns = [
-                    r'(\d+)[-~](\d+)元/月',
-                    r'(\d+)[-~](\d+)万/年',
-                    r'(\d+)[-~](\d+)千/月',
-                    r'薪资.*?(\d+)[-~](\d+)',
-                    r'工资.*?(\d+)[-~](\d+)'
-                ]
-                
-                # 从页面文本的前半部分提取薪资信息
-                text_lines = page_text.split('\n')[:30]  # 只取前30行
-                salary_text = '\n'.join(text_lines)
-                
-                for pattern in salary_patterns:
-                    salary_match = re.search(pattern, salary_text)
-                    if salary_match:
-                        groups = salary_match.groups()
-                        if len(groups) >= 2:
-                            job_data["薪资范围起"] = groups[0]
-                            job_data["薪资范围至"] = groups[1]
-                        break
-            
-            # 薪资类型逻辑：默认为非面谈，如果薪资范围没有匹配到内容则设为面谈
-            if job_data["薪资范围起"] and job_data["薪资范围至"]:
-                job_data["薪资类型"] = "非面谈"
-            else:
-                job_data["薪资类型"] = "面谈"
-            
-            # 提取工作地点 - 只保留"北京 - 大兴"格式，去掉详细地址
-            # 首先尝试从.pos_area_item提取基本信息
-            location_elements = soup.select(".pos_area_item")
-            if location_elements and len(location_elements) >= 2:
-                # 只取前两个元素：城市和区域
-                location_parts = [elem.get_text().strip() for elem in location_elements[:2]]
-                basic_location = " - ".join(location_parts)
-                job_data["工作地点"] = basic_location
-            
-            # 如果CSS选择器没找到，使用正则表达式，只匹配"城市 - 区域"格式
-            if not job_data["工作地点"]:
-                location_patterns = [
-                    r'(北京)\s*[-\s]*([\u4e00-\u9fa5]+区)',
-                    r'(上海)\s*[-\s]*([\u4e00-\u9fa5]+区)',
-                    r'(广州)\s*[-\s]*([\u4e00-\u9fa5]+区)',
-                    r'(深圳)\s*[-\s]*([\u4e00-\u9fa5]+区)',
-                    r'([\u4e00-\u9fa5]+市?)\s*[-\s]*([\u4e00-\u9fa5]+区)'
-                ]
-                
-                # 从页面文本的前半部分提取地点信息
-                location_text = '\n'.join(page_text.split('\n')[:40])
-                
-                for pattern in location_patterns:
-                    location_match = re.search(pattern, location_text)
-                    if location_match:
-                        city = location_match.group(1).replace('市', '')
-                        district = location_match.group(2)
-                        job_data["工作地点"] = f"{city} - {district}"
-                        break
-            
-            # 提取学历要求 - 基于实际HTML结构
-            # 首先尝试从CSS选择器提取
-            condition_elements = soup.select(".item_condition")
-            for elem in condition_elements:
-                text = elem.get_text().strip()
-                if any(edu in text for edu in ['博士', '硕士', '研究生', '本科', '大专', '专科', '高中', '中专', '初中', '学历不限']):
-                    # 将初中、中专、高中统一显示为学历不限
-                    if any(low_edu in text for low_edu in ['初中', '中专', '高中']):
-                        job_data["学历要求"] = "学历不限"
-                    else:
-                        job_data["学历要求"] = text
-                    break
-            
-            # 如果CSS选择器没找到，使用正则表达式
-            if not job_data["学历要求"]:
-                education_patterns = [
-                    r'学历要求.*?(博士|硕士|研究生|本科|大专|专科|高中|中专|初中|不限)',
-                    r'学历.*?(博士|硕士|研究生|本科|大专|专科|高中|中专|初中|不限)',
-                    r'(博士|硕士|研究生|本科|大专|专科)以上',
-                    r'要求.*?(博士|硕士|研究生|本科|大专|专科|高中|中专|初中)'
-                ]
-                
-                # 从页面文本的前半部分提取学历信息
-                education_text = '\n'.join(page_text.split('\n')[:50])
-                
-                for pattern in education_patterns:
-                    edu_match = re.search(pattern, education_text)
-                    if edu_match:
-                        education_level = edu_match.group(1)
-                        # 将初中、中专、高中统一显示为学历不限
-                        if education_level in ['初中', '中专', '高中']:
-                            job_data["学历要求"] = "学历不限"
-                        else:
-                            job_data["学历要求"] = education_level
-                        break
-            
-            # 提取工作经验要求 - 基于实际HTML结构
-            # 首先尝试从CSS选择器提取
-            for elem in condition_elements:
-                text = elem.get_text().strip()
-                if any(exp in text for exp in ['经验', '年', '应届', '不限']):
-                    if '学历' not in text and '招' not in text:  # 排除学历和招聘人数信息
-                        job_data["岗位要求"] = text
-                        break
-            
-            # 如果CSS选择器没找到，使用正则表达式
-            if not job_data["岗位要求"]:
-                exp_patterns = [
-                    r'工作经验.*?(\d+)[-~](\d+)年',
-                    r'经验.*?(\d+)[-~](\d+)年',
-                    r'(\d+)年以上.*?经验',
-                    r'经验.*?(\d+)年以上',
-                    r'(无需经验|不限经验|应届毕业生|经验不限)'
-                ]
-                
-                # 从页面文本的前半部分提取经验信息
-                exp_text = '\n'.join(page_text.split('\n')[:50])
-                
-                for pattern in exp_patterns:
-                    exp_match = re.search(pattern, exp_text)
-                    if exp_match:
-                        if len(exp_match.groups()) >= 2:
-                            job_data["岗位要求"] = f"{exp_match.group(1)}-{exp_match.group(2)}年经验"
-                        else:
-                            job_data["岗位要求"] = exp_match.group(1)
-                        break
-            
-            # 提取招聘人数 - 只匹配数字，默认为1
-            recruit_number = 1  # 默认值
-            
-            # 首先尝试从CSS选择器提取
-            for elem in condition_elements:
-                text = elem.get_text().strip()
-                if '招' in text and '人' in text:
-                    # 从文本中提取数字
-                    number_match = re.search(r'(\d+)', text)
-                    if number_match:
-                        recruit_number = int(number_match.group(1))
-                    break
-            
-            # 如果CSS选择器没找到，使用正则表达式
-            if recruit_number == 1:  # 如果还是默认值，继续尝试
-                recruit_patterns = [
-                    r'招聘.*?(\d+)人',
-                    r'招.*?(\d+)人',
-                    r'(\d+)人'
-                ]
-                
-                # 从页面文本的前半部分提取招聘人数信息
-                recruit_text = '\n'.join(page_text.split('\n')[:40])
-                
-                for pattern in recruit_patterns:
-                    recruit_match = re.search(pattern, recruit_text)
-                    if recruit_match:
-                        try:
-                            recruit_number = int(recruit_match.group(1))
-                            break
-                        except ValueError:
-                            continue
-            
-            # 设置招聘人数为数字类型
-            job_data["招聘人数"] = recruit_number
-            
-            # 提取发布时间
-            time_patterns = [
-                r'发布时间.*?(\d{4}-\d{2}-\d{2})',
-                r'(\d{4}-\d{2}-\d{2})',
-                r'(\d{2}-\d{2})',
-                r'(今天|昨天|前天)',
-                r'(\d+)小时前',
-                r'(\d+)天前'
-            ]
-            
-            for pattern in time_patterns:
-                time_match = re.search(pattern, page_text)
-                if time_match:
-                    job_data["发布时间"] = time_match.group(1)
-                    break
-            
-            # 提取工作职责和任职要求 - 基于用户要求的精确匹配
-            # 首先尝试从职位描述区域提取
-            job_desc_element = soup.select_one(".des")
-            full_desc_text = ""
-            if job_desc_element:
-                desc_text = job_desc_element.get_text()
-                full_desc_text = desc_text  # 保存完整描述文本
-                
-                # 提取岗位职责内容
-                responsibility_patterns = [
-                    r'岗位职责[：:]?\s*(.*?)(?=任职要求|福利待遇|联系方式|$)',
-                    r'工作职责[：:]?\s*(.*?)(?=任职要求|福利待遇|联系方式|$)',
-                    r'工作内容[：:]?\s*(.*?)(?=任职要求|福利待遇|联系方式|$)'
-                ]
-                
-                for pattern in responsibility_patterns:
-                    responsibility_match = re.search(pattern, desc_text, re.DOTALL)
-                    if responsibility_match:
-                        job_data["工作职责"] = responsibility_match.group(1).strip()[:500]
-                        break
-                
-                # 提取任职要求内容
-                requirement_patterns = [
-                    r'任职要求[：:]?\s*(.*?)(?=福利待遇|联系方式|工作地点|$)',
-                    r'职位要求[：:]?\s*(.*?)(?=福利待遇|联系方式|工作地点|$)'
-                ]
-                
-                for pattern in requirement_patterns:
-                    requirement_match = re.search(pattern, desc_text, re.DOTALL)
-                    if requirement_match:
-                        job_data["任职要求"] = requirement_match.group(1).strip()[:500]
-                        break
-            
-            # 如果没有找到，使用页面文本进行提取
-            if not job_data["工作职责"] or not job_data["任职要求"]:
-                # 提取岗位职责
-                if not job_data["工作职责"]:
-                    responsibility_patterns = [
-                        r'岗位职责[：:]?\s*(.*?)(?=任职要求|福利待遇|联系方式|工作地点|$)',
-                        r'工作职责[：:]?\s*(.*?)(?=任职要求|福利待遇|联系方式|工作地点|$)',
-                        r'工作内容[：:]?\s*(.*?)(?=任职要求|福利待遇|联系方式|工作地点|$)',
-                        r'职责[：:]?\s*(.*?)(?=任职要求|福利待遇|联系方式|工作地点|$)'
-                    ]
-                    
-                    for pattern in responsibility_patterns:
-                        match = re.search(pattern, page_text, re.DOTALL)
-                        if match:
-                            job_data["工作职责"] = match.group(1).strip()[:500]
-                            break
-                
-                # 提取任职要求
-                if not job_data["任职要求"]:
-                    requirement_patterns = [
-                        r'任职要求[：:]?\s*(.*?)(?=福利待遇|联系方式|工作地点|公司简介|$)',
-                        r'职位要求[：:]?\s*(.*?)(?=福利待遇|联系方式|工作地点|公司简介|$)',
-                        r'岗位要求[：:]?\s*(.*?)(?=福利待遇|联系方式|工作地点|公司简介|$)',
-                        r'要求[：:]?\s*(.*?)(?=福利待遇|联系方式|工作地点|公司简介|$)'
-                    ]
-                    
-                    for pattern in requirement_patterns:
-                        match = re.search(pattern, page_text, re.DOTALL)
-                        if match:
-                            job_data["任职要求"] = match.group(1).strip()[:500]
-                            break
-            
-            # 如果工作职责和任职要求都没有匹配成功，将职位描述写入任职要求
-            if not job_data["工作职责"] and not job_data["任职要求"] and full_desc_text:
-                # 清理描述文本，去除多余的空白字符
-                cleaned_desc = re.sub(r'\s+', ' ', full_desc_text.strip())
-                job_data["任职要求"] = cleaned_desc[:500]
-            
-            # 清理工作职责和任职要求字段，去除开头的】符号
-            if job_data["工作职责"] and job_data["工作职责"].startswith('】'):
-                job_data["工作职责"] = job_data["工作职责"][1:].strip()
-            
-            if job_data["任职要求"] and job_data["任职要求"].startswith('】'):
-                job_data["任职要求"] = job_data["任职要求"][1:].strip()
+        job_data, company_url = self.parse_job_detail(self.fetch_job_detail_html(job_url))
+        return self.complete_job_data(job_data, company_url)
+    
+    def fetch_job_detail_html(self, job_url):
+        """获取职位详情页源码（优先HTTP，必要时浏览器）
 
-            # 提取联系方式
-            contact_patterns = [
-                r'联系电话.*?(1[3-9]\d{9})',
-                r'电话.*?(1[3-9]\d{9})',
-                r'手机.*?(1[3-9]\d{9})',
-                r'(1[3-9]\d{9})'
-            ]
-            
-            for pattern in contact_patterns:
-                contact_match = re.search(pattern, page_text)
-                if contact_match:
-                    job_data["联系方式"] = contact_match.group(1)
-                    break
-            
-            # 提取邮箱
-            email_pattern = r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
-            email_match = re.search(email_pattern, page_text)
-            if email_match:
-                job_data["联系邮箱"] = email_match.group(1)
-            
-            # 提取办公地址
-            address_patterns = [
-                r'办公地址.*?([\u4e00-\u9fa5]+市[\u4e00-\u9fa5]+区.*?)(?=联系|电话|邮箱|$)',
-                r'地址.*?([\u4e00-\u9fa5]+市[\u4e00-\u9fa5]+区.*?)(?=联系|电话|邮箱|$)',
-                r'公司地址.*?([\u4e00-\u9fa5]+市[\u4e00-\u9fa5]+区.*?)(?=联系|电话|邮箱|$)'
-            ]
-            
-            for pattern in address_patterns:
-                address_match = re.search(pattern, page_text)
-                if address_match:
-                    job_data["办公地址"] = address_match.group(1).strip()[:100]  # 限制长度
-                    break
-            
-        except Exception as e:
-            print(f"抓取职位详情页失败: {e}")
-        
+        获取失败（超时、取不到浏览器等）时抛出异常，由调用方在抓取进度中记为失败，--resume 时重试；
+        不能当作空页面继续解析，否则空数据会被过滤并把该职位标记为已完成。
+        """
+        return self.fetch_page_source(job_url, "detail")
+    
+    def parse_job_detail(self, page_source, future=None):
+        """解析职位详情页，返回(job_data, 企业链接)；future为解析进程池已提交的任务，解析出错时抛出异常"""
+        if future is not None:
+            return future.result()
+        if self.parse_pipeline:
+            return self.parse_pipeline.parse("detail", page_source)
+        # 按预编译的字段规则表提取（见job_extractors.JOB_DETAIL_RULES）
+        return parse_job_detail_html(page_source, self.parser)
+    
+    def complete_job_data(self, job_data, company_url):
+        """过滤培训广告并合并企业详细信息，跳过的职位返回None"""
         # 检查职位名称是否包含培训广告，如果包含则跳过该职位
-        if job_data["岗位名称"] and "培训广告" in job_data["岗位名称"]:
+        if is_training_ad(job_data):
             print(f"× 跳过培训广告职位: {job_data['岗位名称']}")
             return None
             
         # 如果找到了企业链接，抓取企业详细信息
         if company_url and job_data["企业名称"]:
-            print(f"正在抓取企业详细信息: {job_data['企业名称']}")
-            company_details = self.scrape_company_detail_page(company_url)
-            # 将企业详细信息合并到job_data中
-            for key, value in company_details.items():
-                if value:  # 只更新非空值
-                    job_data[key] = value
+            company_details = self.company_cache.get(company_url)
+            if company_details is None:
+                print(f"正在抓取企业详细信息: {job_data['企业名称']}")
+                company_details = self.scrape_company_detail_page(company_url)
+                # 只缓存抓取到内容的企业，抓取失败的下次重试；新的企业链接按信用码并入已缓存的同一企业
+                if any(company_details.values()):
+                    company_details = self.company_cache.merge_known(company_details)
+                    self.company_cache.put(company_url, company_details)
+            else:
+                print(f"企业详细信息命中缓存: {job_data['企业名称']}")
+            # 将企业详细信息合并到job_data中（只更新非空值）
+            merge_company_details(job_data, company_details)
             
         return job_data
+    
+    def scrape_job_details_pipelined(self, job_links, on_result):
+        """流水线抓取详情页：第i个职位在解析进程池中解析时，浏览器已开始获取第i+1个职位页面
+
+        on_result(序号, 链接, job_data, 异常)按原始顺序调用，与详情页抓取工作池的回调一致。
+        """
+        pending = None
+        for i, link in enumerate(job_links, 1):
+            print(f"\n正在处理第{i}个职位")
+            error = None
+            try:
+                page_source = self.fetch_job_detail_html(link)
+            except Exception as e:
+                page_source, error = None, e
+            future = self.parse_pipeline.submit("detail", page_source) if page_source is not None else None
+            if pending:
+                self._finish_pipelined_job(pending, on_result)
+            pending = (i, link, page_source, future, error)
+        if pending:
+            self._finish_pipelined_job(pending, on_result)
+    
+    def _finish_pipelined_job(self, pending, on_result):
+        i, link, page_source, future, error = pending
+        if error:
+            on_result(i, link, None, error)
+            return
+        try:
+            job_data = self.complete_job_data(*self.parse_job_detail(page_source, future))
+        except Exception as e:
+            on_result(i, link, None, e)
+            return
+        on_result(i, link, job_data, None)
 
     def scrape_company_detail_page(self, company_url):
         """进入企业详情页面抓取企业详细信息"""
-        company_data = {
-            "企业类型": "",
-            "社会信用码": "",
-            "企业规模": "",
-            "注册资本(万)": "",
-            "所属区域": "",
-            "联系人": "",
-            "联系方式": "",
-            "联系邮箱": "",
-            "办公地址": "",
-            "企业简介": "",
-            "营业执照": "",
-            "企业相册": ""
-        }
+        company_data = new_company_data()
         
         try:
-            # 访问企业详情页
-            self.driver.get(company_url)
-            time.sleep(0.2)  # 进一步减少企业详情页延时
+            # 获取企业详情页源码（优先HTTP，必要时浏览器）
+            page_source = self.fetch_page_source(company_url, "company")
             
-            # 等待页面加载
-            WebDriverWait(self.driver, 4).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            
-            # 检测验证码并尝试自动处理
-            page_source = self.driver.page_source
-            if "访问过于频繁，本次访问做以下验证码校验" in page_source or "验证码校验" in page_source:
-                print("\n检测到验证码页面...")
-                # 先尝试自动处理验证码
-                if self.handle_captcha():
-                    print("验证码自动处理成功，继续执行...")
-                else:
-                    print("自动处理失败，请手动完成验证码验证...")
-                    print("验证完成后，请按回车键继续...")
-                    input()  # 等待用户按回车
-                    print("继续执行...")
-                # 重新获取页面源码
-                page_source = self.driver.page_source
-            
-            # 获取页面源码
-            soup = BeautifulSoup(page_source, "html.parser")
-            
-            # 移除"您可能感兴趣的企业"等推荐区域
-            for unwanted in soup.find_all(['div', 'section'], class_=lambda x: x and ('recommend' in x.lower() or 'interest' in x.lower() or 'similar' in x.lower())):
-                unwanted.decompose()
-            
-            # 移除包含"您可能感兴趣"文本的区域
-            for element in soup.find_all(string=lambda text: text and '您可能感兴趣' in text):
-                parent = element.parent
-                while parent and parent.name != 'body':
-                    if parent.name in ['div', 'section', 'aside']:
-                        parent.decompose()
-                        break
-                    parent = parent.parent
-            
-            # 获取页面文本
-            page_text = soup.get_text()
-            
-            # 提取企业类型 - 只匹配具体的公司类型格式
-            type_patterns = [
-                r'(有限责任公司\([^)]+\))',
-                r'(股份有限公司\([^)]+\))',
-                r'(有限责任公司)',
-                r'(股份有限公司)',
-                r'公司类型[：:]?\s*(有限责任公司\([^)]+\))',
-                r'公司类型[：:]?\s*(股份有限公司\([^)]+\))',
-                r'公司类型[：:]?\s*(有限责任公司)',
-                r'公司类型[：:]?\s*(股份有限公司)'
-            ]
-            for pattern in type_patterns:
-                match = re.search(pattern, page_text)
-                if match:
-                    type_text = match.group(1).strip()
-                    # 将企业类型标准化
-                    standardized_type = self.standardize_company_type(type_text)
-                    company_data["企业类型"] = standardized_type
-                    break
-            
-            # 提取社会信用码
-            credit_patterns = [
-                r'社会信用代码[：:]?\s*([A-Z0-9]{18})',
-                r'统一社会信用代码[：:]?\s*([A-Z0-9]{18})',
-                r'信用代码[：:]?\s*([A-Z0-9]{18})',
-                r'([A-Z0-9]{18})'
-            ]
-            for pattern in credit_patterns:
-                match = re.search(pattern, page_text)
-                if match:
-                    company_data["社会信用码"] = match.group(1).strip()
-                    break
-            
-            # 提取企业规模 - 只匹配员工规模的数字部分
-            scale_patterns = [
-                r'员工规模[：:]?\s*(\d+[-~]\d+)人',
-                r'员工规模[：:]?\s*(\d+)人以上',
-                r'员工规模[：:]?\s*(\d+)人以下',
-                r'员工规模[：:]?\s*(\d+)人',
-                r'公司规模[：:]?\s*(\d+[-~]\d+)人',
-                r'公司规模[：:]?\s*(\d+)人以上',
-                r'公司规模[：:]?\s*(\d+)人以下',
-                r'公司规模[：:]?\s*(\d+)人',
-                r'企业规模[：:]?\s*(\d+[-~]\d+)人',
-                r'企业规模[：:]?\s*(\d+)人以上',
-                r'企业规模[：:]?\s*(\d+)人以下',
-                r'企业规模[：:]?\s*(\d+)人',
-                r'规模[：:]?\s*(\d+[-~]\d+)人',
-                r'规模[：:]?\s*(\d+)人以上',
-                r'规模[：:]?\s*(\d+)人以下',
-                r'规模[：:]?\s*(\d+)人'
-            ]
-            for pattern in scale_patterns:
-                match = re.search(pattern, page_text)
-                if match:
-                    scale_number = match.group(1).strip()
-                    # 只保存数字部分
-                    if scale_number and '企业未添加' not in scale_number:
-                        # 将数字范围映射到标准化规模区间
-                        standardized_scale = self.standardize_company_scale(scale_number)
-                        company_data["企业规模"] = standardized_scale
-                        break
-            
-            # 提取注册资本
-            capital_patterns = [
-                r'注册资本[：:]?\s*([\d.]+万?)',
-                r'注册资金[：:]?\s*([\d.]+万?)',
-                r'资本[：:]?\s*([\d.]+万?)'
-            ]
-            for pattern in capital_patterns:
-                match = re.search(pattern, page_text)
-                if match:
-                    capital_text = match.group(1).strip()
-                    # 统一转换为万元
-                    if '万' not in capital_text:
-                        try:
-                            capital_num = float(capital_text)
-                            if capital_num > 10000:  # 如果大于1万，可能是元为单位
-                                capital_text = str(capital_num / 10000)
-                        except:
-                            pass
-                    company_data["注册资本(万)"] = capital_text
-                    break
-            
-            # 提取所属区域 - 只匹配城市级别地址，过滤无用信息和重复地址
-            region_patterns = [
-                r'所属区域[：:]?\s*([\u4e00-\u9fa5]+市[\u4e00-\u9fa5]+区)',
-                r'地区[：:]?\s*([\u4e00-\u9fa5]+市[\u4e00-\u9fa5]+区)',
-                r'区域[：:]?\s*([\u4e00-\u9fa5]+市[\u4e00-\u9fa5]+区)',
-                r'总部位于([\u4e00-\u9fa5]+市[\u4e00-\u9fa5]+区)',
-                r'(?:^|\s)([\u4e00-\u9fa5]{2,4}市[\u4e00-\u9fa5]{2,4}区)(?=\s|$)'
-            ]
-            for pattern in region_patterns:
-                match = re.search(pattern, page_text)
-                if match:
-                    region_text = match.group(1).strip()
-                    # 过滤掉包含无关词汇的内容
-                    unwanted_keywords = ['注册地位于', '注册地址', '营业执照', '工商注册', '找工作', '免费发布', '登记简历', 
-                                        '公司福利', '饭补', '加班补助', '交通便利', '餐补', '市中心区', '不匹配', 
-                                        '人公司', '福利', '补助', '便利', '有限公司', '科技有限公司', '信息科技', 
-                                        '华南地区', '华北地区', '华东地区', '华西地区', '在华', '地区', '公司在']
-                    if not any(unwanted in region_text for unwanted in unwanted_keywords):
-                        # 确保是标准的城市区域格式，且长度合理
-                        if re.match(r'^[\u4e00-\u9fa5]{2,4}市[\u4e00-\u9fa5]{2,4}区$', region_text) and len(region_text) <= 10:
-                            # 处理重复地址，只保留第一个"XX市XX区"格式
-                            first_region_match = re.search(r'^([\u4e00-\u9fa5]+市[\u4e00-\u9fa5]+区)', region_text)
-                            if first_region_match:
-                                company_data["所属区域"] = first_region_match.group(1)
-                            else:
-                                company_data["所属区域"] = region_text
-                            break
-            
-            # 进一步清理所属区域，去除重复的地址部分
-            if company_data.get("所属区域"):
-                region = company_data["所属区域"]
-                # 处理类似"北京市房山区阳光北大街北京市房山区"的重复问题
-                # 查找第一个完整的"XX市XX区"模式
-                first_region_match = re.search(r'^([\u4e00-\u9fa5]+市[\u4e00-\u9fa5]+区)', region)
-                if first_region_match:
-                    clean_region = first_region_match.group(1)
-                    company_data["所属区域"] = clean_region
-            
-            # 提取联系人 - 匹配特定HTML结构中的联系人姓名
-            # 查找 <div class="c_detail_item"><span>联系人</span><i></i><em class="">姓名</em></div> 结构
-            contact_div = soup.find('div', class_='c_detail_item')
-            if contact_div:
-                span = contact_div.find('span')
-                if span and '联系人' in span.get_text():
-                    em = contact_div.find('em')
-                    if em:
-                        contact_person = em.get_text().strip()
-                        # 如果是"企业未添加联系人"或类似内容，则为空
-                        if contact_person and '企业未添加' not in contact_person:
-                            company_data["联系人"] = contact_person
-            
-            # 如果没有找到特定结构，使用备用正则表达式
-            if not company_data.get("联系人"):
-                contact_person_patterns = [
-                    r'联系人[：:]?\s*([\u4e00-\u9fa5]{2,10})',
-                    r'HR[：:]?\s*([\u4e00-\u9fa5]{2,10})',
-                    r'招聘负责人[：:]?\s*([\u4e00-\u9fa5]{2,10})'
-                ]
-                for pattern in contact_person_patterns:
-                    match = re.search(pattern, page_text)
-                    if match:
-                        contact_person = match.group(1).strip()
-                        # 如果是"企业未添加"、"企业未添"或类似内容，则为空
-                        if contact_person and not any(invalid in contact_person for invalid in ['企业未添加', '企业未添', '未添加', '未添']):
-                            company_data["联系人"] = contact_person
-                        break
-            
-            # 提取联系方式 - 如果是"企业未添加"就为空
-            phone_patterns = [
-                r'联系方式[：:]?\s*(1[3-9]\d{9})',
-                r'联系电话[：:]?\s*(1[3-9]\d{9})',
-                r'电话[：:]?\s*(1[3-9]\d{9})',
-                r'手机[：:]?\s*(1[3-9]\d{9})',
-                r'(1[3-9]\d{9})'
-            ]
-            # 先检查是否有"企业未添加"的情况
-            if '企业未添加' not in page_text or '联系方式' not in page_text:
-                for pattern in phone_patterns:
-                    match = re.search(pattern, page_text)
-                    if match:
-                        phone_number = match.group(1).strip()
-                        # 确保不是"企业未添加"相关内容
-                        if phone_number and '企业未添加' not in phone_number and '未添加' not in phone_number:
-                            company_data["联系方式"] = phone_number
-                        break
-            
-            # 提取联系邮箱 - 匹配招聘邮箱，如果是"企业未添加"就为空
-            email_patterns = [
-                r'招聘邮箱[：:]?\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                r'邮箱[：:]?\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                r'邮件[：:]?\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
-            ]
-            # 先检查是否有"企业未添加"的情况
-            if '企业未添加' not in page_text or '邮箱' not in page_text:
-                for pattern in email_patterns:
-                    match = re.search(pattern, page_text)
-                    if match:
-                        email_address = match.group(1).strip()
-                        # 确保不是"企业未添加"相关内容
-                        if email_address and '企业未添加' not in email_address and '未添加' not in email_address:
-                            company_data["联系邮箱"] = email_address
-                        break
-            
-            # 提取办公地址 - 匹配公司地址格式，如"北京-大兴-西红门 西红门鸿坤金融谷25号楼"
-            address_patterns = [
-                r'公司地址\s*([\u4e00-\u9fa5]+-[\u4e00-\u9fa5]+-[\u4e00-\u9fa5]+\s+[^\u4e00-\u9fa5]*[\u4e00-\u9fa5]+[^出口确定©]+?)(?=出口|确定|©|$)',
-                r'办公地址\s*([\u4e00-\u9fa5]+-[\u4e00-\u9fa5]+-[\u4e00-\u9fa5]+\s+[^\u4e00-\u9fa5]*[\u4e00-\u9fa5]+[^出口确定©]+?)(?=出口|确定|©|$)',
-                r'地址\s*([\u4e00-\u9fa5]+-[\u4e00-\u9fa5]+-[\u4e00-\u9fa5]+\s+[^出口确定©]+?)(?=出口|确定|©|$)',
-                r'([\u4e00-\u9fa5]+-[\u4e00-\u9fa5]+-[\u4e00-\u9fa5]+\s+[\u4e00-\u9fa5]+[^出口确定©]*?)(?=出口|确定|©|$)'
-            ]
-            for pattern in address_patterns:
-                match = re.search(pattern, page_text)
-                if match:
-                    address_text = match.group(1).strip()
-                    # 清理地址文本，移除重复部分
-                    address_text = re.sub(r'([\u4e00-\u9fa5]+)\1+', r'\1', address_text)  # 移除重复的中文字符
-                    company_data["办公地址"] = address_text[:100]  # 限制长度
-                    break
-            
-            # 提取企业简介 - 匹配特定HTML结构
-            # 首先尝试匹配 <div class="introduction"><span class="c_title">公司简介</span><div class="introduction_box"><p><span>内容</span></p></div></div>
-            intro_div = soup.find('div', class_='introduction')
-            if intro_div:
-                title_span = intro_div.find('span', class_='c_title')
-                if title_span and '公司简介' in title_span.get_text():
-                    intro_box = intro_div.find('div', class_='introduction_box')
-                    if intro_box:
-                        # 提取所有文本内容
-                        intro_text = intro_box.get_text().strip()
-                        # 清理文本，移除多余的空白字符
-                        intro_text = re.sub(r'\s+', ' ', intro_text)
-                        # 过滤掉包含特定内容的企业简介
-                        if (intro_text and len(intro_text) > 10 and 
-                            '企业未添加' not in intro_text and 
-                            '老板使用58招人神器' not in intro_text and
-                            '该信息通过58招才猫app发布' not in intro_text and
-                            '老板忙得连写简介的时间都没有' not in intro_text and
-                            '老板使用58APP商家版发布该职位' not in intro_text and
-                            '招人的诚意大到无需描述' not in intro_text and
-                            '58' not in intro_text):
-                            company_data["企业简介"] = intro_text[:500]  # 增加长度限制
-            
-            # 如果没有找到特定结构，使用备用正则表达式
-            if not company_data.get("企业简介"):
-                intro_patterns = [
-                    r'公司简介\s*([^公司相册企业未添加相册公司地址出口确定©]+?)(?=公司相册|企业未添加相册|公司地址|出口|确定|©|基本信息|工商信息|$)',
-                    r'企业简介\s*([^公司相册企业未添加相册公司地址出口确定©]+?)(?=公司相册|企业未添加相册|公司地址|出口|确定|©|基本信息|工商信息|$)',
-                    r'简介\s*([^公司相册企业未添加相册公司地址出口确定©]+?)(?=公司相册|企业未添加相册|公司地址|出口|确定|©|基本信息|工商信息|$)'
-                ]
-                for pattern in intro_patterns:
-                    match = re.search(pattern, page_text)
-                    if match:
-                        intro_text = match.group(1).strip()
-                        # 过滤掉无关信息
-                        if (intro_text and len(intro_text) > 10 and 
-                            '企业未添加' not in intro_text and 
-                            '老板使用58招人神器' not in intro_text and
-                            '该信息通过58招才猫app发布' not in intro_text and
-                            '老板忙得连写简介的时间都没有' not in intro_text and
-                            '老板使用58APP商家版发布该职位' not in intro_text and
-                            '招人的诚意大到无需描述' not in intro_text and
-                            '58' not in intro_text):
-                            company_data["企业简介"] = intro_text[:300]  # 限制长度
-                            break
-            
-            # 营业执照字段固定为空
-            # company_data["营业执照"] 保持初始化时的空字符串
-            
-            # 提取企业相册 - 匹配图片地址，排除通用图片，优先匹配公司相册
-            try:
-                # 排除的通用图片URL
-                excluded_urls = [
-                    'https://pic1.58cdn.com.cn/nowater/cxnomark/n_v2e8d9dbce287f4e45bb5ebebbe90bb295.png',
-                    'https://pic1.58cdn.com.cn/nowater/cxnomark/n_v2502726ab70ad4151ba43adc35fda265e.png'
-                ]
-                
-                # 首先尝试查找公司相册区域的图片
-                album_section = soup.find(string=re.compile(r'公司相册|企业相册'))
-                image_urls = []
-                
-                if album_section:
-                    # 找到相册区域后查找附近的图片
-                    parent = album_section.parent
-                    if parent:
-                        # 向上查找包含相册的容器
-                        for _ in range(3):  # 最多向上查找3层
-                            if parent.parent:
-                                parent = parent.parent
-                            else:
-                                break
-                        
-                        # 在相册容器中查找图片
-                        img_elements = parent.find_all('img')
-                    else:
-                        img_elements = []
-                else:
-                    # 如果没有找到相册区域，查找所有图片
-                    img_elements = soup.find_all('img')
-                
-                for img in img_elements:
-                    src = img.get('src', '')
-                    data_src = img.get('data-src', '')
-                    
-                    # 优先使用data-src，然后是src
-                    img_url = data_src if data_src else src
-                    
-                    # 过滤有效的图片URL
-                    if img_url and any(ext in img_url.lower() for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp']):
-                        # 转换为完整URL
-                        if img_url.startswith('//'):
-                            img_url = 'https:' + img_url
-                        elif img_url.startswith('/'):
-                            img_url = 'https://pic1.58cdn.com.cn' + img_url
-                        elif not img_url.startswith('http'):
-                            continue
-                        
-                        # 排除通用图标、小图片和指定的通用图片
-                        if (not any(exclude in img_url.lower() for exclude in ['icon', 'logo', 'avatar', 'default', 'placeholder']) 
-                            and img_url not in excluded_urls):
-                            image_urls.append(img_url)
-                
-                # 去重并用||分割
-                if image_urls:
-                    unique_urls = list(dict.fromkeys(image_urls))  # 去重保持顺序
-                    company_data["企业相册"] = '||'.join(unique_urls[:10])  # 最多保留10张图片
-                    
-            except Exception as e:
-                print(f"提取企业相册失败: {e}")
+            # 按企业详情页规则提取（见job_extractors.extract_company_detail）
+            if self.parse_pipeline:
+                company_data = self.parse_pipeline.parse("company", page_source)
+            else:
+                company_data = parse_company_detail_html(page_source, self.parser)
             
+        except CaptchaUnresolved:
+            raise  # 整个职位暂缓重试，避免保存缺少企业信息的数据
         except Exception as e:
             print(f"抓取企业详情页失败: {e}")
             
@@ -1383,158 +616,7 @@ class Enhanced58JobScraper:
 
     def extract_job_from_item(self, item):
         """从单个职位项目中提取信息"""
-        job_data = {
-            "企业名称": "",
-            "企业类型": "",
-            "社会信用码": "",
-            "企业规模": "",
-            "注册资本(万)": "",
-            "所属区域": "",
-            "联系人": "",
-            "联系方式": "",
-            "联系邮箱": "",
-            "办公地址": "",
-            "企业简介": "",
-            "营业执照": "",
-            "企业相册": "",
-            "岗位名称": "",
-            "薪资类型": "",
-            "薪资范围起": "",
-            "薪资范围至": "",
-            "工作地点": "",
-            "岗位要求": "",
-            "学历要求": "",
-            "招聘人数": "",
-            "发布时间": "",
-            "结束时间": "",
-            "工作职责": "",
-            "任职要求": ""
-        }
-        
-        try:
-            item_text = item.get_text()
-            
-            # 提取岗位名称
-            title_element = item.find("a") or item.find("h3") or item.find("h4")
-            if title_element:
-                job_data["岗位名称"] = title_element.get_text().strip()
-            
-            # 提取薪资信息
-            salary_patterns = [
-                r'(\d+)[-~](\d+)元/月',
-                r'(\d+)[-~](\d+)元',
-                r'(\d+)[-~](\d+)万/年',
-                r'(\d+)[-~](\d+)万',
-                r'(\d+)[-~](\d+)千/月',
-                r'面议'
-            ]
-            
-            for pattern in salary_patterns:
-                salary_match = re.search(pattern, item_text)
-                if salary_match:
-                    if pattern == r'面议':
-                        job_data["薪资类型"] = "面议"
-                    else:
-                        groups = salary_match.groups()
-                        if len(groups) >= 2:
-                            job_data["薪资范围起"] = groups[0]
-                            job_data["薪资范围至"] = groups[1]
-                            
-                            if "月" in salary_match.group(0):
-                                job_data["薪资类型"] = "月薪"
-                            elif "年" in salary_match.group(0):
-                                job_data["薪资类型"] = "年薪"
-                            else:
-                                job_data["薪资类型"] = "月薪"
-                    break
-            
-            # 提取工作地点 - 只保留"城市 - 区域"格式
-            location_patterns = [
-                r'(北京)\s*[-\s]*([\u4e00-\u9fa5]+区)',
-                r'(上海)\s*[-\s]*([\u4e00-\u9fa5]+区)',
-                r'(广州)\s*[-\s]*([\u4e00-\u9fa5]+区)',
-                r'(深圳)\s*[-\s]*([\u4e00-\u9fa5]+区)',
-                r'([\u4e00-\u9fa5]+市?)\s*[-\s]*([\u4e00-\u9fa5]+区)'
-            ]
-            
-            for pattern in location_patterns:
-                location_match = re.search(pattern, item_text)
-                if location_match:
-                    city = location_match.group(1).replace('市', '')
-                    district = location_match.group(2)
-                    job_data["工作地点"] = f"{city} - {district}"
-                    break
-            
-            # 提取学历要求
-            education_patterns = [
-                r'(博士|硕士|研究生|本科|大专|专科|高中|中专|初中|不限).*学历',
-                r'学历.*(博士|硕士|研究生|本科|大专|专科|高中|中专|初中|不限)',
-                r'(博士|硕士|研究生|本科|大专|专科)以上',
-                r'(博士|硕士|研究生|本科|大专|专科|高中|中专|初中)'
-            ]
-            
-            for pattern in education_patterns:
-                edu_match = re.search(pattern, item_text)
-                if edu_match:
-                    education_text = edu_match.group(0)
-                    # 将初中、中专、高中统一显示为学历不限
-                    if any(low_edu in education_text for low_edu in ['初中', '中专', '高中']):
-                        job_data["学历要求"] = "学历不限"
-                    else:
-                        job_data["学历要求"] = education_text
-                    break
-            
-            # 提取工作经验
-            exp_patterns = [
-                r'(\d+)[-~](\d+)年.*经验',
-                r'经验.*(\d+)[-~](\d+)年',
-                r'(\d+)年以上.*经验',
-                r'经验.*(\d+)年以上',
-                r'(无需经验|不限经验|应届毕业生)'
-            ]
-            
-            for pattern in exp_patterns:
-                exp_match = re.search(pattern, item_text)
-                if exp_match:
-                    job_data["岗位要求"] = exp_match.group(0)
-                    break
-            
-            # 提取发布时间
-            time_patterns = [
-                r'(\d{4}-\d{2}-\d{2})',
-                r'(\d{2}-\d{2})',
-                r'(今天|昨天|前天)',
-                r'(\d+)小时前',
-                r'(\d+)天前'
-            ]
-            
-            for pattern in time_patterns:
-                time_match = re.search(pattern, item_text)
-                if time_match:
-                    job_data["发布时间"] = time_match.group(0)
-                    break
-            
-            # 尝试提取企业名称（通常在职位附近）- 只匹配包含"公司"字的企业名称
-            company_patterns = [
-                r'([\u4e00-\u9fa5]+公司)',
-                r'([A-Za-z]+(?:公司|Company))'
-            ]
-            
-            for pattern in company_patterns:
-                company_match = re.search(pattern, item_text)
-                if company_match:
-                    company_name = company_match.group(1)
-                    # 过滤掉以特定内容开头的企业名称，确保包含"公司"字
-                    # 同时检查企业名称长度（3-20个字）和非空
-                    if (company_name and len(company_name) >= 3 and len(company_name) <= 20 and
-                        not company_name.startswith('微信扫一扫快速求职') and '公司' in company_name):
-                        job_data["企业名称"] = company_name
-                        break
-                    
-        except Exception as e:
-            print(f"提取职位项目信息失败: {e}")
-            
-        return job_data
+        return extract_job_from_item(item)
     
     def extract_jobs_from_full_page(self, soup):
         """从整个页面提取职位信息"""
@@ -1615,6 +697,9 @@ class Enhanced58JobScraper:
                 print(f"创建新的Excel文件 {filename} 并设置标准表头")
         else:
             print(f"文件 {filename} 不存在，将在保存数据时创建")
+        
+        # 同时清空增量日志
+        self.get_sink(filename).reset()
     
     def save_to_excel(self, data, filename="58同城职位详细信息.xlsx"):
         """保存数据到Excel文件"""
@@ -1638,160 +723,8 @@ class Enhanced58JobScraper:
                 if job.get('企业名称') == '广东天杰国际人才科技有限公司':
                     continue
                 
-                # 处理所属区域：如果为空，用工作地点的值替代，去掉横线并格式化
-                if not job.get('所属区域') or job.get('所属区域').strip() == '':
-                    work_location = job.get('工作地点', '')
-                    if work_location and work_location.strip():
-                        # 去掉横线，将"北京 - 大兴"格式转换为"北京大兴区"格式
-                        formatted_location = work_location.replace(' - ', '').replace('-', '').strip()
-                        # 如果不包含"区"字且长度大于2，添加"区"
-                        if '区' not in formatted_location and len(formatted_location) > 2:
-                            formatted_location += '区'
-                        job['所属区域'] = formatted_location
-                
-                # 进一步清理所属区域，去除"总部位于"前缀和其他多余文字，只保留"XX省XX市XX区"或"XX市XX区"格式
-                if job.get('所属区域'):
-                    region = job['所属区域']
-                    # 去除"总部位于"前缀
-                    region = re.sub(r'^总部位于', '', region).strip()
-                    
-                    # 过滤掉包含无关词汇的内容
-                    unwanted_keywords = ['找工作', '免费发布', '登记简历', '公司福利', '饭补', '加班补助', 
-                                        '交通便利', '餐补', '市中心区', '不匹配', '人公司', '福利', '补助', '便利',
-                                        '有限公司', '科技有限公司', '信息科技', '华南地区', '华北地区', '华东地区', 
-                                        '华西地区', '在华', '地区', '公司在']
-                    if any(unwanted in region for unwanted in unwanted_keywords):
-                        job['所属区域'] = ''  # 如果包含无关词汇，清空该字段
-                    else:
-                        # 城市到省份的映射字典
-                        city_to_province = {
-                            '广州': '广东', '深圳': '广东', '东莞': '广东', '佛山': '广东', '中山': '广东', '珠海': '广东', '惠州': '广东', '江门': '广东', '湛江': '广东', '茂名': '广东', '肇庆': '广东', '梅州': '广东', '汕头': '广东', '河源': '广东', '阳江': '广东', '清远': '广东', '韶关': '广东', '揭阳': '广东', '潮州': '广东', '云浮': '广东', '汕尾': '广东',
-                            '杭州': '浙江', '宁波': '浙江', '温州': '浙江', '嘉兴': '浙江', '湖州': '浙江', '绍兴': '浙江', '金华': '浙江', '衢州': '浙江', '舟山': '浙江', '台州': '浙江', '丽水': '浙江',
-                            '南京': '江苏', '苏州': '江苏', '无锡': '江苏', '常州': '江苏', '镇江': '江苏', '南通': '江苏', '泰州': '江苏', '扬州': '江苏', '盐城': '江苏', '连云港': '江苏', '徐州': '江苏', '淮安': '江苏', '宿迁': '江苏',
-                            '济南': '山东', '青岛': '山东', '淄博': '山东', '枣庄': '山东', '东营': '山东', '烟台': '山东', '潍坊': '山东', '济宁': '山东', '泰安': '山东', '威海': '山东', '日照': '山东', '临沂': '山东', '德州': '山东', '聊城': '山东', '滨州': '山东', '菏泽': '山东',
-                            '郑州': '河南', '开封': '河南', '洛阳': '河南', '平顶山': '河南', '安阳': '河南', '鹤壁': '河南', '新乡': '河南', '焦作': '河南', '濮阳': '河南', '许昌': '河南', '漯河': '河南', '三门峡': '河南', '南阳': '河南', '商丘': '河南', '信阳': '河南', '周口': '河南', '驻马店': '河南',
-                            '武汉': '湖北', '黄石': '湖北', '十堰': '湖北', '宜昌': '湖北', '襄阳': '湖北', '鄂州': '湖北', '荆门': '湖北', '孝感': '湖北', '荆州': '湖北', '黄冈': '湖北', '咸宁': '湖北', '随州': '湖北',
-                            '长沙': '湖南', '株洲': '湖南', '湘潭': '湖南', '衡阳': '湖南', '邵阳': '湖南', '岳阳': '湖南', '常德': '湖南', '张家界': '湖南', '益阳': '湖南', '郴州': '湖南', '永州': '湖南', '怀化': '湖南', '娄底': '湖南',
-                            '南昌': '江西', '景德镇': '江西', '萍乡': '江西', '九江': '江西', '新余': '江西', '鹰潭': '江西', '赣州': '江西', '吉安': '江西', '宜春': '江西', '抚州': '江西', '上饶': '江西',
-                            '合肥': '安徽', '芜湖': '安徽', '蚌埠': '安徽', '淮南': '安徽', '马鞍山': '安徽', '淮北': '安徽', '铜陵': '安徽', '安庆': '安徽', '黄山': '安徽', '滁州': '安徽', '阜阳': '安徽', '宿州': '安徽', '六安': '安徽', '亳州': '安徽', '池州': '安徽', '宣城': '安徽',
-                            '福州': '福建', '厦门': '福建', '莆田': '福建', '三明': '福建', '泉州': '福建', '漳州': '福建', '南平': '福建', '龙岩': '福建', '宁德': '福建',
-                            '石家庄': '河北', '唐山': '河北', '秦皇岛': '河北', '邯郸': '河北', '邢台': '河北', '保定': '河北', '张家口': '河北', '承德': '河北', '沧州': '河北', '廊坊': '河北', '衡水': '河北',
-                            '太原': '山西', '大同': '山西', '阳泉': '山西', '长治': '山西', '晋城': '山西', '朔州': '山西', '晋中': '山西', '运城': '山西', '忻州': '山西', '临汾': '山西', '吕梁': '山西',
-                            '沈阳': '辽宁', '大连': '辽宁', '鞍山': '辽宁', '抚顺': '辽宁', '本溪': '辽宁', '丹东': '辽宁', '锦州': '辽宁', '营口': '辽宁', '阜新': '辽宁', '辽阳': '辽宁', '盘锦': '辽宁', '铁岭': '辽宁', '朝阳': '辽宁', '葫芦岛': '辽宁',
-                            '长春': '吉林', '吉林': '吉林', '四平': '吉林', '辽源': '吉林', '通化': '吉林', '白山': '吉林', '松原': '吉林', '白城': '吉林',
-                            '哈尔滨': '黑龙江', '齐齐哈尔': '黑龙江', '鸡西': '黑龙江', '鹤岗': '黑龙江', '双鸭山': '黑龙江', '大庆': '黑龙江', '伊春': '黑龙江', '佳木斯': '黑龙江', '七台河': '黑龙江', '牡丹江': '黑龙江', '黑河': '黑龙江', '绥化': '黑龙江',
-                            '成都': '四川', '自贡': '四川', '攀枝花': '四川', '泸州': '四川', '德阳': '四川', '绵阳': '四川', '广元': '四川', '遂宁': '四川', '内江': '四川', '乐山': '四川', '南充': '四川', '眉山': '四川', '宜宾': '四川', '广安': '四川', '达州': '四川', '雅安': '四川', '巴中': '四川', '资阳': '四川',
-                            '贵阳': '贵州', '六盘水': '贵州', '遵义': '贵州', '安顺': '贵州', '毕节': '贵州', '铜仁': '贵州',
-                            '昆明': '云南', '曲靖': '云南', '玉溪': '云南', '保山': '云南', '昭通': '云南', '丽江': '云南', '普洱': '云南', '临沧': '云南',
-                            '西安': '陕西', '铜川': '陕西', '宝鸡': '陕西', '咸阳': '陕西', '渭南': '陕西', '延安': '陕西', '汉中': '陕西', '榆林': '陕西', '安康': '陕西', '商洛': '陕西',
-                            '兰州': '甘肃', '嘉峪关': '甘肃', '金昌': '甘肃', '白银': '甘肃', '天水': '甘肃', '武威': '甘肃', '张掖': '甘肃', '平凉': '甘肃', '酒泉': '甘肃', '庆阳': '甘肃', '定西': '甘肃', '陇南': '甘肃',
-                            '西宁': '青海', '海东': '青海',
-                            '银川': '宁夏', '石嘴山': '宁夏', '吴忠': '宁夏', '固原': '宁夏', '中卫': '宁夏',
-                            '乌鲁木齐': '新疆', '克拉玛依': '新疆', '吐鲁番': '新疆', '哈密': '新疆',
-                            '呼和浩特': '内蒙古', '包头': '内蒙古', '乌海': '内蒙古', '赤峰': '内蒙古', '通辽': '内蒙古', '鄂尔多斯': '内蒙古', '呼伦贝尔': '内蒙古', '巴彦淖尔': '内蒙古', '乌兰察布': '内蒙古',
-                            '拉萨': '西藏', '日喀则': '西藏', '昌都': '西藏', '林芝': '西藏', '山南': '西藏', '那曲': '西藏',
-                            '海口': '海南', '三亚': '海南', '三沙': '海南', '儋州': '海南'
-                        }
-                        
-                        # 首先处理"广州荔湾区"这种格式（城市+区域，缺少"市"字）
-                        city_district_match = re.search(r'^([\u4e00-\u9fa5]{2,4})([\u4e00-\u9fa5]{2,4}区)$', region)
-                        if city_district_match:
-                            city = city_district_match.group(1)
-                            district = city_district_match.group(2)
-                            
-                            # 检查城市名是否在映射字典中，如果是则使用省市格式
-                            if city in city_to_province:
-                                province_name = city_to_province[city]
-                                fixed_region = f"{province_name}省{city}市"
-                            else:
-                                fixed_region = f"{city}市{district}"
-                            print(f"✓ 所属区域已自动修复: {region} -> {fixed_region}")
-                            job['所属区域'] = fixed_region
-                        else:
-                            # 处理其他格式
-                            city_fix_match = re.search(r'([\u4e00-\u9fa5]{2,4})(省)?([\u4e00-\u9fa5]{2,4})(市)?([\u4e00-\u9fa5]{2,4}区)', region)
-                            if city_fix_match:
-                                province = city_fix_match.group(1)
-                                has_province = city_fix_match.group(2) is not None
-                                city = city_fix_match.group(3)
-                                has_city_suffix = city_fix_match.group(4) is not None
-                                district = city_fix_match.group(5)
-                                
-                                # 构建标准格式（只对广东省去掉区级信息）
-                                guangdong_cities = ['广州', '深圳', '珠海', '汕头', '佛山', '韶关', '湛江', '肇庆', '江门', '茂名', '惠州', '梅州', '汕尾', '河源', '阳江', '清远', '东莞', '中山', '潮州', '揭阳', '云浮']
-                                
-                                if has_province and not has_city_suffix:
-                                    # "XX省XX区" -> 只对广东省去掉区级信息
-                                    if province == '广东' and city in guangdong_cities:
-                                        fixed_region = f"{province}省{city}市"
-                                    else:
-                                        fixed_region = f"{province}省{city}市{district}"
-                                    job['所属区域'] = fixed_region
-                                elif not has_province and not has_city_suffix:
-                                    # "XXXX区" -> 根据城市名判断是否为广东省
-                                    if len(city) >= 2:
-                                        if city in guangdong_cities:
-                                            fixed_region = f"广东省{city}市"
-                                        elif city in city_to_province:
-                                            province_name = city_to_province[city]
-                                            fixed_region = f"{province_name}省{city}市{district}"
-                                        else:
-                                            fixed_region = f"{city}市{district}"
-                                        job['所属区域'] = fixed_region
-                                    else:
-                                        job['所属区域'] = region  # 保持原样
-                                elif not has_province and has_city_suffix:
-                                    # "XX市XX区" -> 根据城市名判断是否为广东省
-                                    if city in guangdong_cities:
-                                        fixed_region = f"广东省{city}市"
-                                    elif city in city_to_province:
-                                        province_name = city_to_province[city]
-                                        fixed_region = f"{province_name}省{city}市{district}"
-                                    else:
-                                        fixed_region = f"{city}市{district}"
-                                    job['所属区域'] = fixed_region
-                                else:
-                                    # 已经是标准格式，只对广东省去掉区级信息
-                                    if has_province and has_city_suffix:
-                                        if province == '广东' and city in guangdong_cities:
-                                            fixed_region = f"{province}省{city}市"
-                                            job['所属区域'] = fixed_region
-                                    else:
-                                        job['所属区域'] = region  # 保持原样
-                            
-                            # 如果修复失败，尝试原有的正则匹配
-                            # 优先查找"XX省XX市XX区"格式，然后查找"XX市XX区"格式
-                            region_match = re.search(r'([\u4e00-\u9fa5]{2,4}省[\u4e00-\u9fa5]{2,4}市[\u4e00-\u9fa5]{2,4}区)', region)
-                            if not region_match:
-                                region_match = re.search(r'([\u4e00-\u9fa5]{2,4}市[\u4e00-\u9fa5]{2,4}区)', region)
-                            if region_match:
-                                clean_region = region_match.group(1)
-                                # 统一将所有区级信息简化为省市级别
-                                province_city_match = re.search(r'([\u4e00-\u9fa5]{2,4})省([\u4e00-\u9fa5]{2,4})市', clean_region)
-                                if province_city_match:
-                                    # 省市区格式，去掉区级信息
-                                    province_name = province_city_match.group(1)
-                                    city_name = province_city_match.group(2)
-                                    clean_region = f"{province_name}省{city_name}市"
-                                else:
-                                    # 市区格式，需要根据城市映射到对应省份
-                                    city_district_match = re.search(r'([\u4e00-\u9fa5]{2,4})市[\u4e00-\u9fa5]{2,4}区', clean_region)
-                                    if city_district_match:
-                                        city_name = city_district_match.group(1)
-                                        # 使用城市到省份的映射
-                                        if city_name in city_to_province:
-                                            province_name = city_to_province[city_name]
-                                            clean_region = f"{province_name}省{city_name}市"
-                                        else:
-                                            clean_region = f"{city_name}市"
-                                # 确保长度合理
-                                if len(clean_region) <= 10:
-                                    job['所属区域'] = clean_region
-                                else:
-                                    job['所属区域'] = ''
-                            else:
-                                # 如果没有匹配到标准格式，清空该字段
-                                job['所属区域'] = ''
+                # 标准化所属区域（为空时用工作地点补充），无法识别的清空
+                job['所属区域'] = region_normalizer.normalize(job.get('所属区域'), job.get('工作地点', ''))
                 
                 processed_data.append(job)
             
@@ -1825,10 +758,8 @@ class Enhanced58JobScraper:
             print("没有数据可保存")
             return False
     
-    def save_single_job_to_excel(self, job_data, filename="58同城职位详细信息.xlsx"):
-        """实时保存单个职位数据到Excel文件"""
-        import os
-        
+    def save_single_job_to_excel(self, job_data, filename="58同城职位详细信息.xlsx", key=None):
+        """实时保存单个职位数据到Excel文件，key为该记录落盘后交给抓取进度的键（职位链接）"""
         # 检查企业名称是否为空，如果为空则不保存
         if not job_data or not job_data.get('企业名称') or job_data.get('企业名称').strip() == '':
             log_error(f"× 跳过保存：企业名称为空的职位数据 - {job_data.get('岗位名称', 'N/A') if job_data else 'N/A'}")
@@ -1849,239 +780,10 @@ class Enhanced58JobScraper:
             log_error(f"× 跳过保存：任职要求为空的职位数据 - {job_data.get('岗位名称', 'N/A')} - {job_data.get('企业名称', 'N/A')}")
             return False
         
-        # 处理所属区域：如果为空，用工作地点的值替代，去掉横线并格式化
-        if not job_data.get('所属区域') or job_data.get('所属区域').strip() == '':
-            work_location = job_data.get('工作地点', '')
-            if work_location and work_location.strip():
-                # 去掉横线，将"北京 - 大兴"格式转换为"北京大兴区"格式
-                formatted_location = work_location.replace(' - ', '').replace('-', '').strip()
-                # 如果不包含"区"字且长度大于2，添加"区"
-                if '区' not in formatted_location and len(formatted_location) > 2:
-                    formatted_location += '区'
-                job_data['所属区域'] = formatted_location
-                print(f"✓ 所属区域已从工作地点补充: {work_location} -> {formatted_location}")
-        
-        # 进一步清理所属区域，去除"总部位于"前缀和其他多余文字，只保留"XX省XX市XX区"或"XX市XX区"格式
-        if job_data.get('所属区域'):
-            region = job_data['所属区域']
-            # 去除"总部位于"前缀
-            region = re.sub(r'^总部位于', '', region).strip()
-            
-            # 过滤掉包含无关词汇的内容
-            unwanted_keywords = ['找工作', '免费发布', '登记简历', '公司福利', '饭补', '加班补助', 
-                                '交通便利', '餐补', '市中心区', '不匹配', '人公司', '福利', '补助', '便利',
-                                '有限公司', '科技有限公司', '信息科技', '华南地区', '华北地区', '华东地区', 
-                                '华西地区', '在华', '地区', '公司在']
-            if any(unwanted in region for unwanted in unwanted_keywords):
-                job_data['所属区域'] = ''  # 如果包含无关词汇，清空该字段
-                print(f"× 所属区域包含无关内容已清空: {region}")
-            else:
-                # 城市到省份的映射字典
-                city_to_province = {
-                    '广州': '广东', '深圳': '广东', '东莞': '广东', '佛山': '广东', '中山': '广东', '珠海': '广东', '惠州': '广东', '江门': '广东', '湛江': '广东', '茂名': '广东', '肇庆': '广东', '梅州': '广东', '汕头': '广东', '河源': '广东', '阳江': '广东', '清远': '广东', '韶关': '广东', '揭阳': '广东', '潮州': '广东', '云浮': '广东', '汕尾': '广东',
-                    '杭州': '浙江', '宁波': '浙江', '温州': '浙江', '嘉兴': '浙江', '湖州': '浙江', '绍兴': '浙江', '金华': '浙江', '衢州': '浙江', '舟山': '浙江', '台州': '浙江', '丽水': '浙江',
-                    '南京': '江苏', '苏州': '江苏', '无锡': '江苏', '常州': '江苏', '镇江': '江苏', '南通': '江苏', '泰州': '江苏', '扬州': '江苏', '盐城': '江苏', '连云港': '江苏', '徐州': '江苏', '淮安': '江苏', '宿迁': '江苏',
-                    '济南': '山东', '青岛': '山东', '淄博': '山东', '枣庄': '山东', '东营': '山东', '烟台': '山东', '潍坊': '山东', '济宁': '山东', '泰安': '山东', '威海': '山东', '日照': '山东', '临沂': '山东', '德州': '山东', '聊城': '山东', '滨州': '山东', '菏泽': '山东',
-                    '郑州': '河南', '开封': '河南', '洛阳': '河南', '平顶山': '河南', '安阳': '河南', '鹤壁': '河南', '新乡': '河南', '焦作': '河南', '濮阳': '河南', '许昌': '河南', '漯河': '河南', '三门峡': '河南', '南阳': '河南', '商丘': '河南', '信阳': '河南', '周口': '河南', '驻马店': '河南',
-                    '武汉': '湖北', '黄石': '湖北', '十堰': '湖北', '宜昌': '湖北', '襄阳': '湖北', '鄂州': '湖北', '荆门': '湖北', '孝感': '湖北', '荆州': '湖北', '黄冈': '湖北', '咸宁': '湖北', '随州': '湖北',
-                    '长沙': '湖南', '株洲': '湖南', '湘潭': '湖南', '衡阳': '湖南', '邵阳': '湖南', '岳阳': '湖南', '常德': '湖南', '张家界': '湖南', '益阳': '湖南', '郴州': '湖南', '永州': '湖南', '怀化': '湖南', '娄底': '湖南',
-                    '南昌': '江西', '景德镇': '江西', '萍乡': '江西', '九江': '江西', '新余': '江西', '鹰潭': '江西', '赣州': '江西', '吉安': '江西', '宜春': '江西', '抚州': '江西', '上饶': '江西',
-                    '合肥': '安徽', '芜湖': '安徽', '蚌埠': '安徽', '淮南': '安徽', '马鞍山': '安徽', '淮北': '安徽', '铜陵': '安徽', '安庆': '安徽', '黄山': '安徽', '滁州': '安徽', '阜阳': '安徽', '宿州': '安徽', '六安': '安徽', '亳州': '安徽', '池州': '安徽', '宣城': '安徽',
-                    '福州': '福建', '厦门': '福建', '莆田': '福建', '三明': '福建', '泉州': '福建', '漳州': '福建', '南平': '福建', '龙岩': '福建', '宁德': '福建',
-                    '石家庄': '河北', '唐山': '河北', '秦皇岛': '河北', '邯郸': '河北', '邢台': '河北', '保定': '河北', '张家口': '河北', '承德': '河北', '沧州': '河北', '廊坊': '河北', '衡水': '河北',
-                    '太原': '山西', '大同': '山西', '阳泉': '山西', '长治': '山西', '晋城': '山西', '朔州': '山西', '晋中': '山西', '运城': '山西', '忻州': '山西', '临汾': '山西', '吕梁': '山西',
-                    '沈阳': '辽宁', '大连': '辽宁', '鞍山': '辽宁', '抚顺': '辽宁', '本溪': '辽宁', '丹东': '辽宁', '锦州': '辽宁', '营口': '辽宁', '阜新': '辽宁', '辽阳': '辽宁', '盘锦': '辽宁', '铁岭': '辽宁', '朝阳': '辽宁', '葫芦岛': '辽宁',
-                    '长春': '吉林', '吉林': '吉林', '四平': '吉林', '辽源': '吉林', '通化': '吉林', '白山': '吉林', '松原': '吉林', '白城': '吉林',
-                    '哈尔滨': '黑龙江', '齐齐哈尔': '黑龙江', '鸡西': '黑龙江', '鹤岗': '黑龙江', '双鸭山': '黑龙江', '大庆': '黑龙江', '伊春': '黑龙江', '佳木斯': '黑龙江', '七台河': '黑龙江', '牡丹江': '黑龙江', '黑河': '黑龙江', '绥化': '黑龙江',
-                    '成都': '四川', '自贡': '四川', '攀枝花': '四川', '泸州': '四川', '德阳': '四川', '绵阳': '四川', '广元': '四川', '遂宁': '四川', '内江': '四川', '乐山': '四川', '南充': '四川', '眉山': '四川', '宜宾': '四川', '广安': '四川', '达州': '四川', '雅安': '四川', '巴中': '四川', '资阳': '四川',
-                    '贵阳': '贵州', '六盘水': '贵州', '遵义': '贵州', '安顺': '贵州', '毕节': '贵州', '铜仁': '贵州',
-                    '昆明': '云南', '曲靖': '云南', '玉溪': '云南', '保山': '云南', '昭通': '云南', '丽江': '云南', '普洱': '云南', '临沧': '云南',
-                    '西安': '陕西', '铜川': '陕西', '宝鸡': '陕西', '咸阳': '陕西', '渭南': '陕西', '延安': '陕西', '汉中': '陕西', '榆林': '陕西', '安康': '陕西', '商洛': '陕西',
-                    '兰州': '甘肃', '嘉峪关': '甘肃', '金昌': '甘肃', '白银': '甘肃', '天水': '甘肃', '武威': '甘肃', '张掖': '甘肃', '平凉': '甘肃', '酒泉': '甘肃', '庆阳': '甘肃', '定西': '甘肃', '陇南': '甘肃',
-                    '西宁': '青海', '海东': '青海',
-                    '银川': '宁夏', '石嘴山': '宁夏', '吴忠': '宁夏', '固原': '宁夏', '中卫': '宁夏',
-                    '乌鲁木齐': '新疆', '克拉玛依': '新疆', '吐鲁番': '新疆', '哈密': '新疆',
-                    '呼和浩特': '内蒙古', '包头': '内蒙古', '乌海': '内蒙古', '赤峰': '内蒙古', '通辽': '内蒙古', '鄂尔多斯': '内蒙古', '呼伦贝尔': '内蒙古', '巴彦淖尔': '内蒙古', '乌兰察布': '内蒙古',
-                    '拉萨': '西藏', '日喀则': '西藏', '昌都': '西藏', '林芝': '西藏', '山南': '西藏', '那曲': '西藏',
-                    '海口': '海南', '三亚': '海南', '三沙': '海南', '儋州': '海南'
-                }
-                
-                # 首先处理直辖市格式"北京朝阳区"这种格式
-                municipality_district_match = re.search(r'^(北京|上海|天津|重庆)([\u4e00-\u9fa5]{2,4}区)$', region)
-                if municipality_district_match:
-                    municipality = municipality_district_match.group(1)
-                    district = municipality_district_match.group(2)
-                    fixed_region = f"{municipality}市{district}"
-                    print(f"✓ 所属区域已自动修复: {region} -> {fixed_region}")
-                    job_data['所属区域'] = fixed_region
-                else:
-                     # 处理"广州荔湾区"这种格式（城市+区域，缺少"市"字）
-                     city_district_match = re.search(r'^([\u4e00-\u9fa5]{2,4})([\u4e00-\u9fa5]{2,4}区)$', region)
-                     if city_district_match:
-                         city = city_district_match.group(1)
-                         district = city_district_match.group(2)
-                         
-                         # 广东省城市列表
-                         guangdong_cities = ['广州', '深圳', '珠海', '汕头', '佛山', '韶关', '湛江', '肇庆', '江门', '茂名', '惠州', '梅州', '汕尾', '河源', '阳江', '清远', '东莞', '中山', '潮州', '揭阳', '云浮']
-                         
-                         # 检查城市名是否在映射字典中
-                         if city in city_to_province:
-                             province_name = city_to_province[city]
-                             # 对所有非直辖市的城市去掉区级信息，只保留省市格式
-                             fixed_region = f"{province_name}省{city}市"
-                             print(f"✓ 所属区域已自动修复: {region} -> {fixed_region}")
-                             job_data['所属区域'] = fixed_region
-                         else:
-                             # 如果城市名不在映射中，只添加"市"字
-                             fixed_region = f"{city}市{district}"
-                             print(f"✓ 所属区域已自动修复: {region} -> {fixed_region}")
-                             job_data['所属区域'] = fixed_region
-                     else:
-                         # 处理其他格式
-                         # 匹配"XX省XX区"或"XX市XX区"或"XXXX区"格式，并自动补充"省"和"市"字
-                         city_fix_match = re.search(r'([\u4e00-\u9fa5]{2,4})(省)?([\u4e00-\u9fa5]{2,4})(市)?([\u4e00-\u9fa5]{2,4}区)', region)
-                         if city_fix_match:
-                             province = city_fix_match.group(1)
-                             has_province = city_fix_match.group(2) is not None
-                             city = city_fix_match.group(3)
-                             has_city_suffix = city_fix_match.group(4) is not None
-                             district = city_fix_match.group(5)
-                             
-                             # 构建标准格式（对所有省份去掉区级信息）
-                             
-                             if has_province and not has_city_suffix:
-                                 # "XX省XX区" -> 对所有省份去掉区级信息
-                                 fixed_region = f"{province}省{city}市"
-                                 print(f"✓ 所属区域已自动修复: {region} -> {fixed_region}")
-                                 job_data['所属区域'] = fixed_region
-                             elif not has_province and not has_city_suffix:
-                                 # "XXXX区" -> 根据城市名判断省份并去掉区级信息
-                                 if len(city) >= 2:
-                                     if city in city_to_province:
-                                         province_name = city_to_province[city]
-                                         fixed_region = f"{province_name}省{city}市"
-                                     else:
-                                         fixed_region = f"{city}市{district}"
-                                     print(f"✓ 所属区域已自动修复: {region} -> {fixed_region}")
-                                     job_data['所属区域'] = fixed_region
-                                 else:
-                                     job_data['所属区域'] = region  # 保持原样
-                             elif not has_province and has_city_suffix:
-                                 # "XX市XX区" -> 对所有非直辖市城市去掉区级信息
-                                 # 检查是否为直辖市
-                                 municipalities = ['北京', '上海', '天津', '重庆']
-                                 if city in municipalities:
-                                     # 直辖市保留区级信息
-                                     fixed_region = f"{city}市{district}"
-                                 elif city in city_to_province:
-                                     # 非直辖市去掉区级信息
-                                     province_name = city_to_province[city]
-                                     fixed_region = f"{province_name}省{city}市"
-                                 else:
-                                     # 未知城市，保留原格式
-                                     fixed_region = f"{city}市{district}"
-                                 print(f"✓ 所属区域已自动修复: {region} -> {fixed_region}")
-                                 job_data['所属区域'] = fixed_region
-                             else:
-                                 # 已经是标准格式，对所有非直辖市去掉区级信息
-                                 if has_province and has_city_suffix:
-                                     # 检查是否为直辖市
-                                     municipalities = ['北京', '上海', '天津', '重庆']
-                                     if city in municipalities:
-                                         # 直辖市保留区级信息
-                                         job_data['所属区域'] = region  # 保持原样
-                                     else:
-                                         # 非直辖市去掉区级信息
-                                         fixed_region = f"{province}省{city}市"
-                                         print(f"✓ 所属区域已自动修复: {region} -> {fixed_region}")
-                                         job_data['所属区域'] = fixed_region
-                                 else:
-                                     job_data['所属区域'] = region  # 保持原样
-                         else:
-                             # 如果修复失败，尝试原有的正则匹配
-                             # 优先查找"XX省XX市XX区"格式，然后查找"XX市XX区"格式
-                             region_match = re.search(r'([\u4e00-\u9fa5]{2,4}省[\u4e00-\u9fa5]{2,4}市[\u4e00-\u9fa5]{2,4}区)', region)
-                             if not region_match:
-                                 region_match = re.search(r'([\u4e00-\u9fa5]{2,4}市[\u4e00-\u9fa5]{2,4}区)', region)
-                             
-                             # 如果还没匹配到，尝试匹配直辖市格式"XX丰台区"并自动补充"市"字
-                             if not region_match:
-                                 # 匹配直辖市格式：北京、上海、天津、重庆 + 区名
-                                 municipality_match = re.search(r'(北京|上海|天津|重庆)([\u4e00-\u9fa5]{2,4}区)', region)
-                                 if municipality_match:
-                                     municipality = municipality_match.group(1)
-                                     district = municipality_match.group(2)
-                                     clean_region = f"{municipality}市{district}"
-                                     print(f"✓ 直辖市格式已标准化: {region} -> {clean_region}")
-                                     job_data['所属区域'] = clean_region
-                                 else:
-                                     # 尝试匹配其他城市格式"XX高新区"、"XX开发区"等，简化为省市级别
-                                     city_district_match = re.search(r'([\u4e00-\u9fa5]{2,4})(高新区|开发区|经济区|新区|工业区|科技园|软件园)', region)
-                                     if city_district_match:
-                                         city = city_district_match.group(1)
-                                         # 使用城市到省份的映射
-                                         if city in city_to_province:
-                                             province_name = city_to_province[city]
-                                             clean_region = f"{province_name}省{city}市"
-                                         else:
-                                             clean_region = f"{city}市"
-                                         print(f"✓ 城市区域格式已标准化: {region} -> {clean_region}")
-                                         job_data['所属区域'] = clean_region
-                                     else:
-                                         # 如果没有匹配到任何标准格式，清空该字段
-                                         job_data['所属区域'] = ''
-                                         print(f"× 所属区域格式不标准已清空: {region}")
-                             else:
-                                 clean_region = region_match.group(1)
-                                 # 统一将所有区级信息简化为省市级别
-                                 province_city_match = re.search(r'([\u4e00-\u9fa5]{2,4})省([\u4e00-\u9fa5]{2,4})市', clean_region)
-                                 if province_city_match:
-                                     # 省市区格式，去掉区级信息
-                                     province_name = province_city_match.group(1)
-                                     city_name = province_city_match.group(2)
-                                     clean_region = f"{province_name}省{city_name}市"
-                                 else:
-                                     # 市区格式，需要根据城市映射到对应省份
-                                     city_district_match = re.search(r'([\u4e00-\u9fa5]{2,4})市[\u4e00-\u9fa5]{2,4}区', clean_region)
-                                     if city_district_match:
-                                         city_name = city_district_match.group(1)
-                                         # 使用城市到省份的映射
-                                         if city_name in city_to_province:
-                                             province_name = city_to_province[city_name]
-                                             clean_region = f"{province_name}省{city_name}市"
-                                         else:
-                                             clean_region = f"{city_name}市"
-                                 # 确保长度合理
-                                 if len(clean_region) <= 10:
-                                     if clean_region != job_data['所属区域']:
-                                         print(f"✓ 所属区域已清理: {job_data['所属区域']} -> {clean_region}")
-                                     job_data['所属区域'] = clean_region
-                                 else:
-                                     job_data['所属区域'] = ''
-                                     print(f"× 所属区域长度异常已清空: {clean_region}")
-                
-                # 最终验证修复后的格式是否符合标准
-                final_region = job_data.get('所属区域', '')
-                if final_region:
-                    # 验证最终格式：只接受"XX省XX市"、"XX市"和直辖市"XX市XX区"格式
-                    municipalities = ['北京', '上海', '天津', '重庆']
-                    is_valid = False
-                    
-                    # 检查是否为"XX省XX市"格式
-                    if re.match(r'^[\u4e00-\u9fa5]{2,4}省[\u4e00-\u9fa5]{2,4}市$', final_region):
-                        is_valid = True
-                    # 检查是否为"XX市"格式
-                    elif re.match(r'^[\u4e00-\u9fa5]{2,4}市$', final_region):
-                        is_valid = True
-                    # 检查是否为直辖市"XX市XX区"格式
-                    elif re.match(r'^[\u4e00-\u9fa5]{2,4}市[\u4e00-\u9fa5]{2,4}区$', final_region):
-                        city_match = re.match(r'^([\u4e00-\u9fa5]{2,4})市[\u4e00-\u9fa5]{2,4}区$', final_region)
-                        if city_match and city_match.group(1) in municipalities:
-                            is_valid = True
-                    
-                    if not is_valid:
-                        job_data['所属区域'] = ''
-                        print(f"× 所属区域最终格式验证失败已清空: {final_region}")
+        # 标准化所属区域（为空时用工作地点补充），只保留"XX省XX市"、"XX市"或直辖市"XX市XX区"格式
+        job_data['所属区域'], notes = region_normalizer.resolve(job_data.get('所属区域'), job_data.get('工作地点', ''))
+        for note in notes:
+            print(note)
 
         # 检查所属区域是否为空，如果为空则不保存
         if not job_data.get('所属区域') or job_data.get('所属区域').strip() == '':
@@ -2089,41 +791,9 @@ class Enhanced58JobScraper:
             return False
 
         if job_data:
-            # 检查文件是否存在
-            if os.path.exists(filename):
-                # 文件存在，读取现有数据并追加
-                existing_df = pd.read_excel(filename)
-                new_df = pd.DataFrame([job_data])
-                combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-                combined_df.to_excel(filename, index=False)
-                
-                # 同时写入JSON文件
-                json_filename = filename.replace('.xlsx', '.json')
-                json_data = combined_df.to_dict('records')
-                # 处理NaN值，将其替换为空字符串
-                for record in json_data:
-                    for key, value in record.items():
-                        if pd.isna(value):
-                            record[key] = ""
-                with open(json_filename, 'w', encoding='utf-8') as f:
-                    json.dump(json_data, f, ensure_ascii=False, indent=2)
-            else:
-                # 文件不存在，创建新文件
-                df = pd.DataFrame([job_data])
-                df.to_excel(filename, index=False)
-                
-                # 同时创建JSON文件
-                json_filename = filename.replace('.xlsx', '.json')
-                json_data = df.to_dict('records')
-                # 处理NaN值，将其替换为空字符串
-                for record in json_data:
-                    for key, value in record.items():
-                        if pd.isna(value):
-                            record[key] = ""
-                with open(json_filename, 'w', encoding='utf-8') as f:
-                    json.dump(json_data, f, ensure_ascii=False, indent=2)
-            
-            print(f"✓ 职位数据已实时保存到Excel和JSON: {job_data.get('岗位名称', 'N/A')} - {job_data.get('企业名称', 'N/A')}")
+            # 追加到增量日志，Excel和JSON成品在checkpoint_output时统一生成
+            self.get_sink(filename).append(job_data, key)
+            print(f"✓ 职位数据已实时保存到增量日志: {job_data.get('岗位名称', 'N/A')} - {job_data.get('企业名称', 'N/A')}")
             return True
         return False
     
@@ -2144,81 +814,152 @@ class Enhanced58JobScraper:
             print(f"  发布时间: {job.get('发布时间', 'N/A')}")
     
     def close(self):
-        """关闭浏览器"""
-        if self.driver:
-            self.driver.quit()
+        """生成输出文件并关闭浏览器"""
+        self.checkpoint_output(skip_empty=True)
+        if self.worker_pool:
+            for worker_scraper in self.worker_pool.scrapers:
+                if worker_scraper.fetcher and self.fetcher:
+                    # 汇总各工作线程的页面获取统计
+                    for kind, kind_stats in worker_scraper.fetcher.stats.items():
+                        for layer, count in kind_stats.items():
+                            self.fetcher.count(kind, layer, count)
+            self.worker_pool.close()
+            self.worker_pool = None
+        self.print_fetch_stats()
+        if self.fetcher:
+            self.fetcher.close()
+        print(f"企业详情缓存: 命中 {self.company_cache.hits} 次，未命中 {self.company_cache.misses} 次")
+        if self.dedup_index is not None:
+            print(f"去重索引: 跳过 {self.dedup_index.skipped} 个重复职位")
+        if self._owns_browser_pool:
+            self.browser_pool.close()
+        elif self.browser_session is not None:
+            self.browser_pool.release(self.browser_session)
+        self.browser_session = None
+        self.driver = None
 
 def main():
     import time
+    parser = argparse.ArgumentParser(description="58同城多城市职位信息爬虫")
+    parser.add_argument("--config", default="crawl_config.yaml", help="抓取配置文件（YAML：城市、职位类别、页数、并发上限）")
+    parser.add_argument("--workers", type=int, default=None, help="每个城市详情页并行抓取的无头浏览器数量（默认使用配置文件中的workers）")
+    parser.add_argument("--max-browsers", type=int, default=None, help="全局同时运行的浏览器上限（默认使用配置文件中的max_browsers）")
+    parser.add_argument("--parser", choices=available_parsers(), default=None, help="HTML解析后端（默认优先使用lxml）")
+    parser.add_argument("--company-cache", default="company_cache.db", help="企业详情磁盘缓存文件（SQLite），传空字符串则只使用内存缓存")
+    parser.add_argument("--company-cache-ttl", type=float, default=7, help="企业详情缓存有效期（天，默认7天）")
+    parser.add_argument("--engine", choices=["browser", "async"], default="browser",
+                        help="详情页抓取引擎：browser为逐个抓取，async为asyncio并发HTTP抓取（需要aiohttp，拿不到的页面仍由浏览器抓取）")
+    parser.add_argument("--async-concurrency", type=int, default=50, help="异步引擎同时进行的详情页请求数")
+    parser.add_argument("--parse-processes", type=int, default=0, help="HTML解析进程数（默认0，即在抓取线程中解析）")
+    parser.add_argument("--resume", action="store_true", help="从上次中断处继续抓取，不清空已有输出文件")
+    parser.add_argument("--frontier", default="crawl_frontier.db", help="抓取进度文件（SQLite）")
+    parser.add_argument("--dedup-index", default="job_index.txt", help="已处理职位的信息ID索引文件，跨运行跳过重复职位；传空字符串则只在本次运行内去重")
+    parser.add_argument("--dedup-bloom", action="store_true", help="去重索引使用布隆过滤器（历史记录很大时节省内存）")
+    parser.add_argument("--reset-dedup", action="store_true", help="清空去重索引，重新抓取所有职位")
+    parser.add_argument("--incremental", action="store_true",
+                        help="不续抓时保留去重索引，只抓取历史运行中没有处理过的新职位（默认不续抓时清空索引，与清空输出文件一致）")
+    parser.add_argument("--rate", type=float, default=2.0, help="每个域名的初始访问速率（次/秒），随后根据验证码情况自动调整")
+    parser.add_argument("--manual-captcha", action="store_true", help="验证码自动处理失败时等待手动处理（默认暂缓该职位稍后重试，不阻塞）")
+    parser.add_argument("--profile-dir", default="chrome_profiles", help="浏览器配置目录（保留cookie），传空字符串则每次使用临时配置")
+    parser.add_argument("--recycle-pages", type=int, default=200, help="每个浏览器访问多少个页面后重启，控制内存增长")
+    parser.add_argument("--block-resources", default=",".join(DEFAULT_BLOCKED_RESOURCES),
+                        help="浏览器屏蔽的资源，逗号分隔的类别(image,font,media,stylesheet,tracker)或通配符模式；传空字符串则不屏蔽")
+    parser.add_argument("--allow-resources", default="", help="不屏蔽的资源，逗号分隔的类别或通配符模式，优先于 --block-resources")
+    parser.add_argument("--record-fixtures", metavar="DIR", default=None, help="把抓取到的原始页面压缩保存到指定目录，用于离线解析基准测试")
+    parser.add_argument("--warehouse", metavar="DB", default=None,
+                        help="实时把职位upsert到SQLite职位仓库（按58信息ID和社会信用码去重，可按企业、区域、城市、发布时间查询）")
+    parser.add_argument("--parquet-store", metavar="DIR", default=None,
+                        help="运行结束后把本次结果写入Parquet数据集（按抓取城市和日期分区，替换同一城市当天已有的数据）")
+    args = parser.parse_args()
+    if args.engine == "async" and async_scraper.aiohttp is None:
+        parser.error("--engine async 需要安装aiohttp: pip install aiohttp")
+    if args.parquet_store and parquet_store.pa is None:
+        parser.error("--parquet-store 需要安装pyarrow: pip install pyarrow")
+    
     start_time = time.time()  # 记录开始时间
     print(f"\n=== 任务开始执行 ===")
     print(f"开始时间: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start_time))}")
     
-    # 多个城市的URL列表（包含第一页和第二页）
-    city_urls = {
-        "北京": [
-            "https://bj.58.com/hulianwangtx/",
-        ],
-        "上海": [
-            "https://sh.58.com/hulianwangtx/",
-        ],
-        "广州": [
-            "https://gz.58.com/hulianwangtx/",
-        ],
-        "深圳": [
-            "https://sz.58.com/hulianwangtx/",
-        ],
-        "成都": [
-            "https://cd.58.com/hulianwangtx/",
-        ],
-        "西安": [
-            "https://xa.58.com/hulianwangtx/",
-        ],
-        "郑州": [
-            "https://zz.58.com/hulianwangtx/",
-        ]
-    }
+    # 城市、职位类别和页数来自配置文件，每个城市×类别为一个抓取任务
+    config = load_crawl_config(args.config)
+    if args.workers is not None:
+        config["workers"] = args.workers
+    if args.max_browsers is not None:
+        config["max_browsers"] = args.max_browsers
+    tasks = build_tasks(config)
+    print(f"共 {len(config['cities'])} 个城市、{len(tasks)} 个抓取任务，全局浏览器上限 {config['max_browsers']}")
     
-    scraper = Enhanced58JobScraper(headless=False)  # 设置为False可以看到浏览器操作
+    company_cache = CompanyCache(db_path=args.company_cache or None, ttl=args.company_cache_ttl * 24 * 3600)
+    recorder = FixtureRecorder(args.record_fixtures) if args.record_fixtures else None
+    frontier = CrawlFrontier(args.frontier)
+    rate_limiter = AdaptiveRateLimiter(rate=args.rate)
+    blocked_urls = blocked_url_patterns([name for name in args.block_resources.split(",") if name],
+                                        [name for name in args.allow_resources.split(",") if name])
+    # 各城市的列表页浏览器来自同一个会话池，任务结束后归还给下一个城市复用
+    concurrent_tasks = max(1, min(len(tasks), config["max_browsers"] // browsers_needed(config["workers"])))
+    browser_pool = BrowserPool(size=concurrent_tasks, headless=config["headless"], profile_root=args.profile_dir or None,
+                               max_pages=args.recycle_pages, blocked_urls=blocked_urls).start()
+    dedup_index = JobDedupIndex(args.dedup_index or None, bloom=args.dedup_bloom)
+    if args.reset_dedup or not (args.resume or args.incremental):
+        # 重新开始抓取时输出文件会被清空，索引也一并清空，否则已处理过的职位不会出现在新的输出中
+        dedup_index.clear()
+    print(f"去重索引中已有 {len(dedup_index)} 个职位")
+    parse_pipeline = ParsePipeline(args.parse_processes, args.parser) if args.parse_processes > 0 else None
+    page_stats = PageLoadStats()
+    warehouse = JobWarehouse(args.warehouse) if args.warehouse else None
+    # 负责输出文件和统计的爬虫；各城市的爬虫与它共享写入器、缓存、抓取进度和访问频率控制
+    scraper = Enhanced58JobScraper(workers=config["workers"], company_cache=company_cache, parser=args.parser,
+                                   recorder=recorder, parse_pipeline=parse_pipeline, frontier=frontier,
+                                   dedup_index=dedup_index, rate_limiter=rate_limiter, manual_captcha=args.manual_captcha,
+                                   browser_pool=browser_pool, profile_dir=args.profile_dir or None,
+                                   blocked_urls=blocked_urls, page_stats=page_stats, warehouse=warehouse)
     
-    # 清空Excel文件的数据行，保留表头
-    scraper.clear_excel_data("58同城多城市职位详细信息.xlsx")
+    def create_city_scraper(task):
+        # 每个城市一个异步引擎（各自在城市线程中运行事件循环）
+        async_engine = AsyncEnhanced58JobScraper(
+            concurrency=args.async_concurrency, company_cache=company_cache, parser=args.parser,
+            rate_limiter=rate_limiter, parse_pipeline=parse_pipeline) if args.engine == "async" else None
+        return Enhanced58JobScraper(workers=task.workers, company_cache=company_cache, parser=args.parser,
+                                    recorder=recorder, parse_pipeline=parse_pipeline, frontier=frontier,
+                                    dedup_index=dedup_index, rate_limiter=rate_limiter, manual_captcha=args.manual_captcha,
+                                    browser_pool=browser_pool, profile_dir=args.profile_dir or None,
+                                    blocked_urls=blocked_urls, page_stats=page_stats, sinks=scraper.sinks,
+                                    async_engine=async_engine, warehouse=warehouse)
     
-    # 清空JSON文件的所有数据
-    json_filename = "58同城多城市职位详细信息.json"
-    try:
-        with open(json_filename, 'w', encoding='utf-8') as f:
-            json.dump([], f, ensure_ascii=False, indent=2)
-        print(f"✓ 已清空 {json_filename} 的所有数据")
-    except Exception as e:
-        print(f"清空JSON文件时出错: {e}")
+    if args.resume:
+        # 续抓：保留已有输出和增量日志，中断时正在处理的链接重新抓取
+        restored = frontier.reset_in_flight()
+        stats = frontier.stats()
+        print(f"✓ 从上次进度继续抓取：已完成职位 {stats.get(('job', 'done'), 0)} 个，"
+              f"失败职位 {stats.get(('job', 'failed'), 0)} 个，恢复中断链接 {restored} 个")
+    else:
+        frontier.clear()
+        
+        # 清空Excel文件的数据行，保留表头
+        scraper.clear_excel_data("58同城多城市职位详细信息.xlsx")
+        
+        # 清空JSON文件的所有数据
+        json_filename = "58同城多城市职位详细信息.json"
+        try:
+            with open(json_filename, 'w', encoding='utf-8') as f:
+                json.dump([], f, ensure_ascii=False, indent=2)
+            print(f"✓ 已清空 {json_filename} 的所有数据")
+        except Exception as e:
+            print(f"清空JSON文件时出错: {e}")
     
     all_data = []  # 存储所有城市的数据
     
+    def on_task_done(task, city_data):
+        if city_data:
+            print(f"{task.city}成功抓取到 {len(city_data)} 个职位信息")
+        else:
+            print(f"{task.city}未抓取到任何职位数据")
+    
     try:
-        for city_name, url_list in city_urls.items():
-            print(f"\n开始抓取{city_name}的职位信息（前5页，当前页所有职位）...")
-            
-            try:
-                # 使用第一个URL作为基础URL，抓取前5页
-                base_url = url_list[0]
-                
-                # 抓取该城市前5页数据（当前页所有职位）
-                city_data = scraper.scrape_multiple_pages(base_url, max_pages=5)
-                
-                if city_data:
-                    # 为每个职位添加城市标识
-                    for job in city_data:
-                        job['抓取城市'] = city_name
-                    
-                    all_data.extend(city_data)
-                    print(f"{city_name}成功抓取到 {len(city_data)} 个职位信息")
-                else:
-                    print(f"{city_name}未抓取到任何职位数据")
-                    
-            except Exception as e:
-                print(f"{city_name}抓取出错: {e}")
-                continue  # 继续抓取下一个城市
+        # 各城市并发抓取（城市爬虫关闭时会生成一次成品文件，作为检查点）
+        orchestrator = MultiCityOrchestrator(create_city_scraper, max_browsers=config["max_browsers"])
+        for city_data in orchestrator.run(tasks, on_task_done).values():
+            all_data.extend(city_data)
         
         if all_data:
             print(f"\n所有城市总共成功抓取到 {len(all_data)} 个职位信息")
@@ -2248,6 +989,20 @@ def main():
         print(f"程序执行出错: {e}")
     finally:
         scraper.close()
+        if args.parquet_store:
+            try:
+                records = scraper.get_sink("58同城多城市职位详细信息.xlsx").read_records()
+                count = parquet_store.ParquetJobStore(args.parquet_store).append(records, replace=True)
+                print(f"✓ 已写入Parquet数据集 {args.parquet_store}，共 {count} 条记录")
+            except Exception as e:
+                log_error(f"写入Parquet数据集失败: {e}")
+        browser_pool.close()
+        company_cache.close()
+        frontier.close()
+        if warehouse:
+            warehouse.close()
+        if parse_pipeline:
+            parse_pipeline.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,63 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class FixtureRecorder:
+    """抓取过程中把原始页面源码压缩保存为离线样本
+
+    每个页面保存为 <类型>_<链接哈希>.html.gz，index.jsonl 记录类型、链接和文件名，
+    供 other/test_parse_benchmark.py 离线回放解析代码。
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.index_filename = os.path.join(directory, 'index.jsonl')
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._recorded = {entry['file'] for entry in read_fixture_index(directory)}
+
+    def record(self, kind, url, page_source):
+        """保存一个页面，同一链接只保存一次"""
+        filename = f"{kind}_{hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]}.html.gz"
+        with self._lock:
+            if filename in self._recorded:
+                return
+            with gzip.open(os.path.join(self.directory, filename), 'wt', encoding='utf-8') as f:
+                f.write(page_source)
+            with open(self.index_filename, 'a', encoding='utf-8') as f:
+                entry = {"kind": kind, "url": url, "file": filename, "recorded_at": time.strftime('%Y-%m-%d %H:%M:%S')}
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self._recorded.add(filename)
+
+
+def read_fixture_index(directory):
+    """读取样本目录的索引"""
+    index_filename = os.path.join(directory, 'index.jsonl')
+    entries = []
+    if os.path.exists(index_filename):
+        with open(index_filename, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entries.append(json.loads(line))
+    return entries
+
+
+def load_fixtures(directory, kind=None):
+    """按索引加载样本，返回[(索引项, 页面源码)]；支持.html.gz和未压缩的.html"""
+    fixtures = []
+    for entry in read_fixture_index(directory):
+        if kind and entry['kind'] != kind:
+            continue
+        path = os.path.join(directory, entry['file'])
+        if path.endswith('.gz'):
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                page_source = f.read()
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                page_source = f.read()
+        fixtures.append((entry, page_source))
+    return fixtures
@@ -0,0 +1,1016 @@
+import re
+import logging
+from functools import lru_cache
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+from job_sink import JOB_COLUMNS
+from dedup_index import extract_job_id
+
+# 可选的HTML解析后端，按优先级排列；lxml（C实现）比纯Python的html.parser快得多
+PARSER_BACKENDS = ['lxml', 'html.parser']
+
+
+def _backend_available(parser):
+    try:
+        BeautifulSoup('<html></html>', parser)
+        return True
+    except Exception:
+        return False
+
+
+def available_parsers():
+    """返回当前环境中可用的解析后端"""
+    return [parser for parser in PARSER_BACKENDS if _backend_available(parser)]
+
+
+DEFAULT_PARSER = available_parsers()[0]
+
+
+def make_soup(page_source, parser=None):
+    """用指定的解析后端构建soup，不指定时使用可用的最快后端；传入已解析的soup时直接返回"""
+    if isinstance(page_source, BeautifulSoup):
+        return page_source
+    return BeautifulSoup(page_source, parser or DEFAULT_PARSER)
+
+# 推荐区域的提示文本，标题和企业名称中出现时视为无效
+RECOMMEND_TEXTS = ('您可能感兴趣', '推荐职位')
+
+EDUCATION_KEYWORDS = ['博士', '硕士', '研究生', '本科', '大专', '专科', '高中', '中专', '初中', '学历不限']
+LOW_EDUCATION = ['初中', '中专', '高中']
+
+
+# 企业详情页提供的字段
+COMPANY_COLUMNS = [
+    "企业类型", "社会信用码", "企业规模", "注册资本(万)", "所属区域", "联系人",
+    "联系方式", "联系邮箱", "办公地址", "企业简介", "营业执照", "企业相册"
+]
+
+
+def new_job_data():
+    """创建所有字段为空的职位数据"""
+    return {column: "" for column in JOB_COLUMNS}
+
+
+def remove_recommendations(soup):
+    """移除"您可能感兴趣的职位/企业"等推荐区域"""
+    for unwanted in soup.find_all(['div', 'section'], class_=lambda x: x and ('recommend' in x.lower() or 'interest' in x.lower() or 'similar' in x.lower())):
+        unwanted.decompose()
+
+    # 移除包含"您可能感兴趣"文本的区域
+    for element in soup.find_all(string=lambda text: text and '您可能感兴趣' in text):
+        parent = element.parent
+        while parent and parent.name != 'body':
+            if parent.name in ['div', 'section', 'aside']:
+                parent.decompose()
+                break
+            parent = parent.parent
+
+
+class PageText:
+    """页面文本，只切分一次行，按行数截取的前N行窗口也只拼接一次"""
+
+    def __init__(self, text):
+        self.text = text
+        self._lines = None
+        self._windows = {}
+
+    def window(self, line_count=None):
+        if line_count is None:
+            return self.text
+        if line_count not in self._windows:
+            if self._lines is None:
+                self._lines = self.text.split('\n')
+            self._windows[line_count] = '\n'.join(self._lines[:line_count])
+        return self._windows[line_count]
+
+
+class ExtractionContext:
+    """一次页面提取的上下文：soup、页面文本、选择器结果缓存以及企业链接等附带输出"""
+
+    def __init__(self, soup, page_text):
+        self.soup = soup
+        self.text = PageText(page_text)
+        self.company_url = None
+        self._selected = {}
+
+    def select(self, selector):
+        if selector not in self._selected:
+            self._selected[selector] = self.soup.select(selector)
+        return self._selected[selector]
+
+
+class FieldRule:
+    """字段提取规则
+
+    先调用css(ctx)从HTML结构中提取；没有结果（或等于默认值）时，依次用预编译的
+    正则在页面文本前window行中搜索，post(match)返回None表示该模式不可用、继续下一个。
+    field为元组时，提取结果按顺序写入多个字段。
+    """
+
+    def __init__(self, field, css=None, patterns=(), window=None, flags=0, post=None, default=None):
+        self.field = field
+        self.css = css
+        self.patterns = [re.compile(pattern, flags) for pattern in patterns]
+        self.window = window
+        self.post = post or (lambda match: match.group(1))
+        self.default = default
+
+    def apply(self, ctx, job_data):
+        value = self.css(ctx) if self.css else None
+        if value is None or value == self.default:
+            text = ctx.text.window(self.window)
+            for pattern in self.patterns:
+                match = pattern.search(text)
+                if match:
+                    matched_value = self.post(match)
+                    if matched_value is not None:
+                        value = matched_value
+                        break
+        if value is None:
+            value = self.default
+        if value is None:
+            return
+        if isinstance(self.field, tuple):
+            for field, field_value in zip(self.field, value):
+                job_data[field] = field_value
+        else:
+            job_data[self.field] = value
+
+
+def _is_valid_company_name(company_name):
+    # 只保留包含"公司"字、长度3-20个字、且不以特定内容开头的企业名称
+    return (company_name and len(company_name) >= 3 and len(company_name) <= 20 and
+            not company_name.startswith('微信扫一扫快速求职') and '公司' in company_name)
+
+
+TITLE_SELECTORS = [
+    ".pos_title", ".job-title", ".job_title", ".title", "h1", ".name",
+    "[class*='title']:not([class*='recommend']):not([class*='similar'])",
+    "[class*='name']:not([class*='recommend']):not([class*='similar'])"
+]
+
+COMPANY_SELECTORS = [
+    ".baseInfo_link a", ".baseInfo_link", ".company-name", ".company_name", ".company", ".corp-name",
+    "h1 + .company", ".job-company", ".employer-name",
+    "[class*='company']:not([class*='recommend']):not([class*='similar'])"
+]
+
+SALARY_RANGE_PATTERN = re.compile(r'(\d+)-(\d+)')
+NUMBER_PATTERN = re.compile(r'(\d+)')
+
+
+def _css_title(ctx):
+    for selector in TITLE_SELECTORS:
+        title_element = ctx.soup.select_one(selector)
+        if title_element and title_element.get_text().strip():
+            title_text = title_element.get_text().strip()
+            # 过滤掉包含推荐信息和培训广告的文本
+            if not any(text in title_text for text in RECOMMEND_TEXTS) and '培训广告' not in title_text:
+                return title_text
+    return None
+
+
+def _css_company(ctx):
+    for selector in COMPANY_SELECTORS:
+        company_element = ctx.soup.select_one(selector)
+        if company_element and company_element.get_text().strip():
+            company_text = company_element.get_text().strip()
+            if _is_valid_company_name(company_text) and not any(text in company_text for text in RECOMMEND_TEXTS):
+                # 提取企业链接
+                if company_element.name == 'a' and company_element.get('href'):
+                    company_url = company_element.get('href')
+                    if not company_url.startswith('http'):
+                        company_url = 'https:' + company_url if company_url.startswith('//') else 'https://58.com' + company_url
+                    ctx.company_url = company_url
+                return company_text
+    return None
+
+
+def _post_company(match):
+    company_name = match.group(1).strip()
+    return company_name if _is_valid_company_name(company_name) else None
+
+
+def _css_salary(ctx):
+    salary_element = ctx.soup.select_one(".pos_salary")
+    if salary_element:
+        salary_match = SALARY_RANGE_PATTERN.search(salary_element.get_text().strip())
+        if salary_match:
+            return salary_match.group(1), salary_match.group(2)
+    return None
+
+
+def _css_location(ctx):
+    # 只取前两个元素：城市和区域
+    location_elements = ctx.select(".pos_area_item")
+    if location_elements and len(location_elements) >= 2:
+        return " - ".join(elem.get_text().strip() for elem in location_elements[:2])
+    return None
+
+
+def _post_location(match):
+    return f"{match.group(1).replace('市', '')} - {match.group(2)}"
+
+
+def _css_education(ctx):
+    for elem in ctx.select(".item_condition"):
+        text = elem.get_text().strip()
+        if any(edu in text for edu in EDUCATION_KEYWORDS):
+            # 将初中、中专、高中统一显示为学历不限
+            return "学历不限" if any(low_edu in text for low_edu in LOW_EDUCATION) else text
+    return None
+
+
+def _post_education(match):
+    education_level = match.group(1)
+    return "学历不限" if education_level in LOW_EDUCATION else education_level
+
+
+def _css_experience(ctx):
+    for elem in ctx.select(".item_condition"):
+        text = elem.get_text().strip()
+        if any(exp in text for exp in ['经验', '年', '应届', '不限']):
+            if '学历' not in text and '招' not in text:  # 排除学历和招聘人数信息
+                return text
+    return None
+
+
+def _post_experience(match):
+    if len(match.groups()) >= 2:
+        return f"{match.group(1)}-{match.group(2)}年经验"
+    return match.group(1)
+
+
+def _css_recruit(ctx):
+    for elem in ctx.select(".item_condition"):
+        text = elem.get_text().strip()
+        if '招' in text and '人' in text:
+            number_match = NUMBER_PATTERN.search(text)
+            return int(number_match.group(1)) if number_match else None
+    return None
+
+
+def _post_recruit(match):
+    try:
+        return int(match.group(1))
+    except ValueError:
+        return None
+
+
+def _post_description(match):
+    return match.group(1).strip()[:500]
+
+
+def _make_des_css(patterns):
+    compiled = [re.compile(pattern, re.DOTALL) for pattern in patterns]
+
+    def css(ctx):
+        # 优先从职位描述区域提取
+        job_desc_element = ctx.select(".des")
+        if job_desc_element:
+            desc_text = job_desc_element[0].get_text()
+            for pattern in compiled:
+                match = pattern.search(desc_text)
+                if match:
+                    return match.group(1).strip()[:500] or None
+        return None
+    return css
+
+
+# 职位详情页字段规则表，按顺序执行
+JOB_DETAIL_RULES = [
+    FieldRule("岗位名称", css=_css_title),
+    FieldRule("企业名称", css=_css_company, window=50, post=_post_company, patterns=[
+        r'([\u4e00-\u9fa5]{2,20}公司)',
+        r'([A-Za-z\s]{2,30}(?:公司|Company))'
+    ]),
+    FieldRule(("薪资范围起", "薪资范围至"), css=_css_salary, window=30, post=lambda match: match.groups()[:2], patterns=[
+        r'(\d+)[-~](\d+)元/月',
+        r'(\d+)[-~](\d+)万/年',
+        r'(\d+)[-~](\d+)千/月',
+        r'薪资.*?(\d+)[-~](\d+)',
+        r'工资.*?(\d+)[-~](\d+)'
+    ]),
+    FieldRule("工作地点", css=_css_location, window=40, post=_post_location, patterns=[
+        r'(北京)\s*[-\s]*([\u4e00-\u9fa5]+区)',
+        r'(上海)\s*[-\s]*([\u4e00-\u9fa5]+区)',
+        r'(广州)\s*[-\s]*([\u4e00-\u9fa5]+区)',
+        r'(深圳)\s*[-\s]*([\u4e00-\u9fa5]+区)',
+        r'([\u4e00-\u9fa5]+市?)\s*[-\s]*([\u4e00-\u9fa5]+区)'
+    ]),
+    FieldRule("学历要求", css=_css_education, window=50, post=_post_education, patterns=[
+        r'学历要求.*?(博士|硕士|研究生|本科|大专|专科|高中|中专|初中|不限)',
+        r'学历.*?(博士|硕士|研究生|本科|大专|专科|高中|中专|初中|不限)',
+        r'(博士|硕士|研究生|本科|大专|专科)以上',
+        r'要求.*?(博士|硕士|研究生|本科|大专|专科|高中|中专|初中)'
+    ]),
+    FieldRule("岗位要求", css=_css_experience, window=50, post=_post_experience, patterns=[
+        r'工作经验.*?(\d+)[-~](\d+)年',
+        r'经验.*?(\d+)[-~](\d+)年',
+        r'(\d+)年以上.*?经验',
+        r'经验.*?(\d+)年以上',
+        r'(无需经验|不限经验|应届毕业生|经验不限)'
+    ]),
+    # 招聘人数默认为1，结构中取到1时仍继续用正则确认
+    FieldRule("招聘人数", css=_css_recruit, window=40, post=_post_recruit, default=1, patterns=[
+        r'招聘.*?(\d+)人',
+        r'招.*?(\d+)人',
+        r'(\d+)人'
+    ]),
+    FieldRule("发布时间", patterns=[
+        r'发布时间.*?(\d{4}-\d{2}-\d{2})',
+        r'(\d{4}-\d{2}-\d{2})',
+        r'(\d{2}-\d{2})',
+        r'(今天|昨天|前天)',
+        r'(\d+)小时前',
+        r'(\d+)天前'
+    ]),
+    FieldRule("工作职责", flags=re.DOTALL, post=_post_description, css=_make_des_css([
+        r'岗位职责[：:]?\s*(.*?)(?=任职要求|福利待遇|联系方式|$)',
+        r'工作职责[：:]?\s*(.*?)(?=任职要求|福利待遇|联系方式|$)',
+        r'工作内容[：:]?\s*(.*?)(?=任职要求|福利待遇|联系方式|$)'
+    ]), patterns=[
+        r'岗位职责[：:]?\s*(.*?)(?=任职要求|福利待遇|联系方式|工作地点|$)',
+        r'工作职责[：:]?\s*(.*?)(?=任职要求|福利待遇|联系方式|工作地点|$)',
+        r'工作内容[：:]?\s*(.*?)(?=任职要求|福利待遇|联系方式|工作地点|$)',
+        r'职责[：:]?\s*(.*?)(?=任职要求|福利待遇|联系方式|工作地点|$)'
+    ]),
+    FieldRule("任职要求", flags=re.DOTALL, post=_post_description, css=_make_des_css([
+        r'任职要求[：:]?\s*(.*?)(?=福利待遇|联系方式|工作地点|$)',
+        r'职位要求[：:]?\s*(.*?)(?=福利待遇|联系方式|工作地点|$)'
+    ]), patterns=[
+        r'任职要求[：:]?\s*(.*?)(?=福利待遇|联系方式|工作地点|公司简介|$)',
+        r'职位要求[：:]?\s*(.*?)(?=福利待遇|联系方式|工作地点|公司简介|$)',
+        r'岗位要求[：:]?\s*(.*?)(?=福利待遇|联系方式|工作地点|公司简介|$)',
+        r'要求[：:]?\s*(.*?)(?=福利待遇|联系方式|工作地点|公司简介|$)'
+    ]),
+    FieldRule("联系方式", patterns=[
+        r'联系电话.*?(1[3-9]\d{9})',
+        r'电话.*?(1[3-9]\d{9})',
+        r'手机.*?(1[3-9]\d{9})',
+        r'(1[3-9]\d{9})'
+    ]),
+    FieldRule("联系邮箱", patterns=[
+        r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
+    ]),
+    FieldRule("办公地址", post=lambda match: match.group(1).strip()[:100], patterns=[
+        r'办公地址.*?([\u4e00-\u9fa5]+市[\u4e00-\u9fa5]+区.*?)(?=联系|电话|邮箱|$)',
+        r'地址.*?([\u4e00-\u9fa5]+市[\u4e00-\u9fa5]+区.*?)(?=联系|电话|邮箱|$)',
+        r'公司地址.*?([\u4e00-\u9fa5]+市[\u4e00-\u9fa5]+区.*?)(?=联系|电话|邮箱|$)'
+    ]),
+]
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def extract_job_detail(soup, job_data):
+    """按规则表从职位详情页soup中提取字段写入job_data，返回企业链接（没有则为None）"""
+    remove_recommendations(soup)
+
+    # 只保留主要内容区域
+    main_content = soup.find('div', class_=lambda x: x and ('main' in x.lower() or 'content' in x.lower() or 'detail' in x.lower()))
+    page_text = main_content.get_text() if main_content else soup.get_text()
+
+    ctx = ExtractionContext(soup, page_text)
+    for rule in JOB_DETAIL_RULES:
+        rule.apply(ctx, job_data)
+
+    # 薪资类型逻辑：默认为非面谈，如果薪资范围没有匹配到内容则设为面谈
+    job_data["薪资类型"] = "非面谈" if job_data["薪资范围起"] and job_data["薪资范围至"] else "面谈"
+
+    # 如果工作职责和任职要求都没有匹配成功，将职位描述写入任职要求
+    job_desc_element = ctx.select(".des")
+    if not job_data["工作职责"] and not job_data["任职要求"] and job_desc_element:
+        full_desc_text = job_desc_element[0].get_text()
+        if full_desc_text:
+            job_data["任职要求"] = WHITESPACE_PATTERN.sub(' ', full_desc_text.strip())[:500]
+
+    # 清理工作职责和任职要求字段，去除开头的】符号
+    for field in ("工作职责", "任职要求"):
+        if job_data[field] and job_data[field].startswith('】'):
+            job_data[field] = job_data[field][1:].strip()
+
+    return ctx.company_url
+
+
+# 企业规模标准区间：(区间上限, 标准区间)，按范围的最大值匹配
+COMPANY_SCALE_BINS = [
+    (20, "0-20"),
+    (99, "20-99"),
+    (499, "100-499"),
+    (999, "500-999"),
+    (9999, "1000-9999"),
+]
+COMPANY_SCALE_MAX = "10000+"
+DIGITS_PATTERN = re.compile(r'\d+')
+
+# 标准企业类型：文本中直接包含时优先使用
+STANDARD_COMPANY_TYPES = [
+    "国有企业", "集体所有制企业", "私营企业", "联营企业", "外商投资企业", "股份制企业",
+    "个人独资企业", "合伙企业", "有限责任公司", "股份有限公司", "非法人组织企业", "农民专业合作组织",
+]
+# 不包含标准类型时的模糊匹配规则：(关键词, 标准类型)，按顺序优先
+COMPANY_TYPE_RULES = [
+    (["有限责任公司", "有限公司", "责任有限公司"], "有限责任公司"),
+    (["股份有限公司", "股份公司"], "股份有限公司"),
+    (["私营", "民营", "私人"], "私营企业"),
+    (["国有", "国营", "央企", "国企"], "国有企业"),
+    (["外商", "外资", "合资", "独资"], "外商投资企业"),
+    (["股份制", "股份合作"], "股份制企业"),
+    (["集体", "集体所有制"], "集体所有制企业"),
+    (["个人独资", "独资"], "个人独资企业"),
+    (["合伙", "普通合伙", "有限合伙"], "合伙企业"),
+    (["联营"], "联营企业"),
+    (["合作社", "合作组织", "农民专业合作"], "农民专业合作组织"),
+    (["非法人", "分公司", "分支机构"], "非法人组织企业"),
+]
+
+
+def _compile_type_rules():
+    """把所有规则编译成一个正则：关键词 -> (优先级, 标准类型)
+
+    用零宽前瞻在每个位置匹配，同一位置按优先级排列的分支只取最优先的关键词，
+    所有位置中优先级最高的规则即为逐条规则依次判断的结果。
+    """
+    rules = [([standard_type], standard_type) for standard_type in STANDARD_COMPANY_TYPES] + COMPANY_TYPE_RULES
+    priorities = {}
+    for priority, (keywords, standard_type) in enumerate(rules):
+        for keyword in keywords:
+            priorities.setdefault(keyword, (priority, standard_type))
+    ordered = sorted(priorities, key=lambda keyword: priorities[keyword][0])
+    return re.compile('(?=(' + '|'.join(map(re.escape, ordered)) + '))'), priorities
+
+
+COMPANY_TYPE_PATTERN, COMPANY_TYPE_PRIORITIES = _compile_type_rules()
+
+
+@lru_cache(maxsize=4096)
+def standardize_company_scale(scale_text):
+    """
+    将企业规模数字范围映射到标准化区间
+    例如：10-49 -> 20-99
+    """
+    try:
+        numbers = DIGITS_PATTERN.findall(scale_text)
+        if '-' in scale_text or '~' in scale_text:
+            # 范围格式，如 "10-49" 或 "10~49"，使用范围的最大值进行匹配
+            max_num = int(numbers[1] if len(numbers) >= 2 else numbers[0])
+        elif numbers:
+            max_num = int(numbers[0])
+        else:
+            return scale_text  # 无法解析，返回原值
+    except (ValueError, IndexError):
+        # 解析失败，返回原值
+        return scale_text
+    for upper, standard_scale in COMPANY_SCALE_BINS:
+        if max_num <= upper:
+            return standard_scale
+    return COMPANY_SCALE_MAX
+
+
+@lru_cache(maxsize=4096)
+def standardize_company_type(type_text):
+    """
+    将企业类型映射到标准化类型，都不匹配时返回原值
+    """
+    if not type_text:
+        return type_text
+    best = min((COMPANY_TYPE_PRIORITIES[match.group(1)] for match in COMPANY_TYPE_PATTERN.finditer(type_text)),
+               default=None)
+    return best[1] if best else type_text
+
+
+def new_company_data():
+    """创建所有字段为空的企业数据"""
+    return {column: "" for column in COMPANY_COLUMNS}
+
+
+def extract_company_detail(soup, company_data):
+    """从企业详情页soup中提取企业信息写入company_data"""
+    remove_recommendations(soup)
+
+    # 获取页面文本
+    page_text = soup.get_text()
+
+    # 提取企业类型 - 只匹配具体的公司类型格式
+    type_patterns = [
+        r'(有限责任公司\([^)]+\))',
+        r'(股份有限公司\([^)]+\))',
+        r'(有限责任公司)',
+        r'(股份有限公司)',
+        r'公司类型[：:]?\s*(有限责任公司\([^)]+\))',
+        r'公司类型[：:]?\s*(股份有限公司\([^)]+\))',
+        r'公司类型[：:]?\s*(有限责任公司)',
+        r'公司类型[：:]?\s*(股份有限公司)'
+    ]
+    for pattern in type_patterns:
+        match = re.search(pattern, page_text)
+        if match:
+            type_text = match.group(1).strip()
+            # 将企业类型标准化
+            standardized_type = standardize_company_type(type_text)
+            company_data["企业类型"] = standardized_type
+            break
+
+    # 提取社会信用码
+    credit_patterns = [
+        r'社会信用代码[：:]?\s*([A-Z0-9]{18})',
+        r'统一社会信用代码[：:]?\s*([A-Z0-9]{18})',
+        r'信用代码[：:]?\s*([A-Z0-9]{18})',
+        r'([A-Z0-9]{18})'
+    ]
+    for pattern in credit_patterns:
+        match = re.search(pattern, page_text)
+        if match:
+            company_data["社会信用码"] = match.group(1).strip()
+            break
+
+    # 提取企业规模 - 只匹配员工规模的数字部分
+    scale_patterns = [
+        r'员工规模[：:]?\s*(\d+[-~]\d+)人',
+        r'员工规模[：:]?\s*(\d+)人以上',
+        r'员工规模[：:]?\s*(\d+)人以下',
+        r'员工规模[：:]?\s*(\d+)人',
+        r'公司规模[：:]?\s*(\d+[-~]\d+)人',
+        r'公司规模[：:]?\s*(\d+)人以上',
+        r'公司规模[：:]?\s*(\d+)人以下',
+        r'公司规模[：:]?\s*(\d+)人',
+        r'企业规模[：:]?\s*(\d+[-~]\d+)人',
+        r'企业规模[：:]?\s*(\d+)人以上',
+        r'企业规模[：:]?\s*(\d+)人以下',
+        r'企业规模[：:]?\s*(\d+)人',
+        r'规模[：:]?\s*(\d+[-~]\d+)人',
+        r'规模[：:]?\s*(\d+)人以上',
+        r'规模[：:]?\s*(\d+)人以下',
+        r'规模[：:]?\s*(\d+)人'
+    ]
+    for pattern in scale_patterns:
+        match = re.search(pattern, page_text)
+        if match:
+            scale_number = match.group(1).strip()
+            # 只保存数字部分
+            if scale_number and '企业未添加' not in scale_number:
+                # 将数字范围映射到标准化规模区间
+                standardized_scale = standardize_company_scale(scale_number)
+                company_data["企业规模"] = standardized_scale
+                break
+
+    # 提取注册资本
+    capital_patterns = [
+        r'注册资本[：:]?\s*([\d.]+万?)',
+        r'注册资金[：:]?\s*([\d.]+万?)',
+        r'资本[：:]?\s*([\d.]+万?)'
+    ]
+    for pattern in capital_patterns:
+        match = re.search(pattern, page_text)
+        if match:
+            capital_text = match.group(1).strip()
+            # 统一转换为万元
+            if '万' not in capital_text:
+                try:
+                    capital_num = float(capital_text)
+                    if capital_num > 10000:  # 如果大于1万，可能是元为单位
+                        capital_text = str(capital_num / 10000)
+                except:
+                    pass
+            company_data["注册资本(万)"] = capital_text
+            break
+
+    # 提取所属区域 - 只匹配城市级别地址，过滤无用信息和重复地址
+    region_patterns = [
+        r'所属区域[：:]?\s*([\u4e00-\u9fa5]+市[\u4e00-\u9fa5]+区)',
+        r'地区[：:]?\s*([\u4e00-\u9fa5]+市[\u4e00-\u9fa5]+区)',
+        r'区域[：:]?\s*([\u4e00-\u9fa5]+市[\u4e00-\u9fa5]+区)',
+        r'总部位于([\u4e00-\u9fa5]+市[\u4e00-\u9fa5]+区)',
+        r'(?:^|\s)([\u4e00-\u9fa5]{2,4}市[\u4e00-\u9fa5]{2,4}区)(?=\s|$)'
+    ]
+    for pattern in region_patterns:
+        match = re.search(pattern, page_text)
+        if match:
+            region_text = match.group(1).strip()
+            # 过滤掉包含无关词汇的内容
+            unwanted_keywords = ['注册地位于', '注册地址', '营业执照', '工商注册', '找工作', '免费发布', '登记简历', 
+                                '公司福利', '饭补', '加班补助', '交通便利', '餐补', '市中心区', '不匹配', 
+                                '人公司', '福利', '补助', '便利', '有限公司', '科技有限公司', '信息科技', 
+                                '华南地区', '华北地区', '华东地区', '华西地区', '在华', '地区', '公司在']
+            if not any(unwanted in region_text for unwanted in unwanted_keywords):
+                # 确保是标准的城市区域格式，且长度合理
+                if re.match(r'^[\u4e00-\u9fa5]{2,4}市[\u4e00-\u9fa5]{2,4}区$', region_text) and len(region_text) <= 10:
+                    # 处理重复地址，只保留第一个"XX市XX区"格式
+                    first_region_match = re.search(r'^([\u4e00-\u9fa5]+市[\u4e00-\u9fa5]+区)', region_text)
+                    if first_region_match:
+                        company_data["所属区域"] = first_region_match.group(1)
+                    else:
+                        company_data["所属区域"] = region_text
+                    break
+
+    # 进一步清理所属区域，去除重复的地址部分
+    if company_data.get("所属区域"):
+        region = company_data["所属区域"]
+        # 处理类似"北京市房山区阳光北大街北京市房山区"的重复问题
+        # 查找第一个完整的"XX市XX区"模式
+        first_region_match = re.search(r'^([\u4e00-\u9fa5]+市[\u4e00-\u9fa5]+区)', region)
+        if first_region_match:
+            clean_region = first_region_match.group(1)
+            company_data["所属区域"] = clean_region
+
+    # 提取联系人 - 匹配特定HTML结构中的联系人姓名
+    # 查找 <div class="c_detail_item"><span>联系人</span><i></i><em class="">姓名</em></div> 结构
+    contact_div = soup.find('div', class_='c_detail_item')
+    if contact_div:
+        span = contact_div.find('span')
+        if span and '联系人' in span.get_text():
+            em = contact_div.find('em')
+            if em:
+                contact_person = em.get_text().strip()
+                # 如果是"企业未添加联系人"或类似内容，则为空
+                if contact_person and '企业未添加' not in contact_person:
+                    company_data["联系人"] = contact_person
+
+    # 如果没有找到特定结构，使用备用正则表达式
+    if not company_data.get("联系人"):
+        contact_person_patterns = [
+            r'联系人[：:]?\s*([\u4e00-\u9fa5]{2,10})',
+            r'HR[：:]?\s*([\u4e00-\u9fa5]{2,10})',
+            r'招聘负责人[：:]?\s*([\u4e00-\u9fa5]{2,10})'
+        ]
+        for pattern in contact_person_patterns:
+            match = re.search(pattern, page_text)
+            if match:
+                contact_person = match.group(1).strip()
+                # 如果是"企业未添加"、"企业未添"或类似内容，则为空
+                if contact_person and not any(invalid in contact_person for invalid in ['企业未添加', '企业未添', '未添加', '未添']):
+                    company_data["联系人"] = contact_person
+                break
+
+    # 提取联系方式 - 如果是"企业未添加"就为空
+    phone_patterns = [
+        r'联系方式[：:]?\s*(1[3-9]\d{9})',
+        r'联系电话[：:]?\s*(1[3-9]\d{9})',
+        r'电话[：:]?\s*(1[3-9]\d{9})',
+        r'手机[：:]?\s*(1[3-9]\d{9})',
+        r'(1[3-9]\d{9})'
+    ]
+    # 先检查是否有"企业未添加"的情况
+    if '企业未添加' not in page_text or '联系方式' not in page_text:
+        for pattern in phone_patterns:
+            match = re.search(pattern, page_text)
+            if match:
+                phone_number = match.group(1).strip()
+                # 确保不是"企业未添加"相关内容
+                if phone_number and '企业未添加' not in phone_number and '未添加' not in phone_number:
+                    company_data["联系方式"] = phone_number
+                break
+
+    # 提取联系邮箱 - 匹配招聘邮箱，如果是"企业未添加"就为空
+    email_patterns = [
+        r'招聘邮箱[：:]?\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
+        r'邮箱[：:]?\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
+        r'邮件[：:]?\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
+        r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
+    ]
+    # 先检查是否有"企业未添加"的情况
+    if '企业未添加' not in page_text or '邮箱' not in page_text:
+        for pattern in email_patterns:
+            match = re.search(pattern, page_text)
+            if match:
+                email_address = match.group(1).strip()
+                # 确保不是"企业未添加"相关内容
+                if email_address and '企业未添加' not in email_address and '未添加' not in email_address:
+                    company_data["联系邮箱"] = email_address
+                break
+
+    # 提取办公地址 - 匹配公司地址格式，如"北京-大兴-西红门 西红门鸿坤金融谷25号楼"
+    address_patterns = [
+        r'公司地址\s*([\u4e00-\u9fa5]+-[\u4e00-\u9fa5]+-[\u4e00-\u9fa5]+\s+[^\u4e00-\u9fa5]*[\u4e00-\u9fa5]+[^出口确定©]+?)(?=出口|确定|©|$)',
+        r'办公地址\s*([\u4e00-\u9fa5]+-[\u4e00-\u9fa5]+-[\u4e00-\u9fa5]+\s+[^\u4e00-\u9fa5]*[\u4e00-\u9fa5]+[^出口确定©]+?)(?=出口|确定|©|$)',
+        r'地址\s*([\u4e00-\u9fa5]+-[\u4e00-\u9fa5]+-[\u4e00-\u9fa5]+\s+[^出口确定©]+?)(?=出口|确定|©|$)',
+        r'([\u4e00-\u9fa5]+-[\u4e00-\u9fa5]+-[\u4e00-\u9fa5]+\s+[\u4e00-\u9fa5]+[^出口确定©]*?)(?=出口|确定|©|$)'
+    ]
+    for pattern in address_patterns:
+        match = re.search(pattern, page_text)
+        if match:
+            address_text = match.group(1).strip()
+            # 清理地址文本，移除重复部分
+            address_text = re.sub(r'([\u4e00-\u9fa5]+)\1+', r'\1', address_text)  # 移除重复的中文字符
+            company_data["办公地址"] = address_text[:100]  # 限制长度
+            break
+
+    # 提取企业简介 - 匹配特定HTML结构
+    # 首先尝试匹配 <div class="introduction"><span class="c_title">公司简介</span><div class="introduction_box"><p><span>内容</span></p></div></div>
+    intro_div = soup.find('div', class_='introduction')
+    if intro_div:
+        title_span = intro_div.find('span', class_='c_title')
+        if title_span and '公司简介' in title_span.get_text():
+            intro_box = intro_div.find('div', class_='introduction_box')
+            if intro_box:
+                # 提取所有文本内容
+                intro_text = intro_box.get_text().strip()
+                # 清理文本，移除多余的空白字符
+                intro_text = re.sub(r'\s+', ' ', intro_text)
+                # 过滤掉包含特定内容的企业简介
+                if (intro_text and len(intro_text) > 10 and 
+                    '企业未添加' not in intro_text and 
+                    '老板使用58招人神器' not in intro_text and
+                    '该信息通过58招才猫app发布' not in intro_text and
+                    '老板忙得连写简介的时间都没有' not in intro_text and
+                    '老板使用58APP商家版发布该职位' not in intro_text and
+                    '招人的诚意大到无需描述' not in intro_text and
+                    '58' not in intro_text):
+                    company_data["企业简介"] = intro_text[:500]  # 增加长度限制
+
+    # 如果没有找到特定结构，使用备用正则表达式
+    if not company_data.get("企业简介"):
+        intro_patterns = [
+            r'公司简介\s*([^公司相册企业未添加相册公司地址出口确定©]+?)(?=公司相册|企业未添加相册|公司地址|出口|确定|©|基本信息|工商信息|$)',
+            r'企业简介\s*([^公司相册企业未添加相册公司地址出口确定©]+?)(?=公司相册|企业未添加相册|公司地址|出口|确定|©|基本信息|工商信息|$)',
+            r'简介\s*([^公司相册企业未添加相册公司地址出口确定©]+?)(?=公司相册|企业未添加相册|公司地址|出口|确定|©|基本信息|工商信息|$)'
+        ]
+        for pattern in intro_patterns:
+            match = re.search(pattern, page_text)
+            if match:
+                intro_text = match.group(1).strip()
+                # 过滤掉无关信息
+                if (intro_text and len(intro_text) > 10 and 
+                    '企业未添加' not in intro_text and 
+                    '老板使用58招人神器' not in intro_text and
+                    '该信息通过58招才猫app发布' not in intro_text and
+                    '老板忙得连写简介的时间都没有' not in intro_text and
+                    '老板使用58APP商家版发布该职位' not in intro_text and
+                    '招人的诚意大到无需描述' not in intro_text and
+                    '58' not in intro_text):
+                    company_data["企业简介"] = intro_text[:300]  # 限制长度
+                    break
+
+    # 营业执照字段固定为空
+    # company_data["营业执照"] 保持初始化时的空字符串
+
+    # 提取企业相册 - 匹配图片地址，排除通用图片，优先匹配公司相册
+    try:
+        # 排除的通用图片URL
+        excluded_urls = [
+            'https://pic1.58cdn.com.cn/nowater/cxnomark/n_v2e8d9dbce287f4e45bb5ebebbe90bb295.png',
+            'https://pic1.58cdn.com.cn/nowater/cxnomark/n_v2502726ab70ad4151ba43adc35fda265e.png'
+        ]
+
+        # 首先尝试查找公司相册区域的图片
+        album_section = soup.find(string=re.compile(r'公司相册|企业相册'))
+        image_urls = []
+
+        if album_section:
+            # 找到相册区域后查找附近的图片
+            parent = album_section.parent
+            if parent:
+                # 向上查找包含相册的容器
+                for _ in range(3):  # 最多向上查找3层
+                    if parent.parent:
+                        parent = parent.parent
+                    else:
+                        break
+
+                # 在相册容器中查找图片
+                img_elements = parent.find_all('img')
+            else:
+                img_elements = []
+        else:
+            # 如果没有找到相册区域，查找所有图片
+            img_elements = soup.find_all('img')
+
+        for img in img_elements:
+            src = img.get('src', '')
+            data_src = img.get('data-src', '')
+
+            # 优先使用data-src，然后是src
+            img_url = data_src if data_src else src
+
+            # 过滤有效的图片URL
+            if img_url and any(ext in img_url.lower() for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp']):
+                # 转换为完整URL
+                if img_url.startswith('//'):
+                    img_url = 'https:' + img_url
+                elif img_url.startswith('/'):
+                    img_url = 'https://pic1.58cdn.com.cn' + img_url
+                elif not img_url.startswith('http'):
+                    continue
+
+                # 排除通用图标、小图片和指定的通用图片
+                if (not any(exclude in img_url.lower() for exclude in ['icon', 'logo', 'avatar', 'default', 'placeholder']) 
+                    and img_url not in excluded_urls):
+                    image_urls.append(img_url)
+
+        # 去重并用||分割
+        if image_urls:
+            unique_urls = list(dict.fromkeys(image_urls))  # 去重保持顺序
+            company_data["企业相册"] = '||'.join(unique_urls[:10])  # 最多保留10张图片
+
+    except Exception as e:
+        logging.info(f"提取企业相册失败: {e}")
+
+
+def extract_job_from_item(item):
+    """从列表页的单个职位项目中提取信息"""
+    job_data = new_job_data()
+
+    try:
+        item_text = item.get_text()
+
+        # 提取岗位名称
+        title_element = item.find("a") or item.find("h3") or item.find("h4")
+        if title_element:
+            job_data["岗位名称"] = title_element.get_text().strip()
+
+        # 提取薪资信息
+        salary_patterns = [
+            r'(\d+)[-~](\d+)元/月',
+            r'(\d+)[-~](\d+)元',
+            r'(\d+)[-~](\d+)万/年',
+            r'(\d+)[-~](\d+)万',
+            r'(\d+)[-~](\d+)千/月',
+            r'面议'
+        ]
+
+        for pattern in salary_patterns:
+            salary_match = re.search(pattern, item_text)
+            if salary_match:
+                if pattern == r'面议':
+                    job_data["薪资类型"] = "面议"
+                else:
+                    groups = salary_match.groups()
+                    if len(groups) >= 2:
+                        job_data["薪资范围起"] = groups[0]
+                        job_data["薪资范围至"] = groups[1]
+
+                        if "月" in salary_match.group(0):
+                            job_data["薪资类型"] = "月薪"
+                        elif "年" in salary_match.group(0):
+                            job_data["薪资类型"] = "年薪"
+                        else:
+                            job_data["薪资类型"] = "月薪"
+                break
+
+        # 提取工作地点 - 只保留"城市 - 区域"格式
+        location_patterns = [
+            r'(北京)\s*[-\s]*([\u4e00-\u9fa5]+区)',
+            r'(上海)\s*[-\s]*([\u4e00-\u9fa5]+区)',
+            r'(广州)\s*[-\s]*([\u4e00-\u9fa5]+区)',
+            r'(深圳)\s*[-\s]*([\u4e00-\u9fa5]+区)',
+            r'([\u4e00-\u9fa5]+市?)\s*[-\s]*([\u4e00-\u9fa5]+区)'
+        ]
+
+        for pattern in location_patterns:
+            location_match = re.search(pattern, item_text)
+            if location_match:
+                city = location_match.group(1).replace('市', '')
+                district = location_match.group(2)
+                job_data["工作地点"] = f"{city} - {district}"
+                break
+
+        # 提取学历要求
+        education_patterns = [
+            r'(博士|硕士|研究生|本科|大专|专科|高中|中专|初中|不限).*学历',
+            r'学历.*(博士|硕士|研究生|本科|大专|专科|高中|中专|初中|不限)',
+            r'(博士|硕士|研究生|本科|大专|专科)以上',
+            r'(博士|硕士|研究生|本科|大专|专科|高中|中专|初中)'
+        ]
+
+        for pattern in education_patterns:
+            edu_match = re.search(pattern, item_text)
+            if edu_match:
+                education_text = edu_match.group(0)
+                # 将初中、中专、高中统一显示为学历不限
+                if any(low_edu in education_text for low_edu in ['初中', '中专', '高中']):
+                    job_data["学历要求"] = "学历不限"
+                else:
+                    job_data["学历要求"] = education_text
+                break
+
+        # 提取工作经验
+        exp_patterns = [
+            r'(\d+)[-~](\d+)年.*经验',
+            r'经验.*(\d+)[-~](\d+)年',
+            r'(\d+)年以上.*经验',
+            r'经验.*(\d+)年以上',
+            r'(无需经验|不限经验|应届毕业生)'
+        ]
+
+        for pattern in exp_patterns:
+            exp_match = re.search(pattern, item_text)
+            if exp_match:
+                job_data["岗位要求"] = exp_match.group(0)
+                break
+
+        # 提取发布时间
+        time_patterns = [
+            r'(\d{4}-\d{2}-\d{2})',
+            r'(\d{2}-\d{2})',
+            r'(今天|昨天|前天)',
+            r'(\d+)小时前',
+            r'(\d+)天前'
+        ]
+
+        for pattern in time_patterns:
+            time_match = re.search(pattern, item_text)
+            if time_match:
+                job_data["发布时间"] = time_match.group(0)
+                break
+
+        # 尝试提取企业名称（通常在职位附近）- 只匹配包含"公司"字的企业名称
+        company_patterns = [
+            r'([\u4e00-\u9fa5]+公司)',
+            r'([A-Za-z]+(?:公司|Company))'
+        ]
+
+        for pattern in company_patterns:
+            company_match = re.search(pattern, item_text)
+            if company_match:
+                company_name = company_match.group(1)
+                # 过滤掉以特定内容开头的企业名称，确保包含"公司"字
+                # 同时检查企业名称长度（3-20个字）和非空
+                if (company_name and len(company_name) >= 3 and len(company_name) <= 20 and
+                    not company_name.startswith('微信扫一扫快速求职') and '公司' in company_name):
+                    job_data["企业名称"] = company_name
+                    break
+
+    except Exception as e:
+        logging.info(f"提取职位项目信息失败: {e}")
+
+    return job_data
+
+
+# 列表页职位链接的选择器，按优先级尝试，找到链接即停止
+JOB_LINK_SELECTORS = [
+    "span.name",  # 用户指定的span.name元素
+    "a[href*='shtml']",  # 58同城职位详情页通常以.shtml结尾
+    "a[href*='job']",
+    "a[href*='zhaopin']",
+    ".job_name a",
+    ".job-title a",
+    ".title a"
+]
+JOB_LINK_KEYWORDS = ('shtml', 'job', 'zhaopin', 'detail')
+
+
+def _span_link(span):
+    """span.name对应的链接：优先所在的<a>，否则取相邻的<a>（前一个优先，与XPath文档顺序一致）"""
+    link = span.find_parent("a")
+    if link is None:
+        link = span.find_previous_sibling("a") or span.find_next_sibling("a")
+    return link.get("href") if link else None
+
+
+def extract_job_links(soup, base_url=None):
+    """一次遍历列表页soup，返回职位链接列表（按信息ID去重）"""
+    links = []
+    job_ids = set()
+    for selector in JOB_LINK_SELECTORS:
+        for element in soup.select(selector):
+            href = _span_link(element) if selector == "span.name" else element.get("href")
+            if not href:
+                continue
+            if base_url:
+                href = urljoin(base_url, href)
+            if not any(keyword in href for keyword in JOB_LINK_KEYWORDS):
+                continue
+            job_id = extract_job_id(href)
+            if job_id in job_ids:
+                continue
+            job_ids.add(job_id)
+            links.append(href)
+        if links:  # 如果找到链接就停止尝试其他选择器
+            break
+    return links
+
+
+def parse_job_detail_html(page_source, parser=None):
+    """解析职位详情页HTML，返回(job_data, 企业链接)"""
+    job_data = new_job_data()
+    company_url = extract_job_detail(make_soup(page_source, parser), job_data)
+    return job_data, company_url
+
+
+def parse_company_detail_html(page_source, parser=None):
+    """解析企业详情页HTML，返回company_data"""
+    company_data = new_company_data()
+    extract_company_detail(make_soup(page_source, parser), company_data)
+    return company_data
+
+
+def parse_job_list_html(page_source, parser=None):
+    """解析职位列表页HTML，返回每个职位项目的列表页信息"""
+    soup = make_soup(page_source, parser)
+    return [extract_job_from_item(item) for item in soup.select("li.job_item")]
+
+
+def is_training_ad(job_data):
+    """岗位名称中含"培训广告"的职位不保存"""
+    return bool(job_data["岗位名称"]) and "培训广告" in job_data["岗位名称"]
+
+
+def merge_company_details(job_data, company_details):
+    """将企业详细信息合并到job_data中，只更新非空值"""
+    for key, value in company_details.items():
+        if value:
+            job_data[key] = value
+    return job_data
@@ -0,0 +1,162 @@
+import json
+import os
+import threading
+import time
+import logging
+
+import pandas as pd
+
+# 职位数据的标准列顺序（与scrape_job_detail_page返回的job_data一致）
+JOB_COLUMNS = [
+    "企业名称", "企业类型", "社会信用码", "企业规模", "注册资本(万)", "所属区域",
+    "联系人", "联系方式", "联系邮箱", "办公地址", "企业简介", "营业执照", "企业相册",
+    "岗位名称", "薪资类型", "薪资范围起", "薪资范围至", "工作地点", "岗位要求",
+    "学历要求", "招聘人数", "发布时间", "结束时间", "工作职责", "任职要求"
+]
+# 日志行中保存记录键（职位链接）的字段，不进入Excel和JSON成品
+KEY_FIELD = "_key"
+
+
+class JsonlJobSink:
+    """增量职位写入器
+
+    每条职位以一行JSON追加到 .jsonl 日志中（O(1)），并带有写缓冲；
+    Excel和JSON成品只在 checkpoint() 时根据日志一次性生成。
+    记录的键（职位链接）随记录保存在日志中，导入仓库时按与爬虫相同的方式生成职位主键。
+    """
+
+    def __init__(self, filename="58同城职位详细信息.xlsx", flush_every=10, flush_interval=2.0):
+        self.filename = filename
+        self.json_filename = filename.replace('.xlsx', '.json')
+        self.journal_filename = filename.replace('.xlsx', '.jsonl')
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._last_flush = time.time()
+        self._lock = threading.Lock()
+        self._checkpoint_lock = threading.Lock()
+        # 缓冲区中记录对应的键（如职位链接），落盘后交给flush_listeners
+        self._pending_keys = []
+        # 每次日志落盘后调用的回调，参数为本次落盘记录的键（如抓取进度在数据真正写入后才标记完成）
+        self.flush_listeners = []
+
+    def append(self, job_data, key=None):
+        """追加一条职位数据，缓冲满或超时后写入日志；key在该记录落盘后传给flush_listeners"""
+        with self._lock:
+            record = dict(job_data)
+            if key is not None:
+                record[KEY_FIELD] = key
+                self._pending_keys.append(key)
+            self._buffer.append(record)
+            if (len(self._buffer) >= self.flush_every or
+                    time.time() - self._last_flush >= self.flush_interval):
+                self._flush_locked()
+
+    def flush(self):
+        """把缓冲区中的数据写入日志文件"""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._buffer:
+            with open(self.journal_filename, 'a', encoding='utf-8') as f:
+                for record in self._buffer:
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self._buffer = []
+        self._last_flush = time.time()
+        keys, self._pending_keys = self._pending_keys, []
+        for listener in self.flush_listeners:
+            listener(keys)
+
+    def reset(self):
+        """清空日志和缓冲区（开始新一轮抓取时调用）"""
+        with self._lock:
+            self._buffer = []
+            self._pending_keys = []
+            with open(self.journal_filename, 'w', encoding='utf-8'):
+                pass
+
+    def is_empty(self):
+        """日志和缓冲区中都没有记录（刚清空或从未写入）"""
+        with self._lock:
+            if self._buffer:
+                return False
+            return not os.path.exists(self.journal_filename) or os.path.getsize(self.journal_filename) == 0
+
+    def read_records(self):
+        """读取日志中的全部职位数据（包括尚未落盘的缓冲）"""
+        return [record for _, record in self.read_keyed_records()]
+
+    def read_keyed_records(self):
+        """读取日志中的全部职位数据，返回 [(键, 职位数据)]，没有键的记录键为None"""
+        with self._lock:
+            self._flush_locked()
+            return self._read_locked()
+
+    def _read_locked(self):
+        records = []
+        if os.path.exists(self.journal_filename):
+            with open(self.journal_filename, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # 进程中断可能留下半行，跳过即可
+                        logging.warning(f"跳过损坏的日志行: {line[:50]}")
+                        continue
+                    records.append((record.pop(KEY_FIELD, None), record))
+        return records
+
+    def remove(self, predicate):
+        """从日志中删除 predicate(职位数据) 为真的记录（整体重写日志），返回删除的条数"""
+        with self._lock:
+            self._flush_locked()
+            records = self._read_locked()
+            kept = [(key, record) for key, record in records if not predicate(record)]
+            # 先写临时文件再替换，避免中途中断丢失日志
+            tmp_journal = self.journal_filename + '.tmp'
+            with open(tmp_journal, 'w', encoding='utf-8') as f:
+                for key, record in kept:
+                    if key is not None:
+                        record = dict(record, **{KEY_FIELD: key})
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_journal, self.journal_filename)
+            return len(records) - len(kept)
+
+    def checkpoint(self):
+        """根据日志一次性生成Excel和JSON成品文件，返回写入的记录数"""
+        # 多个城市的爬虫共享同一个写入器时，同一时间只允许一个线程生成成品文件
+        with self._checkpoint_lock:
+            return self._checkpoint()
+
+    def _checkpoint(self):
+        records = self.read_records()
+        if records:
+            df = pd.DataFrame(records)
+        else:
+            df = pd.DataFrame(columns=JOB_COLUMNS)
+
+        # 先写临时文件再替换，避免中途中断留下损坏的成品
+        tmp_excel = self.filename + '.tmp.xlsx'
+        df.to_excel(tmp_excel, index=False)
+        os.replace(tmp_excel, self.filename)
+
+        json_data = df.to_dict('records')
+        # 处理NaN值，将其替换为空字符串
+        for record in json_data:
+            for key, value in record.items():
+                if pd.isna(value):
+                    record[key] = ""
+        tmp_json = self.json_filename + '.tmp'
+        with open(tmp_json, 'w', encoding='utf-8') as f:
+            json.dump(json_data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_json, self.json_filename)
+
+        return len(records)
@@ -0,0 +1,301 @@
+"""
+SQLite职位仓库：职位表以58信息ID为主键，企业表以社会信用码为主键，抓取时逐条upsert，
+重复抓取的职位和企业只更新不重复；企业名称、所属区域、抓取城市、发布时间上有索引，
+删除或筛选某个企业的职位只需一条走索引的SQL，不再读取并重写整个Excel/JSON文件：
+
+    python enhanced_job_scraper.py --warehouse job_warehouse.db
+    python job_warehouse.py import 58同城多城市职位详细信息.jsonl
+    python job_warehouse.py delete --company 广东天杰国际人才科技有限公司
+    python job_warehouse.py export 北京职位.xlsx --city 北京 --published-from 2024-05-01
+"""
+
+import argparse
+import hashlib
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from dedup_index import extract_job_id
+from job_extractors import COMPANY_COLUMNS
+from job_sink import JOB_COLUMNS, JsonlJobSink
+from parquet_store import CITY_COLUMN, record_city, to_text
+
+# 企业表的列（企业名称 + 企业详情），其余为职位本身的列
+COMPANY_TABLE_COLUMNS = ["企业名称"] + COMPANY_COLUMNS
+JOB_TABLE_COLUMNS = [column for column in JOB_COLUMNS if column not in COMPANY_TABLE_COLUMNS]
+# 所属区域在保存时按职位的工作地点补充过，职位表保留一份用于按区域筛选
+JOB_OWN_COLUMNS = ["所属区域", CITY_COLUMN] + JOB_TABLE_COLUMNS
+NAME_KEY_PREFIX = "名称:"
+RECORD_KEY_PREFIX = "记录:"
+
+INDEXES = {
+    "idx_jobs_company_name": ("jobs", "企业名称"),
+    "idx_jobs_region": ("jobs", "所属区域"),
+    "idx_jobs_city": ("jobs", CITY_COLUMN),
+    "idx_jobs_published": ("jobs", "发布时间"),
+    "idx_jobs_company_key": ("jobs", "company_key"),
+    "idx_companies_name": ("companies", "企业名称"),
+}
+
+
+def quote(column):
+    """中文列名加双引号作为SQL标识符"""
+    return '"' + column.replace('"', '""') + '"'
+
+
+def job_key(url=None, record=None):
+    """职位主键：链接中的58信息ID；导入的Excel/JSON成品记录没有链接时，按企业名称和职位各列的内容生成（完全相同的记录只保存一次）"""
+    if url:
+        return extract_job_id(url)
+    fields = [to_text(record.get(column)) for column in ["企业名称"] + JOB_TABLE_COLUMNS]
+    return RECORD_KEY_PREFIX + hashlib.sha1("\x1f".join(fields).encode("utf-8")).hexdigest()
+
+
+def _upsert_sql(table, key, columns, keep_existing=(), insert_only=()):
+    """INSERT ... ON CONFLICT DO UPDATE：keep_existing中的列新值为空时保留原值，insert_only中的列只在插入时写入"""
+    updates = []
+    for column in columns:
+        if column in insert_only:
+            continue
+        if column in keep_existing:
+            updates.append(f"{quote(column)} = COALESCE(NULLIF(excluded.{quote(column)}, ''), {table}.{quote(column)})")
+        else:
+            updates.append(f"{quote(column)} = excluded.{quote(column)}")
+    return (f"INSERT INTO {table} ({', '.join(quote(column) for column in [key] + columns)}) "
+            f"VALUES ({', '.join('?' * (len(columns) + 1))}) "
+            f"ON CONFLICT ({quote(key)}) DO UPDATE SET {', '.join(updates)}")
+
+
+COMPANY_UPSERT = _upsert_sql("companies", "company_key", COMPANY_TABLE_COLUMNS + ["updated_at"],
+                             keep_existing=COMPANY_TABLE_COLUMNS)
+JOB_UPSERT = _upsert_sql("jobs", "job_id", ["url", "company_key", "企业名称"] + JOB_OWN_COLUMNS + ["first_seen", "updated_at"],
+                         keep_existing=["url", CITY_COLUMN], insert_only=["first_seen"])
+
+
+class JobWarehouse:
+    """职位和企业的SQLite仓库（WAL模式）
+
+    upsert_job在爬虫实时保存职位时调用：同一职位（58信息ID）再次抓取时更新原记录并保留首次抓取时间，
+    同一企业（社会信用码，没有信用码时按企业名称）只保存一行，新抓到的空字段不覆盖已有的值。
+    多个城市的爬虫线程共享同一个实例。
+    """
+
+    def __init__(self, db_path="job_warehouse.db", timeout=30):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        # 自动提交模式，每次upsert显式使用一个事务
+        self.conn = sqlite3.connect(db_path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        # WAL模式下读取（查询、导出）不阻塞抓取时的写入；synchronous=NORMAL 每次提交不再等待fsync
+        self.journal_mode = self.conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS companies (company_key TEXT PRIMARY KEY, "
+            + ", ".join(f"{quote(column)} TEXT NOT NULL DEFAULT ''" for column in COMPANY_TABLE_COLUMNS)
+            + ", updated_at REAL NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs (job_id TEXT PRIMARY KEY, url TEXT NOT NULL DEFAULT '', "
+            "company_key TEXT NOT NULL, \"企业名称\" TEXT NOT NULL, "
+            + ", ".join(f"{quote(column)} TEXT NOT NULL DEFAULT ''" for column in JOB_OWN_COLUMNS)
+            + ", first_seen REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        for name, (table, column) in INDEXES.items():
+            self.conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({quote(column)})")
+
+    @contextmanager
+    def _transaction(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def _company_key(self, name, credit_code):
+        """企业主键：社会信用码；没有信用码时沿用同名企业已有的主键，否则按企业名称"""
+        name_key = NAME_KEY_PREFIX + name
+        if credit_code:
+            # 之前没有信用码、按名称保存的企业，职位改挂到信用码下
+            if self.conn.execute("SELECT 1 FROM companies WHERE company_key = ?", (name_key,)).fetchone():
+                self.conn.execute("UPDATE jobs SET company_key = ? WHERE company_key = ?", (credit_code, name_key))
+                self.conn.execute("DELETE FROM companies WHERE company_key = ?", (name_key,))
+            return credit_code
+        row = self.conn.execute(
+            "SELECT company_key FROM companies WHERE \"企业名称\" = ? ORDER BY company_key LIKE ? LIMIT 1",
+            (name, NAME_KEY_PREFIX + "%")
+        ).fetchone()
+        return row[0] if row else name_key
+
+    def _upsert(self, url, job_data, city, now):
+        name = to_text(job_data.get("企业名称")).strip()
+        company_key = self._company_key(name, to_text(job_data.get("社会信用码")).strip())
+        self.conn.execute(COMPANY_UPSERT, [company_key, name]
+                          + [to_text(job_data.get(column)) for column in COMPANY_COLUMNS] + [now])
+        own = [to_text(job_data.get(column)) for column in JOB_OWN_COLUMNS]
+        # 抓取城市：指定的城市，其次为记录中的抓取城市，再次为工作地点中的城市
+        own[1] = record_city(job_data, city)
+        if url:
+            # 之前从成品文件导入、按内容生成主键的同一条记录，改用58信息ID保存
+            self.conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_key(record=job_data),))
+        self.conn.execute(JOB_UPSERT, [job_key(url, job_data), url or "", company_key, name] + own + [now, now])
+
+    def upsert_job(self, url, job_data, city=None):
+        """保存（或更新）一个职位及其企业；url为职位链接，city为抓取城市"""
+        self.upsert_jobs([(url, job_data, city)])
+
+    def upsert_jobs(self, items):
+        """在一个事务中保存一批职位 [(链接, job_data, 抓取城市)]，返回保存的条数"""
+        items = [item for item in items if to_text(item[1].get("企业名称")).strip()]
+        now = time.time()
+        with self._lock, self._transaction():
+            for url, job_data, city in items:
+                self._upsert(url, job_data, city, now)
+        return len(items)
+
+    def delete_company(self, name=None, credit_code=None):
+        """删除某个企业（按企业名称或社会信用码）的所有职位，返回删除的职位数"""
+        if not name and not credit_code:
+            raise ValueError("需要指定企业名称或社会信用码")
+        column, value = ("company_key", credit_code) if credit_code else ("企业名称", name)
+        with self._lock, self._transaction():
+            deleted = self.conn.execute(f"DELETE FROM jobs WHERE {quote(column)} = ?", (value,)).rowcount
+            self.conn.execute(f"DELETE FROM companies WHERE {quote(column)} = ?", (value,))
+        return deleted
+
+    def _where(self, company=None, regions=None, cities=None, published_from=None, published_to=None):
+        conditions, params = [], []
+        if company:
+            conditions.append("j.\"企业名称\" = ?")
+            params.append(company)
+        for column, values in (("所属区域", regions), (CITY_COLUMN, cities)):
+            if values:
+                conditions.append(f"j.{quote(column)} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        if published_from:
+            conditions.append("j.\"发布时间\" >= ?")
+            params.append(published_from)
+        if published_to:
+            conditions.append("j.\"发布时间\" <= ? AND j.\"发布时间\" != ''")
+            params.append(published_to)
+        return (" WHERE " + " AND ".join(conditions)) if conditions else "", params
+
+    def query(self, include_city=False, limit=None, **filters):
+        """按条件查询职位，返回与成品文件相同列的记录列表
+
+        filters: company 企业名称；regions 所属区域列表；cities 抓取城市列表；
+        published_from/published_to 发布时间（YYYY-MM-DD）。
+        """
+        columns = JOB_COLUMNS + ([CITY_COLUMN] if include_city else [])
+        # 企业详情取企业表，职位列和所属区域取职位表
+        select = ", ".join(("c." if column in COMPANY_COLUMNS and column != "所属区域" else "j.") + quote(column)
+                           for column in columns)
+        where, params = self._where(**filters)
+        sql = (f"SELECT {select} FROM jobs j JOIN companies c ON c.company_key = j.company_key{where} "
+               "ORDER BY j.first_seen, j.rowid")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    def count(self, **filters):
+        where, params = self._where(**filters)
+        with self._lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM jobs j{where}", params).fetchone()[0]
+
+    def export(self, filename, include_city=False, **filters):
+        """把满足条件的职位导出为原来的Excel（.xlsx）或JSON格式，返回导出的条数"""
+        import pandas as pd
+        from batch_clean import write_table
+
+        records = self.query(include_city=include_city, **filters)
+        columns = JOB_COLUMNS + ([CITY_COLUMN] if include_city else [])
+        write_table(pd.DataFrame(records, columns=columns), filename)
+        return len(records)
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+
+def import_files(warehouse, paths, city=None):
+    """把增量日志（.jsonl）或Excel、JSON成品文件导入仓库，返回 {文件: 导入的条数}
+
+    增量日志中保存了职位链接，主键与爬虫保存时相同；成品文件没有链接，按记录内容生成主键。
+    """
+    from batch_clean import read_table
+
+    counts = {}
+    for path in paths:
+        if path.endswith(".jsonl"):
+            items = [(url, record, city) for url, record in read_journal(path)]
+        else:
+            items = [(None, record, city) for record in read_table(path).to_dict("records")]
+        counts[path] = warehouse.upsert_jobs(items)
+    return counts
+
+
+def read_journal(path):
+    """读取增量日志，返回 [(职位链接, 职位数据)]"""
+    return JsonlJobSink(path[:-len(".jsonl")] + ".xlsx").read_keyed_records()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite职位仓库：导入、删除企业、查询和导出")
+    parser.add_argument("--db", default="job_warehouse.db", help="仓库文件（SQLite）")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="导入增量日志（.jsonl）或Excel、JSON成品文件")
+    import_parser.add_argument("files", nargs="+")
+    import_parser.add_argument("--city", default=None, help="记录中没有抓取城市时使用的城市（默认取工作地点中的城市）")
+
+    delete_parser = subparsers.add_parser("delete", help="删除某个企业的所有职位")
+    delete_parser.add_argument("--company", default=None, help="企业名称")
+    delete_parser.add_argument("--credit-code", default=None, help="社会信用码")
+
+    for name, help_text in (("scan", "查询并打印职位"), ("export", "导出为Excel或JSON")):
+        sub = subparsers.add_parser(name, help=help_text)
+        if name == "export":
+            sub.add_argument("output", help="输出文件（.xlsx或.json）")
+            sub.add_argument("--include-city", action="store_true", help="导出时保留抓取城市列")
+        else:
+            sub.add_argument("--limit", type=int, default=20, help="最多打印的行数")
+        sub.add_argument("--company", default=None, help="企业名称")
+        sub.add_argument("--region", nargs="+", default=None, help="所属区域")
+        sub.add_argument("--city", nargs="+", default=None, help="抓取城市")
+        sub.add_argument("--published-from", default=None)
+        sub.add_argument("--published-to", default=None)
+    args = parser.parse_args()
+    if args.command == "delete" and not (args.company or args.credit_code):
+        parser.error("delete 需要指定 --company 或 --credit-code")
+
+    warehouse = JobWarehouse(args.db)
+    try:
+        if args.command == "import":
+            for path, count in import_files(warehouse, args.files, args.city).items():
+                print(f"已导入 {path}: {count} 条记录")
+            print(f"仓库中共 {warehouse.count()} 个职位")
+        elif args.command == "delete":
+            deleted = warehouse.delete_company(name=args.company, credit_code=args.credit_code)
+            print(f"已删除 {args.company or args.credit_code} 的 {deleted} 个职位")
+        else:
+            filters = dict(company=args.company, regions=args.region, cities=args.city,
+                           published_from=args.published_from, published_to=args.published_to)
+            if args.command == "export":
+                count = warehouse.export(args.output, include_city=args.include_city, **filters)
+                print(f"已导出 {count} 条记录到 {args.output}")
+            else:
+                print(f"共 {warehouse.count(**filters)} 条记录")
+                for record in warehouse.query(limit=args.limit, **filters):
+                    print(f"{record['企业名称']} | {record['岗位名称']} | {record['所属区域']} | "
+                          f"{record['薪资范围起']}-{record['薪资范围至']} | {record['发布时间']}")
+    finally:
+        warehouse.close()
+
+
+if __name__ == "__main__":
+    main()
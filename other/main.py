@@ -1,51 +1,54 @@
+import os
+import sys
 import time
 import pandas as pd
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from browser_pool import BrowserPool
+from page_waits import wait_for_page
+
+# 所有函数共用同一个无头浏览器，不再为每个URL启动新的Chrome；第一次使用时才创建会话池
+BROWSER_POOL = None
+
+def get_browser_pool():
+    global BROWSER_POOL
+    if BROWSER_POOL is None:
+        BROWSER_POOL = BrowserPool(size=1, headless=True, profile_root="chrome_profiles")
+    return BROWSER_POOL
 
 def get_real_url(url):
-    options = Options()
-    options.add_argument("--headless")
-    driver = webdriver.Chrome(options=options)
-    driver.get(url)
-    real_url = driver.current_url
-    driver.quit()
-    return real_url
+    with get_browser_pool().session() as driver:
+        driver.get(url)
+        return driver.current_url
 
 def get_company_contact_selenium(url):
-    options = Options()
-    options.add_argument("--headless")
-    driver = webdriver.Chrome(options=options)
-    driver.get(url)
-    driver.implicitly_wait(5)
-
     contact_name = email = phone = ""
-    try:
-        items = driver.find_elements("css selector", ".contact .c_detail_item")
-        for item in items:
-            key = item.find_element("tag name", "span").text.strip()
-            value = item.find_element("tag name", "em").text.strip()
-            if "联系人" in key:
-                contact_name = value
-            elif "邮箱" in key:
-                email = value
-            elif "电话" in key:
-                phone = value
-    except Exception as e:
-        print("抓取联系方式失败:", e)
-    driver.quit()
+    with get_browser_pool().session() as driver:
+        driver.get(url)
+        wait_for_page(driver, "company")
+        try:
+            items = driver.find_elements("css selector", ".contact .c_detail_item")
+            for item in items:
+                key = item.find_element("tag name", "span").text.strip()
+                value = item.find_element("tag name", "em").text.strip()
+                if "联系人" in key:
+                    contact_name = value
+                elif "邮箱" in key:
+                    email = value
+                elif "电话" in key:
+                    phone = value
+        except Exception as e:
+            print("抓取联系方式失败:", e)
     return {"联系人": contact_name, "招聘邮箱": email, "联系电话": phone}
 
 def get_job_detail(url):
     try:
-        options = Options()
-        options.add_argument("--headless")
-        driver = webdriver.Chrome(options=options)
-        driver.get(url)
-        driver.implicitly_wait(5)
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        driver.quit()
+        with get_browser_pool().session() as driver:
+            driver.get(url)
+            wait_for_page(driver, "detail")
+            soup = BeautifulSoup(driver.page_source, "html.parser")
 
         # 基本信息
         title = soup.find("span", class_="pos_title").get_text(strip=True) if soup.find("span", class_="pos_title") else ""
@@ -122,14 +125,10 @@ def get_job_detail(url):
 
 def get_job_list(list_url):
     """抓取列表页所有职位"""
-    options = Options()
-    options.add_argument("--headless")
-    driver = webdriver.Chrome(options=options)
-    driver.get(list_url)
-    driver.implicitly_wait(5)
-
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    driver.quit()
+    with get_browser_pool().session() as driver:
+        driver.get(list_url)
+        wait_for_page(driver, "list")
+        soup = BeautifulSoup(driver.page_source, "html.parser")
 
     jobs = []
     for job_li in soup.find_all("li", class_="job_item"):
@@ -142,30 +141,36 @@ def get_job_list(list_url):
     return jobs
 
 if __name__ == "__main__":
-    list_url = "https://xa.58.com/hulianwangtx/?PGTID=0d402f88-0209-9eab-d90c-05ba2b785523&ClickID=5"
-    jobs = get_job_list(list_url)
-    print(f"列表页共抓取到 {len(jobs)} 个职位")
-
-    # 创建空 DataFrame
-    df = pd.DataFrame()
-
-    for i, (title, job_url) in enumerate(jobs, 1):
-        print(f"\n抓取第 {i} 个职位: {title}")
-        print(f"原始跳转链接: {job_url}")
-
-        if job_url:
-            real_url = get_real_url(job_url)
-            print(f"真实职位链接: {real_url}")
-
-            detail = get_job_detail(real_url)
-            if detail:
-                # 写入 DataFrame
-                df = pd.concat([df, pd.DataFrame([detail])], ignore_index=True)
-                # 每抓一个职位立即写入 Excel
-                df.to_excel("58职位信息.xlsx", index=False)
-                print("写入成功")
-            else:
-                print("抓取职位详情失败")
-
-        print("暂停 30 秒...")
-        time.sleep(30)
+    try:
+        get_browser_pool().start()
+        list_url = "https://xa.58.com/hulianwangtx/?PGTID=0d402f88-0209-9eab-d90c-05ba2b785523&ClickID=5"
+        jobs = get_job_list(list_url)
+        print(f"列表页共抓取到 {len(jobs)} 个职位")
+
+        # 创建空 DataFrame
+        df = pd.DataFrame()
+
+        for i, (title, job_url) in enumerate(jobs, 1):
+            print(f"\n抓取第 {i} 个职位: {title}")
+            print(f"原始跳转链接: {job_url}")
+
+            if job_url:
+                real_url = get_real_url(job_url)
+                print(f"真实职位链接: {real_url}")
+
+                detail = get_job_detail(real_url)
+                if detail:
+                    # 写入 DataFrame
+                    df = pd.concat([df, pd.DataFrame([detail])], ignore_index=True)
+                    # 每抓一个职位立即写入 Excel
+                    df.to_excel("58职位信息.xlsx", index=False)
+                    print("写入成功")
+                else:
+                    print("抓取职位详情失败")
+
+            print("暂停 30 秒...")
+            time.sleep(30)
+    finally:
+        # 退出或出错时关闭浏览器和chromedriver进程
+        if BROWSER_POOL is not None:
+            BROWSER_POOL.close()
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试辅助：在临时目录中运行，爬虫写在当前目录下的增量日志和成品文件不会覆盖仓库中的数据
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+
+@contextmanager
+def temp_workdir():
+    """切换到新建的临时目录并返回其路径，结束后回到原目录并删除临时目录"""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            yield tmp
+        finally:
+            os.chdir(cwd)
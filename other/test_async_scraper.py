@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+异步抓取引擎测试：用保存的页面样本代替网络，确认异步引擎得到与同步解析相同的job_data，
+同一企业只抓取一次，HTTP拿不到可用页面的职位交给浏览器
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from async_scraper import AsyncEnhanced58JobScraper
+from company_cache import CompanyCache
+from job_extractors import parse_job_detail_html, parse_company_detail_html, merge_company_details
+from rate_limiter import AdaptiveRateLimiter
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+class FixtureFetcher:
+    """按页面类型返回样本页面的假异步获取层，链接中含 captcha 的返回验证码结果"""
+
+    def __init__(self):
+        self.requests = []
+        self.pages = {"detail": read_fixture("job_detail.html"), "company": read_fixture("company_detail.html")}
+
+    async def fetch(self, url, kind):
+        self.requests.append((kind, url))
+        await asyncio.sleep(0.01)
+        if "captcha" in url:
+            return "captcha", None
+        return "ok", self.pages[kind]
+
+    async def close(self):
+        pass
+
+
+def make_engine(fetcher):
+    return AsyncEnhanced58JobScraper(concurrency=10, company_cache=CompanyCache(), fetcher=fetcher,
+                                     rate_limiter=AdaptiveRateLimiter(rate=1000, burst=1000))
+
+
+def test_same_job_data_as_sync_path():
+    """测试异步引擎与同步的解析、合并得到相同的job_data"""
+    job_data, company_url = parse_job_detail_html(read_fixture("job_detail.html"))
+    assert company_url, "样本详情页应包含企业链接"
+    expected = merge_company_details(job_data, parse_company_detail_html(read_fixture("company_detail.html")))
+
+    results = {}
+    links = [f"https://bj.58.com/hulianwangtx/4600000000000{n}x.shtml" for n in range(5)]
+    fetcher = FixtureFetcher()
+    browser_links = make_engine(fetcher).run(links, lambda i, link, data, error: results.update({link: (data, error)}))
+
+    assert browser_links == []
+    assert all(results[link] == (expected, None) for link in links)
+    # 5个职位属于同一企业，企业详情页只请求一次
+    assert [kind for kind, _ in fetcher.requests].count("company") == 1
+    print("✓ 异步引擎与同步解析结果一致，同一企业只抓取一次")
+
+
+def test_unavailable_pages_go_to_browser():
+    """测试验证码页面的职位按原始顺序交给浏览器"""
+    links = ["https://bj.58.com/hulianwangtx/captcha2x.shtml", "https://bj.58.com/hulianwangtx/46000000000001x.shtml",
+             "https://bj.58.com/hulianwangtx/captcha1x.shtml"]
+    engine = make_engine(FixtureFetcher())
+    saved = []
+    browser_links = engine.run(links, lambda i, link, data, error: saved.append(link))
+    assert browser_links == [links[0], links[2]]
+    assert saved == [links[1]]
+    assert engine.stats["detail"] == {"captcha": 2, "ok": 1}
+    print("✓ HTTP拿不到可用页面的职位交给浏览器")
+
+
+if __name__ == "__main__":
+    test_same_job_data_as_sync_path()
+    test_unavailable_pages_go_to_browser()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量清洗测试：整列清洗的结果与逐条标准化一致，Excel和JSON读写后内容不变
+"""
+
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_clean import clean_dataframe, map_unique, read_table, write_table
+from region_normalizer import normalize
+from job_extractors import standardize_company_scale, standardize_company_type
+
+
+def make_frame():
+    return pd.DataFrame({
+        '所属区域': ['广州天河区', None, '北京市朝阳区', '公司福利好', '', '广州天河区'],
+        '工作地点': ['广州 - 天河', '北京 - 大兴', '', '', '西安 - 雁塔区', ''],
+        '薪资类型': ['', '', '面议', None, '', ''],
+        '薪资范围起': ['3000', 5000.0, '', None, '8000元', ''],
+        '薪资范围至': ['5000', '8000.0', '', None, '12000', ''],
+        '企业规模': ['10-49', '1000-9999人', None, '', '50~99', '10-49'],
+        '企业类型': ['有限公司', '民营', None, '股份有限公司', '', '有限公司'],
+        '学历要求': ['本科', '高中', '学历不限', '不限', None, '大专及以上'],
+    })
+
+
+def test_clean_dataframe():
+    """测试整列清洗结果"""
+    print("=== 测试整列清洗 ===")
+    df = make_frame()
+    stats = clean_dataframe(df)
+    print(df)
+    print(stats)
+    assert list(df['所属区域']) == ['广东省广州市', '北京市大兴区', '北京市朝阳区', '', '陕西省西安市', '广东省广州市']
+    assert list(df['薪资范围起']) == ['3000', '5000', '', '', '8000', '']
+    assert list(df['薪资范围至']) == ['5000', '8000', '', '', '12000', '']
+    # 已有的薪资类型保持不变，空的按是否有薪资范围补充
+    assert list(df['薪资类型']) == ['非面谈', '非面谈', '面议', '面谈', '非面谈', '面谈']
+    # 与详情页解析一致，只有初中、中专、高中统一为学历不限
+    assert list(df['学历要求']) == ['本科', '学历不限', '学历不限', '不限', '', '大专及以上']
+    assert stats['region'] == 5
+
+
+def test_matches_row_by_row():
+    """测试整列清洗与逐条调用标准化函数的结果一致"""
+    print("=== 测试与逐条处理一致 ===")
+    df = make_frame()
+    clean_dataframe(df, ['region', 'scale', 'type'])
+    source = make_frame()
+    for i, row in source.iterrows():
+        text = {column: value if isinstance(value, str) else '' for column, value in row.items()}
+        assert df.at[i, '所属区域'] == normalize(text['所属区域'], text['工作地点'])
+        assert df.at[i, '企业规模'] == standardize_company_scale(text['企业规模'])
+        assert df.at[i, '企业类型'] == standardize_company_type(text['企业类型'])
+
+
+def test_map_unique_calls_once_per_value():
+    """测试每个不同的值只计算一次，空值保持不变"""
+    print("=== 测试按不同的值映射 ===")
+    calls = []
+
+    def upper(value):
+        calls.append(value)
+        return value.upper()
+
+    result = map_unique(pd.Series(['a', 'b', 'a', None, 'b', 'a']), upper)
+    assert sorted(calls) == ['a', 'b']
+    assert list(result[:3]) == ['A', 'B', 'A']
+    assert pd.isna(result[3])
+
+
+def test_read_write_roundtrip():
+    """测试Excel和JSON清洗后写回再读取，内容一致"""
+    print("=== 测试读写文件 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ("jobs.xlsx", "jobs.json"):
+            path = os.path.join(tmp, name)
+            df = make_frame()
+            clean_dataframe(df)
+            write_table(df, path)
+            loaded = read_table(path).fillna('')
+            assert list(loaded['所属区域']) == list(df['所属区域'])
+            assert list(loaded['薪资范围起']) == list(df['薪资范围起'])
+            # 清洗过的数据再次清洗没有变化
+            assert sum(clean_dataframe(loaded).values()) == 0
+
+
+if __name__ == "__main__":
+    test_clean_dataframe()
+    test_matches_row_by_row()
+    test_map_unique_calls_once_per_value()
+    test_read_write_roundtrip()
+    print("\n所有测试通过")
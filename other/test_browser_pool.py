@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+浏览器池测试：会话复用、失效会话重建、达到页面数上限后重启（用假浏览器代替Chrome）
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import browser_pool
+from browser_pool import BrowserPool, blocked_url_patterns, apply_resource_blocking, RESOURCE_PATTERNS
+
+
+class FakeDriver:
+    launched = 0
+
+    def __init__(self, profile):
+        FakeDriver.launched += 1
+        self.profile = profile
+        self.alive = True
+        self.cdp_commands = []
+
+    def execute_script(self, script, *args):
+        if not self.alive:
+            raise RuntimeError("session deleted")
+        return 1
+
+    def execute_cdp_cmd(self, command, params):
+        self.cdp_commands.append((command, params))
+
+    def quit(self):
+        self.alive = False
+
+
+def fake_create_driver(options, driver_path=None, blocked_urls=None):
+    return FakeDriver(next((arg for arg in options.arguments if arg.startswith("--user-data-dir=")), None))
+
+
+@contextmanager
+def make_pool(tmp_path, **kwargs):
+    """用假浏览器替换Chrome启动，不解析ChromeDriver路径"""
+    original = browser_pool.create_driver, browser_pool.resolve_driver_path
+    browser_pool.create_driver = fake_create_driver
+    browser_pool.resolve_driver_path = lambda: None
+    browser_pool._resolved_driver_path.clear()
+    pool = BrowserPool(profile_root=str(tmp_path), **kwargs).start()
+    try:
+        yield pool
+    finally:
+        pool.close()
+        browser_pool.create_driver, browser_pool.resolve_driver_path = original
+        browser_pool._resolved_driver_path.clear()
+
+
+def test_sessions_are_reused(tmp_path):
+    """测试同一个浏览器在多次使用之间复用"""
+    FakeDriver.launched = 0
+    with make_pool(tmp_path, size=1) as pool:
+        drivers = []
+        for _ in range(3):
+            with pool.session() as driver:
+                drivers.append(driver)
+    assert FakeDriver.launched == 1
+    assert drivers[0] is drivers[1] is drivers[2]
+    print("✓ 浏览器会话被复用")
+
+
+def test_unhealthy_session_is_replaced(tmp_path):
+    """测试失效的浏览器在取出时被替换"""
+    with make_pool(tmp_path, size=1) as pool:
+        with pool.session() as driver:
+            driver.alive = False
+        with pool.session() as new_driver:
+            assert new_driver is not driver and new_driver.alive
+    print("✓ 失效会话被重新启动")
+
+
+def test_recycle_after_max_pages(tmp_path):
+    """测试达到页面数上限后重启浏览器，并沿用同一个配置目录"""
+    with make_pool(tmp_path, size=1, max_pages=2) as pool:
+        drivers = []
+        for _ in range(3):
+            with pool.session() as driver:
+                drivers.append(driver)
+    assert drivers[0] is drivers[1]
+    assert drivers[2] is not drivers[0] and not drivers[0].alive
+    assert drivers[2].profile == drivers[0].profile
+    print("✓ 访问页面数达到上限后重启浏览器")
+
+
+def test_driver_path_resolved_once(tmp_path):
+    """测试创建会话池时不解析ChromeDriver路径，第一次启动浏览器时解析，失败的结果同样只解析一次"""
+    calls = []
+    with make_pool(tmp_path, size=0) as pool:
+        browser_pool.resolve_driver_path = lambda: calls.append(1)  # 模拟解析失败（返回None）
+        BrowserPool(profile_root=str(tmp_path))
+        assert calls == []
+        for _ in range(2):
+            with pool.session():
+                pass
+        other_pool = BrowserPool(profile_root=str(tmp_path))
+        with other_pool.session():
+            pass
+        other_pool.close()
+        assert calls == [1]
+    print("✓ ChromeDriver路径只在第一次启动浏览器时解析一次")
+
+
+def test_blocked_url_patterns():
+    """测试屏蔽列表按类别展开，放行列表优先"""
+    patterns = blocked_url_patterns(["image", "*ads.58.com*"], ["*.png*"])
+    assert "*.jpg*" in patterns and "*ads.58.com*" in patterns
+    assert "*.png*" not in patterns
+    assert not set(RESOURCE_PATTERNS["font"]) & set(patterns)
+    assert blocked_url_patterns(["tracker"], ["tracker"]) == []
+    print("✓ 屏蔽列表和放行列表展开正确")
+
+
+def test_apply_resource_blocking():
+    """测试通过DevTools协议设置屏蔽的URL"""
+    driver = FakeDriver(None)
+    assert apply_resource_blocking(driver, ["*.png*"])
+    assert driver.cdp_commands == [("Network.enable", {}), ("Network.setBlockedURLs", {"urls": ["*.png*"]})]
+    assert not apply_resource_blocking(FakeDriver(None), [])
+    print("✓ 通过 Network.setBlockedURLs 屏蔽资源")
+
+
+if __name__ == "__main__":
+    test_blocked_url_patterns()
+    test_apply_resource_blocking()
+    import tempfile
+    import pathlib
+    for test in (test_sessions_are_reused, test_unhealthy_session_is_replaced, test_recycle_after_max_pages,
+                 test_driver_path_resolved_once):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(pathlib.Path(tmp))
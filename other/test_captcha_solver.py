@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+验证码处理测试：用模拟浏览器验证优先点击已知按钮、总耗时不超过时间预算，
+手动处理验证码的设置传给详情页工作线程
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from captcha_solver import CaptchaSolver, PROBE_SCRIPT
+from enhanced_job_scraper import Enhanced58JobScraper
+
+
+class FakeDriver:
+    """模拟浏览器：点击passes_after次后离开验证码页面"""
+
+    def __init__(self, passes_after=1, selector="#btnSubmit"):
+        self.passes_after = passes_after
+        self.selector = selector
+        self.clicks = []
+        self.script_calls = 0
+
+    def execute_script(self, script, *args):
+        self.script_calls += 1
+        captcha = len(self.clicks) < self.passes_after
+        if script == PROBE_SCRIPT:
+            return {"captcha": captcha, "selector": self.selector if captcha else None}
+        self.clicks.append(args[0])
+        return args[0]
+
+    def refresh(self):
+        pass
+
+
+def test_known_button_first():
+    """测试直接点击已知按钮后通过"""
+    driver = FakeDriver(passes_after=1)
+    solver = CaptchaSolver(budget=2, poll_interval=0.01)
+    assert solver.solve(driver)
+    assert driver.clicks == ["#btnSubmit"]
+    print(f"✓ 点击已知按钮后通过，共 {driver.script_calls} 次脚本调用")
+
+
+def test_time_budget():
+    """测试一直无法通过时在时间预算内放弃"""
+    driver = FakeDriver(passes_after=10 ** 6)
+    solver = CaptchaSolver(budget=0.3, poll_interval=0.01)
+    start = time.monotonic()
+    assert not solver.solve(driver)
+    elapsed = time.monotonic() - start
+    assert elapsed < 0.5, elapsed
+    assert solver.failed == 1
+    print(f"✓ {elapsed:.2f} 秒后放弃，不阻塞")
+
+
+class UnusedBrowserPool:
+    """不会被用到的浏览器会话池"""
+
+    def close(self):
+        pass
+
+
+def test_manual_captcha_reaches_workers():
+    """测试 --manual-captcha 与 --workers 同时使用时，工作线程的爬虫也等待手动处理验证码"""
+    for manual_captcha in (True, False):
+        scraper = Enhanced58JobScraper(http_first=False, workers=2, manual_captcha=manual_captcha,
+                                       browser_pool=UnusedBrowserPool())
+        worker = scraper.get_worker_pool().scraper_factory()
+        try:
+            assert worker.manual_captcha is manual_captcha
+        finally:
+            worker.browser_pool.close()
+    print("✓ 工作线程沿用手动处理验证码的设置")
+
+
+if __name__ == "__main__":
+    test_known_button_first()
+    test_time_budget()
+    test_manual_captcha_reaches_workers()
@@ -1,9 +1,15 @@
 import pandas as pd
 import os
+import shutil
+import tempfile
 from enhanced_job_scraper import Enhanced58JobScraper
 
 def test_clear_excel():
-    filename = "58同城多城市职位详细信息.xlsx"
+    # 在临时目录中的副本上测试，不清空仓库中的成品文件
+    source = "58同城多城市职位详细信息.xlsx"
+    filename = os.path.join(tempfile.mkdtemp(), source)
+    if os.path.exists(source):
+        shutil.copy(source, filename)
     
     print(f"测试清空Excel数据功能")
     print(f"目标文件: {filename}")
@@ -46,5 +52,21 @@ def test_clear_excel():
     scraper.close()
     print("\n测试完成")
 
+def test_close_keeps_existing_output():
+    """本次没有写入任何职位时，关闭爬虫不会用空日志覆盖已有的Excel和JSON"""
+    filename = os.path.join(tempfile.mkdtemp(), "58同城多城市职位详细信息.xlsx")
+    pd.DataFrame([{"企业名称": "甲公司", "岗位名称": "销售"}]).to_excel(filename, index=False)
+    json_filename = filename.replace('.xlsx', '.json')
+    with open(json_filename, 'w', encoding='utf-8') as f:
+        f.write('[{"企业名称": "甲公司", "岗位名称": "销售"}]')
+
+    scraper = Enhanced58JobScraper(headless=True)
+    scraper.get_sink(filename)
+    scraper.close()
+    assert len(pd.read_excel(filename)) == 1
+    with open(json_filename, 'r', encoding='utf-8') as f:
+        assert "甲公司" in f.read()
+
 if __name__ == "__main__":
-    test_clear_excel()
\ No newline at end of file
+    test_clear_excel()
+    test_close_keeps_existing_output()
\ No newline at end of file
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+企业详情缓存测试：企业链接规范化后命中，同一企业换了企业链接时按社会信用码合并
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from company_cache import CompanyCache
+from job_extractors import new_company_data
+
+
+def make_company(**fields):
+    company = new_company_data()
+    company.update(fields)
+    return company
+
+
+def test_url_normalized():
+    """测试查询参数、协议和末尾斜杠不同的企业链接命中同一条缓存"""
+    cache = CompanyCache()
+    cache.put("http://qy.58.com/mq/123/?PGTID=abc", make_company(企业规模="20-99人"))
+    assert cache.get("https://qy.58.com/mq/123")["企业规模"] == "20-99人"
+    assert cache.get("https://qy.58.com/mq/456/") is None
+    print("✓ 规范化的企业链接命中缓存")
+
+
+def test_alias_merged_by_credit_code():
+    """测试同一企业的另一个企业链接解析出信用码后，补全本次没有解析到的字段"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = CompanyCache(db_path=os.path.join(tmp, "company_cache.db"))
+        try:
+            cache.put("https://qy.58.com/mq/123/", make_company(社会信用码="91110000AAA", 企业规模="20-99人", 联系人="张先生"))
+            details = cache.merge_known(make_company(社会信用码="91110000AAA", 联系人="李女士"))
+            assert cache.merge_known(make_company(社会信用码="91310000BBB"))["企业规模"] == ""
+            assert (cache.hits, cache.misses) == (0, 0)  # 合并时的查询不计入缓存统计
+            cache.put("https://qy.58.com/mq/789/", details)
+            alias = cache.get("https://qy.58.com/mq/789/")
+            assert alias["企业规模"] == "20-99人" and alias["联系人"] == "李女士"
+            # 没有信用码或信用码未缓存时原样返回
+            assert cache.merge_known(make_company(企业规模="1-9人")) == make_company(企业规模="1-9人")
+            assert cache.merge_known(make_company(社会信用码="91310000BBB")) == make_company(社会信用码="91310000BBB")
+        finally:
+            cache.close()
+    print("✓ 同一企业的不同企业链接按信用码合并")
+
+
+if __name__ == "__main__":
+    test_url_normalized()
+    test_alias_merged_by_credit_code()
+    print("\n所有测试通过")
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+企业类型、企业规模标准化测试：编译后的规则与原来逐条判断的规则结果一致
+"""
+
+import os
+import re
+import sys
+import random
+import itertools
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_extractors import (
+    standardize_company_scale, standardize_company_type, STANDARD_COMPANY_TYPES, COMPANY_TYPE_RULES
+)
+
+
+# ---- 原来的实现（逐条判断），作为对照 ----
+
+def legacy_standardize_company_scale(scale_text):
+    """
+    将企业规模数字范围映射到标准化区间
+    例如：10-49 -> 20-99
+    """
+    try:
+        # 提取数字范围
+        if '-' in scale_text or '~' in scale_text:
+            # 处理范围格式，如 "10-49" 或 "10~49"
+            numbers = re.findall(r'\d+', scale_text)
+            if len(numbers) >= 2:
+                max_num = int(numbers[1])  # 使用范围的最大值进行匹配
+            else:
+                max_num = int(numbers[0])
+        else:
+            # 处理单个数字
+            numbers = re.findall(r'\d+', scale_text)
+            if numbers:
+                max_num = int(numbers[0])
+            else:
+                return scale_text  # 无法解析，返回原值
+
+        # 根据最大值映射到标准区间
+        if max_num <= 20:
+            return "0-20"
+        elif max_num <= 99:
+            return "20-99"
+        elif max_num <= 499:
+            return "100-499"
+        elif max_num <= 999:
+            return "500-999"
+        elif max_num <= 9999:
+            return "1000-9999"
+        else:
+            return "10000+"
+
+    except (ValueError, IndexError):
+        # 解析失败，返回原值
+        return scale_text
+
+
+def legacy_standardize_company_type(type_text):
+    """
+    将企业类型映射到标准化类型
+    """
+    if not type_text:
+        return type_text
+
+    # 标准企业类型列表
+    standard_types = [
+        "国有企业",
+        "集体所有制企业", 
+        "私营企业",
+        "联营企业",
+        "外商投资企业",
+        "股份制企业",
+        "个人独资企业",
+        "合伙企业",
+        "有限责任公司",
+        "股份有限公司",
+        "非法人组织企业",
+        "农民专业合作组织"
+    ]
+
+    # 直接匹配
+    for standard_type in standard_types:
+        if standard_type in type_text:
+            return standard_type
+
+    # 模糊匹配规则
+    type_text_lower = type_text.lower()
+
+    # 有限责任公司的各种表述
+    if any(keyword in type_text for keyword in ["有限责任公司", "有限公司", "责任有限公司"]):
+        return "有限责任公司"
+
+    # 股份有限公司的各种表述
+    if any(keyword in type_text for keyword in ["股份有限公司", "股份公司"]):
+        return "股份有限公司"
+
+    # 私营企业相关
+    if any(keyword in type_text for keyword in ["私营", "民营", "私人"]):
+        return "私营企业"
+
+    # 国有企业相关
+    if any(keyword in type_text for keyword in ["国有", "国营", "央企", "国企"]):
+        return "国有企业"
+
+    # 外商投资企业相关
+    if any(keyword in type_text for keyword in ["外商", "外资", "合资", "独资"]):
+        return "外商投资企业"
+
+    # 股份制企业相关
+    if any(keyword in type_text for keyword in ["股份制", "股份合作"]):
+        return "股份制企业"
+
+    # 集体所有制企业相关
+    if any(keyword in type_text for keyword in ["集体", "集体所有制"]):
+        return "集体所有制企业"
+
+    # 个人独资企业相关
+    if any(keyword in type_text for keyword in ["个人独资", "独资"]):
+        return "个人独资企业"
+
+    # 合伙企业相关
+    if any(keyword in type_text for keyword in ["合伙", "普通合伙", "有限合伙"]):
+        return "合伙企业"
+
+    # 联营企业相关
+    if any(keyword in type_text for keyword in ["联营"]):
+        return "联营企业"
+
+    # 农民专业合作组织相关
+    if any(keyword in type_text for keyword in ["合作社", "合作组织", "农民专业合作"]):
+        return "农民专业合作组织"
+
+    # 非法人组织企业相关
+    if any(keyword in type_text for keyword in ["非法人", "分公司", "分支机构"]):
+        return "非法人组织企业"
+
+    # 如果都不匹配，返回原值
+    return type_text
+
+
+# ---- 测试 ----
+
+def type_samples():
+    keywords = list(STANDARD_COMPANY_TYPES) + [keyword for keywords, _ in COMPANY_TYPE_RULES for keyword in keywords]
+    samples = ["", "其他", "事业单位", "Limited Company"] + keywords
+    # 两个关键词组合，检验规则之间的优先级
+    samples += [a + b for a, b in itertools.product(keywords, repeat=2)]
+    samples += [f"（{a}）{b}企业" for a, b in itertools.product(keywords[:12], keywords[12:])]
+    random.seed(23)
+    alphabet = "".join(set("".join(keywords))) + "公司企业"
+    samples += ["".join(random.choice(alphabet) for _ in range(random.randint(1, 12))) for _ in range(5000)]
+    return samples
+
+
+def test_company_type_matches_legacy():
+    """测试企业类型标准化与原规则一致"""
+    print("=== 测试企业类型标准化 ===")
+    samples = type_samples()
+    for type_text in samples:
+        assert standardize_company_type(type_text) == legacy_standardize_company_type(type_text), type_text
+    print(f"{len(samples)} 个样本结果一致")
+
+
+def test_company_scale_matches_legacy():
+    """测试企业规模标准化与原规则一致"""
+    print("=== 测试企业规模标准化 ===")
+    numbers = ["0", "9", "20", "21", "49", "99", "100", "499", "500", "999", "1000", "9999", "10000", "100000"]
+    samples = ["", "未知", "-", "人", "少于50人", "10000人以上", "50-", "-50", "1.5万人"]
+    samples += [f"{a}{sep}{b}人" for a, b in itertools.product(numbers, repeat=2) for sep in ("-", "~", "至")]
+    samples += [f"{a}人" for a in numbers]
+    for scale_text in samples:
+        assert standardize_company_scale(scale_text) == legacy_standardize_company_scale(scale_text), scale_text
+    print(f"{len(samples)} 个样本结果一致")
+
+
+def test_memoized():
+    """测试相同输入直接返回缓存结果"""
+    print("=== 测试结果缓存 ===")
+    standardize_company_type.cache_clear()
+    for _ in range(50):
+        assert standardize_company_type("民营企业") == "私营企业"
+    info = standardize_company_type.cache_info()
+    assert info.misses == 1 and info.hits == 49
+
+
+if __name__ == "__main__":
+    test_company_type_matches_legacy()
+    test_company_scale_matches_legacy()
+    test_memoized()
+    print("\n所有测试通过")
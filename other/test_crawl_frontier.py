@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+抓取进度测试：模拟一次中断后的续抓，确认已完成的链接不再抓取，
+中断时正在处理的链接恢复为待抓取，失败链接在重试次数用完后不再抓取
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawl_frontier import CrawlFrontier
+from temp_workdir import temp_workdir
+
+
+def test_resume_after_interruption():
+    """测试中断后续抓"""
+    print("=== 测试抓取进度续抓 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'frontier.db')
+
+        # 第一次运行：登记列表页和职位，处理到一半中断
+        frontier = CrawlFrontier(db_path, max_attempts=2)
+        frontier.add("北京", "list", ["https://bj.58.com/hulianwangtx/", "https://bj.58.com/hulianwangtx/pn2/"])
+        jobs = [f"https://bj.58.com/hulianwangtx/{n}x.shtml" for n in range(4)]
+        frontier.add("北京", "job", jobs)
+        frontier.claim(jobs)
+        frontier.mark_done(jobs[:2])
+        frontier.mark_failed(jobs[2], "超时")
+        frontier.close()  # jobs[3] 停留在 in_flight，模拟进程中断
+
+        # 续抓
+        frontier = CrawlFrontier(db_path, max_attempts=2)
+        assert frontier.reset_in_flight() == 1
+        assert frontier.urls("北京", "list") == ["https://bj.58.com/hulianwangtx/", "https://bj.58.com/hulianwangtx/pn2/"]
+        # 重复登记不会改变已有状态
+        frontier.add("北京", "job", jobs)
+        assert [frontier.should_fetch(url) for url in jobs] == [False, False, True, True]
+        print("✓ 已完成的职位被跳过，失败和中断的职位重新抓取")
+
+        frontier.claim([jobs[2]])
+        frontier.mark_failed(jobs[2], "超时")
+        assert not frontier.should_fetch(jobs[2])
+        print("✓ 重试次数用完后不再抓取")
+
+        stats = frontier.stats()
+        assert stats[("job", "done")] == 2 and stats[("job", "failed")] == 1 and stats[("job", "pending")] == 1
+        frontier.close()
+
+
+class UnavailableBrowserPool:
+    """取不到浏览器的会话池，模拟详情页获取时的临时故障"""
+
+    def acquire(self):
+        raise RuntimeError("没有可用的浏览器")
+
+
+def test_fetch_failure_is_retried():
+    """测试详情页获取失败的职位记为失败（续抓时重试），而不是当作空数据标记为已完成"""
+    print("=== 测试详情页获取失败 ===")
+    from enhanced_job_scraper import Enhanced58JobScraper
+
+    with temp_workdir() as tmp:  # 增量日志写在临时目录中
+        frontier = CrawlFrontier(os.path.join(tmp, 'frontier.db'))
+        scraper = Enhanced58JobScraper(http_first=False, frontier=frontier, browser_pool=UnavailableBrowserPool())
+        jobs = [f"https://bj.58.com/hulianwangtx/{n}x.shtml" for n in range(2)]
+        # 列表页已取得，详情页需要浏览器，但取不到浏览器
+        scraper.fetch_list_page = lambda url: "<html></html>"
+        scraper.get_job_links = lambda page_source, url: jobs
+        assert scraper.get_job_list_from_page("https://bj.58.com/hulianwangtx/", city="北京") == []
+        assert all(frontier.should_fetch(url) and not frontier.is_done(url) for url in jobs)
+        print("✓ 获取失败的职位续抓时重试")
+        frontier.close()
+
+
+if __name__ == "__main__":
+    test_resume_after_interruption()
+    test_fetch_failure_is_retried()
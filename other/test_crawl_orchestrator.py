@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多城市并发抓取测试：读取YAML配置生成任务，各城市并发运行且不超过全局浏览器上限，
+共享写入器时职位只在自己的记录落盘后标记完成
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawl_orchestrator import MultiCityOrchestrator, load_crawl_config, build_tasks
+from job_sink import JsonlJobSink
+
+
+class FakeScraper:
+    """每个列表页耗时固定的假爬虫，记录同时运行的数量"""
+
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def __init__(self, task):
+        self.task = task
+
+    def scrape_multiple_pages(self, base_url, max_pages=5, city=None):
+        with FakeScraper.lock:
+            FakeScraper.running += 1
+            FakeScraper.peak = max(FakeScraper.peak, FakeScraper.running)
+        time.sleep(0.2)
+        with FakeScraper.lock:
+            FakeScraper.running -= 1
+        return [{"岗位名称": f"{city}职位{n}"} for n in range(max_pages)]
+
+    def close(self):
+        pass
+
+
+def test_load_config_and_build_tasks():
+    """测试YAML配置覆盖默认值，城市级设置覆盖全局设置，任务按城市轮流排列"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "crawl_config.yaml")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("categories: [hulianwangtx, yunying]\nmax_pages: 3\n"
+                    "cities:\n  北京: bj\n  上海: {code: sh, max_pages: 8, categories: [hulianwangtx]}\n")
+        config = load_crawl_config(path)
+    assert config["max_browsers"] == 7  # 未配置的项使用默认值
+    tasks = build_tasks(config)
+    assert [(t.city, t.category, t.max_pages) for t in tasks] == [
+        ("北京", "hulianwangtx", 3), ("上海", "hulianwangtx", 8), ("北京", "yunying", 3)]
+    assert tasks[0].base_url == "https://bj.58.com/hulianwangtx/"
+    assert load_crawl_config(os.path.join(tempfile.gettempdir(), "missing.yaml"))["cities"]["郑州"] == "zz"
+    print("✓ 配置读取和任务展开正确")
+
+
+def test_cities_run_concurrently_under_ceiling():
+    """测试7个城市并发抓取，总耗时接近单个城市，且同时运行数不超过上限"""
+    tasks = build_tasks(load_crawl_config(None))
+    FakeScraper.peak = 0
+    started = time.monotonic()
+    results = MultiCityOrchestrator(FakeScraper, max_browsers=7).run(tasks)
+    elapsed = time.monotonic() - started
+    assert elapsed < 0.6, elapsed
+    assert FakeScraper.peak == 7
+    assert all(job["抓取城市"] == city for city, jobs in results.items() for job in jobs)
+    assert sum(len(jobs) for jobs in results.values()) == 35
+    print(f"✓ 7个城市并发抓取耗时 {elapsed:.2f} 秒")
+
+    FakeScraper.peak = 0
+    MultiCityOrchestrator(FakeScraper, max_browsers=3).run(tasks)
+    assert FakeScraper.peak == 3
+    print("✓ 同时运行的浏览器数不超过全局上限")
+
+
+def test_shared_sink_commits_flushed_keys():
+    """测试共享写入器只把已落盘记录的键交给回调"""
+    with tempfile.TemporaryDirectory() as tmp:
+        sink = JsonlJobSink(os.path.join(tmp, "jobs.xlsx"), flush_every=2, flush_interval=60)
+        committed = []
+        sink.flush_listeners.append(committed.extend)
+        sink.append({"岗位名称": "a"}, "https://bj.58.com/1x.shtml")
+        assert committed == []
+        sink.append({"岗位名称": "b"}, "https://sh.58.com/2x.shtml")
+        assert committed == ["https://bj.58.com/1x.shtml", "https://sh.58.com/2x.shtml"]
+        sink.append({"岗位名称": "c"})
+        sink.flush()
+        assert len(committed) == 2 and len(sink.read_records()) == 3
+    print("✓ 记录落盘后才标记对应职位完成")
+
+
+if __name__ == "__main__":
+    test_load_config_and_build_tasks()
+    test_cities_run_concurrently_under_ceiling()
+    test_shared_sink_commits_flushed_keys()
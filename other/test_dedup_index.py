@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+职位去重索引测试：同一职位带不同跟踪参数的链接识别为同一个，索引跨运行保留
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dedup_index import extract_job_id, JobDedupIndex
+from temp_workdir import temp_workdir
+
+
+def test_extract_job_id():
+    """测试从职位链接中提取信息ID"""
+    print("=== 测试信息ID提取 ===")
+    cases = [
+        ("https://bj.58.com/hulianwangtx/46000000000001x.shtml?PGTID=0d302408&ClickID=1", "46000000000001"),
+        ("https://sh.58.com/hulianwangtx/46000000000001x.shtml?PGTID=0d000000&ClickID=7#top", "46000000000001"),
+        ("https://jump.zhineng.58.com/jump?target=abc&entinfo=46000000000002_q&psid=1", "46000000000002"),
+        ("https://bj.58.com/job/detail?x=1", "bj.58.com/job/detail"),
+    ]
+    for url, expected in cases:
+        job_id = extract_job_id(url)
+        print(f"{url} -> {job_id}")
+        assert job_id == expected
+
+
+def test_index_persists_across_runs():
+    """测试索引跨运行保留，set和布隆过滤器行为一致"""
+    print("=== 测试去重索引 ===")
+    for bloom in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'job_index.txt')
+            index = JobDedupIndex(path, bloom=bloom)
+            index.add(["https://bj.58.com/hulianwangtx/46000000000001x.shtml?ClickID=1"])
+
+            index = JobDedupIndex(path, bloom=bloom)
+            links = [
+                "https://bj.58.com/hulianwangtx/46000000000001x.shtml?ClickID=9",
+                "https://bj.58.com/hulianwangtx/46000000000003x.shtml?ClickID=2",
+            ]
+            assert index.filter_new(links) == links[1:]
+            assert index.skipped == 1
+            print(f"✓ {'布隆过滤器' if bloom else 'set'}: 已处理职位被跳过")
+
+
+class UnavailableBrowserPool:
+    def acquire(self):
+        raise RuntimeError("没有可用的浏览器")
+
+
+def test_failed_jobs_not_indexed():
+    """测试详情页获取失败的职位不写入索引，之后的运行仍会抓取"""
+    print("=== 测试获取失败的职位 ===")
+    from enhanced_job_scraper import Enhanced58JobScraper
+
+    with temp_workdir() as tmp:  # 增量日志写在临时目录中
+        path = os.path.join(tmp, 'job_index.txt')
+        scraper = Enhanced58JobScraper(http_first=False, dedup_index=JobDedupIndex(path),
+                                       browser_pool=UnavailableBrowserPool())
+        link = "https://bj.58.com/hulianwangtx/46000000000001x.shtml"
+        scraper.fetch_list_page = lambda url: "<html></html>"
+        scraper.get_job_links = lambda page_source, url: [link]
+        scraper.get_job_list_from_page("https://bj.58.com/hulianwangtx/", city="北京")
+        assert not JobDedupIndex(path).seen(link)
+        print("✓ 获取失败的职位没有写入索引")
+
+
+if __name__ == "__main__":
+    test_extract_job_id()
+    test_index_persists_across_runs()
+    test_failed_jobs_not_indexed()
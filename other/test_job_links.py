@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+列表页链接提取测试：一次解析页面源码得到职位链接，列表页职位项目的信息提取
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_extractors import make_soup, extract_job_links, parse_job_list_html
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def test_extract_job_links_from_fixture():
+    """测试从保存的列表页提取链接和列表页信息"""
+    with open(os.path.join(FIXTURE_DIR, 'job_list.html'), 'r', encoding='utf-8') as f:
+        page_source = f.read()
+    links = extract_job_links(make_soup(page_source), "https://bj.58.com/hulianwangtx/")
+    assert [href.split('?')[0] for href in links] == [
+        "https://bj.58.com/hulianwangtx/46000000000001x.shtml",
+        "https://bj.58.com/hulianwangtx/46000000000002x.shtml",
+        "https://bj.58.com/hulianwangtx/46000000000003x.shtml",
+    ]
+    items = parse_job_list_html(page_source)
+    assert items[0]["企业名称"] == "北京中昌软件技术有限公司"
+    assert items[2]["薪资类型"] == "年薪"
+    print(f"✓ 提取到 {len(links)} 个职位链接及列表页信息")
+
+
+def test_span_sibling_links_and_dedup():
+    """测试span.name不在链接内时取相邻链接，同一职位不同跟踪参数只保留一个"""
+    html = """<ul>
+      <li class="job_item"><a href="//bj.58.com/a/1x.shtml?ClickID=1">查看</a><span class="name">职位1</span></li>
+      <li class="job_item"><span class="name">职位2</span><a href="/a/2x.shtml?ClickID=2">查看</a></li>
+      <li class="job_item"><span class="name">职位1</span><a href="/a/1x.shtml?ClickID=3">查看</a></li>
+      <li class="job_item"><span class="name">无链接</span></li>
+    </ul>"""
+    links = extract_job_links(make_soup(html), "https://bj.58.com/hulianwangtx/")
+    assert links == [
+        "https://bj.58.com/a/1x.shtml?ClickID=1",
+        "https://bj.58.com/a/2x.shtml?ClickID=2",
+    ]
+    print("✓ 相邻链接和重复职位处理正确")
+
+
+if __name__ == "__main__":
+    test_extract_job_links_from_fixture()
+    test_span_sibling_links_and_dedup()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+职位仓库测试：重复抓取的职位和企业只更新不重复，空字段不覆盖已有的企业信息，
+按企业删除和按条件查询走索引，导出内容与原记录一致，删除企业时成品、增量日志和仓库同步更新
+"""
+
+import json
+import os
+import runpy
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_warehouse import JobWarehouse, INDEXES, job_key, import_files, RECORD_KEY_PREFIX
+from job_extractors import new_job_data
+from job_sink import JsonlJobSink
+from temp_workdir import temp_workdir
+
+REMOVE_COMPANY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "remove_company.py")
+
+
+def make_job(company, title, location, published="", **fields):
+    job = new_job_data()
+    job.update({"企业名称": company, "岗位名称": title, "工作地点": location, "所属区域": location.split(" - ")[0] + "市",
+                "发布时间": published, "薪资范围起": "6000", "薪资范围至": "9000", "工作职责": "负责销售",
+                "任职要求": "沟通能力强"}, **fields)
+    return job
+
+
+def job_url(job_id):
+    return f"https://bj.58.com/yewu/{job_id}x.shtml?PGTID=abc"
+
+
+def open_warehouse(tmp):
+    return JobWarehouse(os.path.join(tmp, "job_warehouse.db"))
+
+
+def test_schema_and_wal():
+    """测试WAL模式和索引"""
+    print("=== 测试WAL模式和索引 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        warehouse = open_warehouse(tmp)
+        try:
+            assert warehouse.journal_mode == "wal"
+            names = {row[0] for row in warehouse.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+            assert set(INDEXES) <= names
+            plan = " ".join(str(row) for row in warehouse.conn.execute(
+                "EXPLAIN QUERY PLAN DELETE FROM jobs WHERE \"企业名称\" = ?", ("甲公司",)))
+            assert "idx_jobs_company_name" in plan
+        finally:
+            warehouse.close()
+    print("✓ 测试通过")
+
+
+def test_upsert_deduplicates():
+    """测试同一职位、同一企业重复保存时只更新"""
+    print("=== 测试重复保存 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        warehouse = open_warehouse(tmp)
+        try:
+            first = make_job("北京甲公司", "销售代表", "北京 - 朝阳", "2024-05-01",
+                             社会信用码="91110000AAA", 企业规模="20-99人", 联系人="张先生")
+            warehouse.upsert_job(job_url(1001), first, city="北京")
+            first_seen = warehouse.conn.execute("SELECT first_seen FROM jobs").fetchone()[0]
+
+            # 跟踪参数不同的同一职位再次抓取：岗位信息更新，企业页没抓到的字段保留原值
+            again = make_job("北京甲公司", "高级销售代表", "北京 - 朝阳", "2024-05-02", 社会信用码="91110000AAA")
+            warehouse.upsert_job(job_url(1001).replace("abc", "xyz"), again, city="北京")
+            warehouse.upsert_job(job_url(1002), make_job("北京甲公司", "客服", "北京 - 海淀", 社会信用码="91110000AAA"))
+
+            assert warehouse.count() == 2
+            assert warehouse.conn.execute("SELECT COUNT(*) FROM companies").fetchone()[0] == 1
+            records = warehouse.query(include_city=True)
+            assert records[0]["岗位名称"] == "高级销售代表"
+            assert records[0]["发布时间"] == "2024-05-02"
+            assert records[0]["企业规模"] == "20-99人"
+            assert records[0]["联系人"] == "张先生"
+            assert records[1]["抓取城市"] == "北京"  # 未指定城市时取工作地点中的城市
+            assert warehouse.conn.execute(
+                "SELECT first_seen FROM jobs WHERE job_id = ?", (job_key(job_url(1001)),)).fetchone()[0] == first_seen
+        finally:
+            warehouse.close()
+    print("✓ 测试通过")
+
+
+def test_company_without_credit_code():
+    """测试没有社会信用码的企业按名称保存，抓到信用码后合并"""
+    print("=== 测试企业主键 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        warehouse = open_warehouse(tmp)
+        try:
+            warehouse.upsert_job(job_url(2001), make_job("上海乙公司", "文员", "上海 - 浦东"))
+            warehouse.upsert_job(job_url(2002), make_job("上海乙公司", "前台", "上海 - 浦东", 社会信用码="91310000BBB"))
+            warehouse.upsert_job(job_url(2003), make_job("上海乙公司", "会计", "上海 - 浦东"))
+            keys = warehouse.conn.execute("SELECT DISTINCT company_key FROM jobs").fetchall()
+            assert keys == [("91310000BBB",)]
+            assert warehouse.conn.execute("SELECT COUNT(*) FROM companies").fetchone()[0] == 1
+        finally:
+            warehouse.close()
+    print("✓ 测试通过")
+
+
+def test_delete_and_filters():
+    """测试按企业删除和按区域、城市、发布时间查询"""
+    print("=== 测试删除和查询 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        warehouse = open_warehouse(tmp)
+        try:
+            warehouse.upsert_jobs([
+                (job_url(3001), make_job("广东天杰国际人才科技有限公司", "普工", "广州 - 天河", "2024-05-01"), "广州"),
+                (job_url(3002), make_job("广东天杰国际人才科技有限公司", "司机", "深圳 - 南山", "2024-05-02"), "深圳"),
+                (job_url(3003), make_job("广州丙公司", "店员", "广州 - 越秀", "2024-05-03"), "广州"),
+                (job_url(3004), make_job("北京丁公司", "厨师", "北京 - 朝阳", ""), "北京"),
+            ])
+            assert warehouse.count(cities=["广州"]) == 2
+            assert warehouse.count(regions=["北京市"]) == 1
+            assert [r["岗位名称"] for r in warehouse.query(published_from="2024-05-02")] == ["司机", "店员"]
+            assert [r["岗位名称"] for r in warehouse.query(published_to="2024-05-02")] == ["普工", "司机"]
+
+            assert warehouse.delete_company(name="广东天杰国际人才科技有限公司") == 2
+            assert warehouse.count() == 2
+            assert warehouse.count(company="广东天杰国际人才科技有限公司") == 0
+        finally:
+            warehouse.close()
+    print("✓ 测试通过")
+
+
+def test_export_matches_records():
+    """测试导出的JSON与保存的记录一致"""
+    print("=== 测试导出 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        warehouse = open_warehouse(tmp)
+        try:
+            jobs = [make_job("北京甲公司", "销售代表", "北京 - 朝阳", "2024-05-01", 企业类型="民营"),
+                    make_job("上海乙公司", "文员", "上海 - 浦东", "2024-05-02")]
+            warehouse.upsert_jobs([(job_url(4001 + i), job, None) for i, job in enumerate(jobs)])
+            path = os.path.join(tmp, "导出.json")
+            assert warehouse.export(path) == 2
+            with open(path, "r", encoding="utf-8") as f:
+                assert json.load(f) == jobs
+        finally:
+            warehouse.close()
+    print("✓ 测试通过")
+
+
+def test_import_keys_match_crawler():
+    """测试从增量日志导入的职位与爬虫保存的主键相同，成品文件导入的记录被之后抓取的同一职位取代"""
+    print("=== 测试导入主键 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        warehouse = open_warehouse(tmp)
+        try:
+            sink = JsonlJobSink(os.path.join(tmp, "职位.xlsx"))
+            sink.append(make_job("北京甲公司", "销售代表", "北京 - 朝阳"), key=job_url(5001))
+            sink.flush()
+            import_files(warehouse, [sink.journal_filename])
+            warehouse.upsert_job(job_url(5001).replace("abc", "xyz"), make_job("北京甲公司", "销售代表", "北京 - 朝阳"))
+            assert warehouse.count() == 1
+
+            job = make_job("上海乙公司", "文员", "上海 - 浦东")
+            path = os.path.join(tmp, "成品.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump([job], f, ensure_ascii=False)
+            import_files(warehouse, [path])
+            warehouse.upsert_job(job_url(5002), job)
+            keys = [row[0] for row in warehouse.conn.execute("SELECT job_id FROM jobs")]
+            assert len(keys) == 2 and not any(key.startswith(RECORD_KEY_PREFIX) for key in keys)
+        finally:
+            warehouse.close()
+    print("✓ 测试通过")
+
+
+def test_remove_company_rewrites_journal():
+    """测试删除企业时以当前成品为准：重写增量日志，仓库中的旧数据不会写进成品"""
+    print("=== 测试删除企业 ===")
+    argv = sys.argv
+    with temp_workdir() as tmp:
+        try:
+            warehouse = open_warehouse(tmp)
+            warehouse.upsert_job(job_url(6009), make_job("旧公司", "已下线职位", "北京 - 朝阳"))
+            warehouse.close()
+
+            sink = JsonlJobSink("58同城多城市职位详细信息.xlsx")
+            sink.append(make_job("广东天杰国际人才科技有限公司", "普工", "广州 - 天河"), key=job_url(6001))
+            sink.append(make_job("广州丙公司", "店员", "广州 - 越秀"), key=job_url(6002))
+            sink.checkpoint()
+
+            sys.argv = ["remove_company.py"]
+            runpy.run_path(REMOVE_COMPANY, run_name="__main__")
+
+            # 日志、成品中都不再有该企业，之后的checkpoint也不会写回
+            assert [record["岗位名称"] for record in JsonlJobSink("58同城多城市职位详细信息.xlsx").read_records()] == ["店员"]
+            with open("58同城多城市职位详细信息.json", "r", encoding="utf-8") as f:
+                assert [record["岗位名称"] for record in json.load(f)] == ["店员"]
+            warehouse = open_warehouse(tmp)
+            try:
+                assert warehouse.count(company="广东天杰国际人才科技有限公司") == 0
+                assert warehouse.conn.execute(
+                    "SELECT 1 FROM jobs WHERE job_id = ?", (job_key(job_url(6002)),)).fetchone()
+            finally:
+                warehouse.close()
+        finally:
+            sys.argv = argv
+    print("✓ 测试通过")
+
+
+if __name__ == "__main__":
+    test_schema_and_wal()
+    test_upsert_deduplicates()
+    test_company_without_credit_code()
+    test_delete_and_filters()
+    test_export_matches_records()
+    test_import_keys_match_crawler()
+    test_remove_company_rewrites_journal()
+    print("\n所有测试通过")
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+页面就绪等待测试：就绪元素出现即返回，验证码页面和已完全加载的页面不再继续等待，超时不抛异常
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from page_waits import wait_for_page, READY_SELECTORS
+
+
+class FakeDriver:
+    """依次返回预设的页面状态，模拟页面逐步加载"""
+
+    def __init__(self, states):
+        self.states = list(states)
+        self.calls = []
+
+    def execute_script(self, script, selector, markers):
+        self.calls.append(selector)
+        return self.states.pop(0) if len(self.states) > 1 else self.states[0]
+
+
+def test_returns_when_ready():
+    """测试就绪元素出现后立即返回，并按页面类型使用对应的选择器"""
+    driver = FakeDriver([None, None, "ready"])
+    assert wait_for_page(driver, "detail", timeout=2, poll_interval=0.01) == "ready"
+    assert len(driver.calls) == 3
+    assert driver.calls[0] == READY_SELECTORS["detail"]
+    print("✓ 就绪元素出现即返回")
+
+
+def test_captcha_and_complete_pages_stop_waiting():
+    """测试验证码页面和已完全加载的页面立即返回"""
+    assert wait_for_page(FakeDriver(["captcha"]), "list", timeout=2) == "captcha"
+    assert wait_for_page(FakeDriver(["complete"]), "company", timeout=2) == "complete"
+    print("✓ 验证码页面和已完全加载的页面不再等待")
+
+
+def test_timeout_returns_none():
+    """测试超时返回None而不是抛出异常"""
+    started = time.monotonic()
+    assert wait_for_page(FakeDriver([None]), "detail", timeout=0.2, poll_interval=0.05) is None
+    assert time.monotonic() - started < 1
+    print("✓ 超时返回None")
+
+
+if __name__ == "__main__":
+    test_returns_when_ready()
+    test_captcha_and_complete_pages_stop_waiting()
+    test_timeout_returns_none()
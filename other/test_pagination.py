@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分页规划测试：从分页区域读取后续页链接，读不到时按 /pnN/ 生成，并能识别最后一页；
+列表页的职位链接和分页区域共用一次解析
+"""
+
+import os
+import sys
+from functools import partial
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pagination
+import enhanced_job_scraper
+from pagination import page_url, parse_pager, PaginationPlanner
+from job_extractors import make_soup
+
+BASE_URL = "https://bj.58.com/hulianwangtx/"
+
+
+def pager_html(links, current=None):
+    items = ''.join(f'<a href="{href}"><span>{text}</span></a>' for text, href in links)
+    strong = f'<strong><span>{current}</span></strong>' if current else ''
+    return f'<html><body><ul><li class="job_item">职位</li></ul><div class="pagesout">{strong}{items}</div></body></html>'
+
+
+def test_page_url():
+    """测试 /pnN/ 链接生成"""
+    assert page_url(BASE_URL, 1) == BASE_URL
+    assert page_url(BASE_URL, 3) == "https://bj.58.com/hulianwangtx/pn3/"
+    assert page_url("https://bj.58.com/hulianwangtx/pn2/?pid=1&PGTID=x", 4) == "https://bj.58.com/hulianwangtx/pn4/"
+    print("✓ /pnN/ 链接生成正确")
+
+
+def test_planner_uses_pager_links_and_stops_at_last_page():
+    """测试使用分页区域中的真实链接，并在最后一页停止"""
+    planner = PaginationPlanner(BASE_URL, max_pages=5)
+    visited = []
+    pages = {
+        1: pager_html([("2", "/hulianwangtx/pn2/?pid=111"), ("3", "/hulianwangtx/pn3/?pid=111"), ("下一页", "/hulianwangtx/pn2/?pid=111")], 1),
+        2: pager_html([("1", "/hulianwangtx/"), ("3", "/hulianwangtx/pn3/?pid=222"), ("下一页", "/hulianwangtx/pn3/?pid=222")], 2),
+        3: pager_html([("1", "/hulianwangtx/"), ("2", "/hulianwangtx/pn2/?pid=333")], 3),
+    }
+    for page_num, url, page_key in planner:
+        visited.append((url, page_key))
+        planner.observe(page_num, pages[page_num])
+
+    assert visited == [
+        (BASE_URL, BASE_URL),
+        ("https://bj.58.com/hulianwangtx/pn2/?pid=111", "https://bj.58.com/hulianwangtx/pn2/"),
+        ("https://bj.58.com/hulianwangtx/pn3/?pid=222", "https://bj.58.com/hulianwangtx/pn3/"),
+    ]
+    assert planner.last_page == 3
+    print("✓ 使用分页区域中的链接，第3页后停止")
+
+
+def test_planner_without_pager():
+    """测试没有分页区域时按规则生成，遇到空页停止"""
+    planner = PaginationPlanner(BASE_URL, max_pages=5)
+    visited = []
+    for page_num, url, _ in planner:
+        visited.append(url)
+        planner.observe(page_num, '<html><body></body></html>', job_count=0 if page_num == 3 else 10)
+    assert visited == [BASE_URL, page_url(BASE_URL, 2), page_url(BASE_URL, 3)]
+    assert planner.last_page == 2
+    assert parse_pager('<html><body></body></html>') == (None, False)
+    print("✓ 没有分页区域时按 /pnN/ 生成，空页后停止")
+
+
+def test_list_page_parsed_once():
+    """测试抓取列表页时职位链接和分页区域从同一个soup读取"""
+    parsed = []
+
+    def counting_make_soup(page_source, parser=None):
+        if isinstance(page_source, str):
+            parsed.append(page_source)
+        return make_soup(page_source, parser)
+
+    page = pager_html([("2", "/hulianwangtx/pn2/?pid=111"), ("下一页", "/hulianwangtx/pn2/?pid=111")], 1)
+    scraper = enhanced_job_scraper.Enhanced58JobScraper(http_first=False)
+    scraper.fetch_list_page = lambda url: page
+    planner = PaginationPlanner(BASE_URL, max_pages=5)
+    originals = enhanced_job_scraper.make_soup, pagination.make_soup
+    enhanced_job_scraper.make_soup = pagination.make_soup = counting_make_soup
+    try:
+        assert scraper.get_job_list_from_page(BASE_URL, pager=partial(planner.observe, 1)) == []
+    finally:
+        enhanced_job_scraper.make_soup, pagination.make_soup = originals
+    assert len(parsed) == 1
+    assert planner.page_links[2] == "https://bj.58.com/hulianwangtx/pn2/?pid=111"
+    print("✓ 列表页只解析一次")
+
+
+if __name__ == "__main__":
+    test_page_url()
+    test_planner_uses_pager_links_and_stops_at_last_page()
+    test_planner_without_pager()
+    test_list_page_parsed_once()
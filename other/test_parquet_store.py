@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parquet存储测试：记录按城市和日期分区写入，查询只返回满足条件的职位，导出内容与原记录一致
+（需要pyarrow，未安装时跳过存储相关的测试）
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parquet_store
+from parquet_store import records_to_columns, record_city, to_integer
+from job_extractors import new_job_data
+
+
+def make_job(company, location, salary_from="", salary_to="", published="", **fields):
+    job = new_job_data()
+    job.update({"企业名称": company, "工作地点": location, "薪资范围起": salary_from, "薪资范围至": salary_to,
+                "发布时间": published, "招聘人数": 1, "学历要求": "本科"}, **fields)
+    return job
+
+
+def sample_jobs():
+    return [
+        make_job("北京甲公司", "北京 - 朝阳", "6000", "9000", "2024-05-01"),
+        make_job("北京乙公司", "北京 - 海淀", "12000", "18000", "2024-05-03"),
+        make_job("上海丙公司", "上海 - 浦东", "", "", ""),
+        make_job("广州丁公司", "广州 - 天河", 8000.0, 10000.0, "2024-05-02", 抓取城市="广州"),
+    ]
+
+
+def test_record_conversion():
+    """测试记录转为按列数据：数字列、城市推断"""
+    print("=== 测试记录转换 ===")
+    assert to_integer("3000") == 3000
+    assert to_integer(3000.0) == 3000
+    assert to_integer("") is None
+    assert to_integer(float("nan")) is None
+    assert record_city({"抓取城市": "深圳", "工作地点": "北京 - 朝阳"}) == "深圳"
+    assert record_city({"工作地点": "北京 - 朝阳"}) == "北京"
+    assert record_city({"工作地点": "北京 - 朝阳"}, city="上海") == "上海"
+    assert record_city({}) == "未知"
+    columns = records_to_columns(sample_jobs(), crawl_date="2024-05-04")
+    assert columns["薪资范围起"] == [6000, 12000, None, 8000]
+    assert columns["抓取城市"] == ["北京", "北京", "上海", "广州"]
+    assert set(columns["抓取日期"]) == {"2024-05-04"}
+
+
+def test_scan_filters():
+    """测试按列读取和过滤条件"""
+    pytest.importorskip("pyarrow")
+    print("=== 测试查询 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = parquet_store.ParquetJobStore(os.path.join(tmp, "store"))
+        assert store.scan().num_rows == 0
+        assert store.append(sample_jobs(), crawl_date="2024-05-04") == 4
+        store.append([make_job("北京戊公司", "北京 - 东城", "5000", "7000")], crawl_date="2024-05-05")
+
+        table = store.scan(columns=["企业名称", "抓取城市"], cities=["北京"])
+        assert table.column_names == ["企业名称", "抓取城市"]
+        assert sorted(table["企业名称"].to_pylist()) == ["北京乙公司", "北京戊公司", "北京甲公司"]
+        assert store.scan(cities=["北京"], date_to="2024-05-04").num_rows == 2
+        # 薪资范围与 [10000, 15000] 有交集
+        companies = store.scan(columns=["企业名称"], salary_min=10000, salary_max=15000)["企业名称"].to_pylist()
+        assert sorted(companies) == ["北京乙公司", "广州丁公司"]
+        companies = store.scan(columns=["企业名称"], published_from="2024-05-02", published_to="2024-05-03")
+        assert sorted(companies["企业名称"].to_pylist()) == ["北京乙公司", "广州丁公司"]
+
+
+def test_replace_and_export():
+    """测试替换当天分区，以及导出为原来的JSON格式"""
+    pytest.importorskip("pyarrow")
+    print("=== 测试替换和导出 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = parquet_store.ParquetJobStore(os.path.join(tmp, "store"))
+        jobs = sample_jobs()
+        store.append(jobs, crawl_date="2024-05-04")
+        store.append(jobs, crawl_date="2024-05-04", replace=True)
+        assert store.scan().num_rows == 4
+
+        path = os.path.join(tmp, "jobs.json")
+        assert store.export(path, cities=["北京"]) == 2
+        with open(path, "r", encoding="utf-8") as f:
+            exported = sorted(json.load(f), key=lambda job: job["企业名称"])
+        expected = sorted(jobs[:2], key=lambda job: job["企业名称"])
+        assert exported == expected
+
+
+if __name__ == "__main__":
+    test_record_conversion()
+    if parquet_store.pa is not None:
+        test_scan_filters()
+        test_replace_and_export()
+    else:
+        print("未安装pyarrow，跳过存储测试")
+    print("\n所有测试通过")
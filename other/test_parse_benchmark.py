@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+解析基准测试：离线回放保存的页面样本（other/fixtures 或 --record-fixtures 录制的目录），
+统计解析吞吐量（页/秒）、单页耗时p50/p99和每页内存分配，并与golden结果比对，
+保证性能优化不改变提取结果。
+
+用法:
+    python other/test_parse_benchmark.py                      # 基准测试 + golden比对
+    python other/test_parse_benchmark.py --dir 录制目录 --rounds 5
+    python other/test_parse_benchmark.py --update-golden      # 解析结果有意变化后更新golden
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixture_recorder import load_fixtures
+from job_extractors import (
+    available_parsers, parse_job_detail_html, parse_company_detail_html, parse_job_list_html
+)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def parse_fixture(kind, page_source, parser=None):
+    """按页面类型调用对应的解析函数，返回可JSON序列化的结果"""
+    if kind == 'detail':
+        job_data, company_url = parse_job_detail_html(page_source, parser)
+        return {"job_data": job_data, "company_url": company_url}
+    if kind == 'company':
+        return {"company_data": parse_company_detail_html(page_source, parser)}
+    if kind == 'list':
+        return {"items": parse_job_list_html(page_source, parser)}
+    raise ValueError(f"未知的页面类型: {kind}")
+
+
+def golden_filename(directory):
+    return os.path.join(directory, 'golden.json')
+
+
+def parse_all(fixtures, parser=None):
+    return {entry['file']: parse_fixture(entry['kind'], page_source, parser) for entry, page_source in fixtures}
+
+
+def diff_golden(results, golden):
+    """逐页比对解析结果与golden，返回差异描述列表"""
+    diffs = []
+    for name, result in results.items():
+        expected = golden.get(name)
+        if expected is None:
+            diffs.append(f"{name}: golden中没有该样本")
+        elif expected != result:
+            diffs.append(f"{name}: 解析结果与golden不一致\n  期望: {expected}\n  实际: {result}")
+    return diffs
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def benchmark(fixtures, parser=None, rounds=3):
+    """回放所有样本rounds轮，返回吞吐量、耗时分位数和每页内存分配"""
+    timings = []
+    for _ in range(rounds):
+        for entry, page_source in fixtures:
+            start = time.perf_counter()
+            parse_fixture(entry['kind'], page_source, parser)
+            timings.append(time.perf_counter() - start)
+
+    # 内存分配单独统计一轮，避免tracemalloc拖慢计时
+    tracemalloc.start()
+    for entry, page_source in fixtures:
+        parse_fixture(entry['kind'], page_source, parser)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = sum(timings)
+    return {
+        "pages": len(timings),
+        "pages_per_sec": len(timings) / total if total else 0,
+        "p50_ms": percentile(timings, 50) * 1000,
+        "p99_ms": percentile(timings, 99) * 1000,
+        "peak_kb_per_page": peak / 1024 / max(len(fixtures), 1),
+    }
+
+
+def test_parse_golden():
+    """测试样本的解析结果与golden一致"""
+    fixtures = load_fixtures(FIXTURE_DIR)
+    assert fixtures
+    with open(golden_filename(FIXTURE_DIR), 'r', encoding='utf-8') as f:
+        golden = json.load(f)
+    for parser in available_parsers():
+        diffs = diff_golden(parse_all(fixtures, parser), golden)
+        for diff in diffs:
+            print(f"✗ [{parser}] {diff}")
+        assert not diffs
+    print("✓ 解析结果与golden一致")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="解析吞吐量基准测试与golden比对")
+    arg_parser.add_argument("--dir", default=FIXTURE_DIR, help="样本目录（包含index.jsonl）")
+    arg_parser.add_argument("--rounds", type=int, default=20, help="回放轮数")
+    arg_parser.add_argument("--update-golden", action="store_true", help="用当前解析结果覆盖golden")
+    args = arg_parser.parse_args()
+
+    fixtures = load_fixtures(args.dir)
+    if not fixtures:
+        print(f"样本目录 {args.dir} 中没有样本")
+        return 1
+    print(f"=== 解析基准测试：{len(fixtures)} 个样本，{args.rounds} 轮 ===")
+
+    for parser in available_parsers():
+        stats = benchmark(fixtures, parser, args.rounds)
+        print(f"  {parser}: {stats['pages_per_sec']:.1f} 页/秒, p50 {stats['p50_ms']:.2f}ms, "
+              f"p99 {stats['p99_ms']:.2f}ms, 峰值内存 {stats['peak_kb_per_page']:.1f}KB/页")
+
+    results = parse_all(fixtures)
+    if args.update_golden:
+        with open(golden_filename(args.dir), 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"✓ 已更新 {golden_filename(args.dir)}")
+        return 0
+
+    if not os.path.exists(golden_filename(args.dir)):
+        print("没有golden文件，请先使用 --update-golden 生成")
+        return 1
+    with open(golden_filename(args.dir), 'r', encoding='utf-8') as f:
+        diffs = diff_golden(results, json.load(f))
+    for diff in diffs:
+        print(f"✗ {diff}")
+    if diffs:
+        return 1
+    print("✓ 解析结果与golden一致")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
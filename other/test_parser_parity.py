@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+解析后端一致性测试：同一份保存的HTML在各个解析后端下提取出的job_data必须完全相同
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_extractors import (
+    available_parsers, make_soup, new_job_data, new_company_data,
+    extract_job_detail, extract_company_detail
+)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def parse_with(parser):
+    """用指定解析后端解析职位页和企业页，按爬虫的合并方式得到最终job_data"""
+    job_data = new_job_data()
+    company_url = extract_job_detail(make_soup(read_fixture('job_detail.html'), parser), job_data)
+
+    company_data = new_company_data()
+    extract_company_detail(make_soup(read_fixture('company_detail.html'), parser), company_data)
+    for key, value in company_data.items():
+        if value:  # 只更新非空值
+            job_data[key] = value
+    return company_url, job_data
+
+
+def test_parser_parity():
+    """测试所有可用解析后端的提取结果一致"""
+    print("=== 测试解析后端一致性 ===")
+    parsers = available_parsers()
+    print(f"可用解析后端: {parsers}")
+
+    results = {parser: parse_with(parser) for parser in parsers}
+    baseline_parser = parsers[-1]
+    baseline = results[baseline_parser]
+
+    for parser, result in results.items():
+        diff = {key: (baseline[1][key], result[1][key]) for key in baseline[1] if baseline[1][key] != result[1][key]}
+        if result[0] != baseline[0]:
+            diff['企业链接'] = (baseline[0], result[0])
+        if diff:
+            print(f"✗ {parser} 与 {baseline_parser} 不一致: {diff}")
+        else:
+            print(f"✓ {parser} 与 {baseline_parser} 一致")
+        assert not diff
+
+    # 确认关键字段确实被提取出来，避免所有后端都提取为空也算一致
+    company_url, job_data = baseline
+    assert company_url == 'https://qy.58.com/mq/12345678901234/'
+    assert job_data['岗位名称'] == 'Python开发工程师'
+    assert job_data['企业名称'] == '北京中昌软件技术有限公司'
+    assert job_data['社会信用码'] == '91110101095807770R'
+    assert job_data['工作职责'] and job_data['任职要求']
+    print("✓ 关键字段提取正常")
+
+
+if __name__ == "__main__":
+    test_parser_parity()
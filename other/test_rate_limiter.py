@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+访问频率控制测试：令牌桶限速、成功时加性增、验证码时乘性减并暂停，
+HTTP失败回退到浏览器时一次页面获取只取一个令牌
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rate_limiter import AdaptiveRateLimiter
+from enhanced_job_scraper import Enhanced58JobScraper
+
+URL = "https://bj.58.com/hulianwangtx/46000000000001x.shtml"
+
+
+class FakeClock:
+    """手动推进的时钟：sleep只推进时间，不真的等待"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def make_limiter(**kwargs):
+    clock = FakeClock()
+    return AdaptiveRateLimiter(clock=clock, sleep=clock.sleep, **kwargs), clock
+
+
+def test_token_bucket_paces_requests():
+    """测试令牌用完后按速率等待，不同域名互不影响"""
+    limiter, clock = make_limiter(rate=20.0, burst=1)
+    start = clock()
+    for _ in range(3):
+        limiter.wait(URL)
+    elapsed = clock() - start
+    assert abs(elapsed - 0.1) < 1e-9, elapsed  # 第一次用掉初始令牌，之后每次等待1/20秒
+    assert limiter.wait("https://qy.58.com/mq/1/") == 0
+    print(f"✓ 3次请求耗时 {elapsed:.2f} 秒")
+
+
+def test_aimd():
+    """测试成功时速率线性增加，验证码时减半并暂停"""
+    limiter, clock = make_limiter(rate=2.0, max_rate=2.2, increase=0.1, decrease=0.5, cooldown=0.1)
+    for _ in range(5):
+        limiter.record_success(URL)
+    assert limiter.metrics()["bj.58.com"]["rate"] == 2.2
+
+    limiter.record_captcha(URL)
+    metrics = limiter.metrics()["bj.58.com"]
+    assert metrics["rate"] == 1.1 and metrics["captchas"] == 1
+    # 令牌清空后按1.1次/秒恢复，暂停期(0.1秒)比一个间隔短，第一个令牌在验证码后1/1.1秒到
+    assert abs(limiter.wait(URL) - 1 / 1.1) < 1e-9
+    # 暂停期比一个间隔长时，至少等到暂停结束
+    limiter.cooldown = 5.0
+    limiter.record_captcha(URL)
+    assert abs(limiter.wait(URL) - 5.0) < 1e-9
+    print("✓ 加性增、乘性减和验证码后暂停正常")
+
+
+class FailingFetcher:
+    """HTTP请求总是失败的获取器"""
+
+    last_result = "error"
+
+    def fetch(self, url, kind):
+        return None
+
+
+class UnavailableBrowserPool:
+    """取不到浏览器的会话池，回退到浏览器时在打开页面之前失败"""
+
+    def acquire(self):
+        raise RuntimeError("没有可用的浏览器")
+
+
+def test_browser_fallback_takes_one_token():
+    """测试HTTP失败回退到浏览器时不再重复取令牌"""
+    limiter, clock = make_limiter()
+    scraper = Enhanced58JobScraper(http_first=False, rate_limiter=limiter, browser_pool=UnavailableBrowserPool())
+    scraper.fetcher = FailingFetcher()
+    try:
+        scraper.fetch_page_source(URL, "detail")
+    except RuntimeError:
+        pass
+    assert limiter.metrics()["bj.58.com"]["requests"] == 1
+    print("✓ 回退到浏览器只取一个令牌")
+
+
+if __name__ == "__main__":
+    test_token_bucket_paces_requests()
+    test_aimd()
+    test_browser_fallback_takes_one_token()
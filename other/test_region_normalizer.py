@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+所属区域标准化测试：与爬虫原有的修复规则结果一致，标准结果再次处理保持不变，相同输入命中缓存
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from region_normalizer import RegionNormalizer, normalize, resolve
+
+
+def test_normalize_cases():
+    """测试各种所属区域格式的标准化结果"""
+    print("=== 测试所属区域标准化 ===")
+    cases = [
+        ("北京朝阳区", "北京市朝阳区"),
+        ("广州天河区", "广东省广州市"),
+        ("总部位于广州天河区", "广东省广州市"),
+        ("广东省广州市天河区", "广东省广州市"),
+        ("四川省成都市武侯区", "四川省成都市"),
+        ("成都高新区", "四川省成都市"),
+        ("西安市雁塔区", "陕西省西安市"),
+        ("广州市天河区", "广东省广州市"),
+        ("成都软件园", "四川省成都市"),
+        ("广州市", "广州市"),
+        ("广东省广州市", "广东省广州市"),
+        ("北京市房山区", "北京市房山区"),
+        # 没有"市"字时只接受地名表中的城市，不把区名的前几个字当作城市
+        ("江苏省苏州工业园区", "江苏省苏州市"),
+        ("湖北省武汉东西湖区", "湖北省武汉市"),
+        ("广东省广州浦东新区", "广东省广州市"),
+        ("江苏省连云港海州区", "江苏省连云港市"),
+        ("湖北省某某东西湖区", ""),
+        ("上海", ""),
+        ("公司福利好，交通便利", ""),
+        ("华南地区", ""),
+        ("注册地址广州天河区", ""),
+        ("", ""),
+        (None, ""),
+    ]
+    for region, expected in cases:
+        result = normalize(region)
+        print(f"{region} -> {result}")
+        assert result == expected, (region, result, expected)
+
+
+def test_work_location_fallback():
+    """测试所属区域为空时用工作地点补充"""
+    print("=== 测试工作地点补充 ===")
+    assert normalize("", "北京 - 大兴") == "北京市大兴区"
+    assert normalize("  ", "广州-天河") == "广东省广州市"
+    # 所属区域不为空时忽略工作地点
+    assert normalize("西安雁塔区", "北京 - 大兴") == "陕西省西安市"
+    region, notes = resolve("", "西安 - 雁塔区")
+    print(region, notes)
+    assert region == "陕西省西安市"
+    assert notes[0] == "✓ 所属区域已从工作地点补充: 西安 - 雁塔区 -> 西安雁塔区"
+
+
+def test_idempotent():
+    """测试标准化的结果再次处理保持不变"""
+    print("=== 测试重复清理 ===")
+    for region in ["北京朝阳区", "广州天河区", "成都高新区", "广东省深圳市南山区", "重庆渝中区", "乌鲁木齐高新区"]:
+        once = normalize(region)
+        assert once
+        assert normalize(once) == once, (region, once)
+
+
+def test_memoized():
+    """测试相同输入直接返回缓存结果"""
+    print("=== 测试结果缓存 ===")
+    normalizer = RegionNormalizer(cache_size=16)
+    for _ in range(100):
+        assert normalizer.normalize("广州天河区") == "广东省广州市"
+    # 所属区域不为空时工作地点不参与缓存键
+    normalizer.normalize("广州天河区", "北京 - 大兴")
+    info = normalizer.cache_info()
+    print(info)
+    assert info.misses == 1
+    assert info.hits == 100
+
+
+if __name__ == "__main__":
+    test_normalize_cases()
+    test_work_location_fallback()
+    test_idempotent()
+    test_memoized()
+    print("\n所有测试通过")
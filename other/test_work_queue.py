@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分布式任务队列测试：租约、心跳续租、过期租约重新分配、失败重试，以及结果交给唯一写入者
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from work_queue import WorkQueue, LIST_QUEUE, JOB_QUEUE, DONE, FAILED
+from dedup_index import JobDedupIndex
+from job_extractors import new_job_data
+from job_sink import JsonlJobSink
+from temp_workdir import temp_workdir
+
+
+class FakeClock:
+    """手动推进的时钟，测试租约过期不需要真的等待"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lease_heartbeat_and_redelivery():
+    """测试两个工作进程不会领到同一个任务，过期租约重新分配，续租的任务不会被抢走"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "work_queue.db")
+        clock = FakeClock()
+        node_a = WorkQueue(path, lease_seconds=30, clock=clock)
+        node_b = WorkQueue(path, lease_seconds=30, clock=clock)
+        # 同一职位带不同跟踪参数只登记一次
+        assert node_a.put(JOB_QUEUE, ["https://bj.58.com/a/1x.shtml?ClickID=1", "https://bj.58.com/a/1x.shtml?ClickID=2",
+                                      "https://bj.58.com/a/2x.shtml"], "北京") == 2
+
+        task_a = node_a.lease(JOB_QUEUE, "a")[0]
+        task_b = node_b.lease(JOB_QUEUE, "b")[0]
+        assert task_a.url != task_b.url
+        assert node_b.lease(JOB_QUEUE, "b") == []
+        print("✓ 不同工作进程领取不同的任务")
+
+        # a 续租，b 失联
+        clock.now += 20
+        assert node_a.heartbeat("a", [task_a.id]) == 1
+        clock.now += 20
+        redelivered = node_a.lease(JOB_QUEUE, "c")
+        assert [task.id for task in redelivered] == [task_b.id] and redelivered[0].attempts == 2
+        print("✓ 过期租约重新分配，续租的任务保留")
+
+        # b 恢复后提交的结果被丢弃，c 的结果被接受
+        assert not node_b.complete(task_b, "b", [{"岗位名称": "旧结果"}])
+        assert node_a.complete(redelivered[0], "c", [{"岗位名称": "新结果"}])
+        assert node_a.complete(task_a, "a", [{"岗位名称": "职位1"}])
+        results = node_a.results()
+        assert [data["岗位名称"] for _, _, data in results] == ["新结果", "职位1"]
+        assert not node_a.is_drained()
+        node_a.ack_results([result_id for result_id, _, _ in results])
+        assert node_a.is_drained()
+        assert node_a.stats() == {(JOB_QUEUE, DONE): 2}
+        print("✓ 失效租约的结果不提交，结果交给写入者后队列处理完毕")
+        node_a.close()
+        node_b.close()
+
+
+def test_failed_tasks_retry_until_exhausted():
+    """测试失败的任务放回队列，尝试次数用完后记为失败"""
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = WorkQueue(os.path.join(tmp, "work_queue.db"), max_attempts=2)
+        queue.put(LIST_QUEUE, ["https://bj.58.com/hulianwangtx/"], "北京")
+        for _ in range(2):
+            task = queue.lease(LIST_QUEUE, "a")[0]
+            queue.fail(task, "a", "验证码")
+        assert queue.lease(LIST_QUEUE, "a") == []
+        assert queue.stats() == {(LIST_QUEUE, FAILED): 1}
+        assert queue.is_drained()
+        print("✓ 失败任务重试，次数用完后记为失败")
+        queue.close()
+
+
+def test_expired_exhausted_lease_marked_failed():
+    """测试尝试次数用完、租约又过期的任务记为失败，队列可以处理完"""
+    with tempfile.TemporaryDirectory() as tmp:
+        clock = FakeClock()
+        queue = WorkQueue(os.path.join(tmp, "work_queue.db"), lease_seconds=10, max_attempts=1, clock=clock)
+        queue.put(JOB_QUEUE, ["https://bj.58.com/a/1x.shtml"], "北京")
+        assert len(queue.lease(JOB_QUEUE, "a")) == 1  # 工作进程领取后失联
+        assert not queue.is_drained()
+        clock.now += 11
+        assert queue.is_drained()
+        assert queue.lease(JOB_QUEUE, "b") == []
+        assert queue.stats() == {(JOB_QUEUE, FAILED): 1}
+        print("✓ 尝试次数用完的过期任务记为失败")
+        queue.close()
+
+
+class ListPageScraper:
+    """只返回固定职位链接的列表页抓取，测试登记前的去重"""
+
+    def __init__(self, job_links, dedup_index):
+        self.job_links = job_links
+        self.dedup_index = dedup_index
+
+    def fetch_list_page(self, url):
+        return "<html></html>"
+
+    def get_job_links(self, page_source, url):
+        return self.job_links
+
+    def scrape_job_detail_page(self, url):
+        return new_job_data()
+
+
+def test_worker_skips_indexed_jobs():
+    """测试工作进程登记职位前跳过索引中已处理的职位，没有解析出内容的职位按失败处理"""
+    from distributed_crawl import process_task
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = os.path.join(tmp, "job_index.txt")
+        JobDedupIndex(index_path).add(["https://bj.58.com/a/1x.shtml"])
+        queue = WorkQueue(os.path.join(tmp, "work_queue.db"))
+        scraper = ListPageScraper(["https://bj.58.com/a/1x.shtml?ClickID=3", "https://bj.58.com/a/2x.shtml"],
+                                  JobDedupIndex(index_path))
+        queue.put(LIST_QUEUE, ["https://bj.58.com/a/"], "北京")
+        assert process_task(scraper, queue, queue.lease(LIST_QUEUE, "a")[0]) == []
+        tasks = queue.lease(JOB_QUEUE, "a", 5)
+        assert [task.url for task in tasks] == ["https://bj.58.com/a/2x.shtml"]
+        print("✓ 已处理的职位不再登记")
+
+        try:
+            process_task(scraper, queue, tasks[0])
+            assert False, "空数据应按失败处理"
+        except ValueError:
+            print("✓ 没有解析出内容的职位按失败处理")
+        queue.close()
+
+
+def test_coordinator_does_not_index_empty_results():
+    """测试协调进程收到没有内容的结果时不保存，也不写入职位索引"""
+    from enhanced_job_scraper import Enhanced58JobScraper
+
+    with temp_workdir() as tmp:  # 增量日志写在临时目录中
+        index_path = os.path.join(tmp, "job_index.txt")
+        scraper = Enhanced58JobScraper(http_first=False, dedup_index=JobDedupIndex(index_path))
+        url = "https://bj.58.com/a/1x.shtml"
+        assert not scraper.save_job_result(url, new_job_data(), "输出.xlsx")
+        scraper.get_sink("输出.xlsx").flush()
+        assert not JobDedupIndex(index_path).seen(url)
+        print("✓ 空结果不写入职位索引")
+
+
+class TrainingAdScraper(ListPageScraper):
+    """详情页被过滤为培训广告的抓取"""
+
+    def scrape_job_detail_page(self, url):
+        return None
+
+
+def test_skipped_jobs_marked_processed():
+    """测试被过滤的职位交给写入者后标记为已处理，增量抓取时不再登记"""
+    from distributed_crawl import process_task, save_result
+    from enhanced_job_scraper import Enhanced58JobScraper
+
+    with temp_workdir() as tmp:  # 增量日志写在临时目录中
+        index_path = os.path.join(tmp, "job_index.txt")
+        queue = WorkQueue(os.path.join(tmp, "work_queue.db"))
+        url = "https://bj.58.com/a/1x.shtml"
+        queue.put(JOB_QUEUE, [url], "北京")
+        task = queue.lease(JOB_QUEUE, "a")[0]
+        assert queue.complete(task, "a", process_task(TrainingAdScraper([], None), queue, task))
+
+        scraper = Enhanced58JobScraper(http_first=False, dedup_index=JobDedupIndex(index_path))
+        for _, result_url, job_data in queue.results():
+            assert not save_result(scraper, result_url, job_data)
+        scraper.close()
+        assert JobDedupIndex(index_path).seen(url)
+        assert JsonlJobSink("58同城多城市职位详细信息.xlsx").read_records() == []
+        queue.close()
+    print("✓ 被过滤的职位标记为已处理，不写入输出")
+
+
+if __name__ == "__main__":
+    test_lease_heartbeat_and_redelivery()
+    test_failed_tasks_retry_until_exhausted()
+    test_expired_exhausted_lease_marked_failed()
+    test_worker_skips_indexed_jobs()
+    test_coordinator_does_not_index_empty_results()
+    test_skipped_jobs_marked_processed()
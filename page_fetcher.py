@@ -0,0 +1,99 @@
+import re
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 与Chrome选项中设置的UA保持一致
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# 验证码页面的特征文本
+CAPTCHA_MARKERS = ("访问过于频繁，本次访问做以下验证码校验", "验证码校验")
+
+# 各类页面必须包含的class标记，缺少时说明拿到的不是完整页面（如JS跳转页），需要浏览器兜底
+PAGE_MARKERS = {
+    "detail": re.compile(r'class=["\'][^"\']*\b(?:pos_title|des)\b'),
+    "company": re.compile(r'class=["\'][^"\']*\b(?:c_detail_item|introduction|baseInfo)\b'),
+}
+
+
+# HTTP请求头，与浏览器保持一致
+DEFAULT_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Encoding": "gzip, deflate",
+    "Accept-Language": "zh-CN,zh;q=0.9",
+    "Connection": "keep-alive",
+}
+
+
+def is_captcha_page(page_source):
+    """判断页面是否为验证码页面"""
+    return any(marker in page_source for marker in CAPTCHA_MARKERS)
+
+
+def classify_page(page_source, kind):
+    """判断HTTP直接获取的页面是否可用：ok / captcha / incomplete（缺少该类页面的标记）"""
+    if is_captcha_page(page_source):
+        return "captcha"
+    marker = PAGE_MARKERS.get(kind)
+    if marker and not marker.search(page_source):
+        return "incomplete"
+    return "ok"
+
+
+class HttpPageFetcher:
+    """基于requests.Session的轻量页面获取层
+
+    使用连接池和keep-alive直接GET页面；遇到验证码页面或缺少预期标记时返回None，
+    由调用方回退到浏览器。stats记录每类页面分别由HTTP和浏览器提供了多少次。
+    """
+
+    def __init__(self, timeout=8, pool_size=10):
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(DEFAULT_HEADERS)
+        self.stats = {}
+        self.last_result = None  # 最近一次fetch的结果：ok/captcha/incomplete/error
+
+    def fetch(self, url, kind):
+        """GET页面，成功返回HTML，需要浏览器兜底时返回None"""
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            logging.info(f"HTTP获取页面失败，改用浏览器: {e}")
+            self.last_result = "error"
+            return None
+
+        if response.status_code != 200:
+            self.last_result = "error"
+            return None
+        # 响应头未声明编码时requests会按ISO-8859-1解码，58页面统一为UTF-8
+        if 'charset' not in response.headers.get('Content-Type', '').lower():
+            response.encoding = 'utf-8'
+        page_source = response.text
+
+        self.last_result = classify_page(page_source, kind)
+        if self.last_result != "ok":
+            self.count(kind, "http_" + self.last_result)
+            return None
+        return page_source
+
+    def count(self, kind, layer, n=1):
+        """累加某类页面某一层的计数"""
+        kind_stats = self.stats.setdefault(kind, {})
+        kind_stats[layer] = kind_stats.get(layer, 0) + n
+
+    def sync_cookies(self, driver):
+        """把浏览器中的cookie同步到Session，浏览器过了验证码后HTTP层也能继续使用"""
+        try:
+            for cookie in driver.get_cookies():
+                self.session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain'), path=cookie.get('path', '/'))
+        except Exception as e:
+            logging.info(f"同步浏览器cookie失败: {e}")
+
+    def close(self):
+        self.session.close()
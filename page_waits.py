@@ -0,0 +1,42 @@
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from page_fetcher import CAPTCHA_MARKERS
+
+# 各类页面的就绪信号：出现这些元素即可读取page_source
+READY_SELECTORS = {
+    "list": "#list_con, li.job_item, .pagesout",
+    "detail": ".pos_title, .des",
+    "company": ".c_detail_item, .introduction, .baseInfo",
+}
+# 各类页面等待就绪信号的最长时间（秒），超时后按已加载的内容继续处理
+READY_TIMEOUTS = {"list": 5, "detail": 4, "company": 4}
+DEFAULT_TIMEOUT = 4
+
+# 一次execute_script判断页面状态：就绪元素已出现、是验证码页面、或页面已完全加载（不会再出现就绪元素）
+READY_SCRIPT = """
+const selector = arguments[0];
+const markers = arguments[1];
+if (selector && document.querySelector(selector)) return 'ready';
+const text = document.body ? document.body.innerText : '';
+if (markers.some(marker => text.indexOf(marker) !== -1)) return 'captcha';
+if (document.readyState === 'complete') return 'complete';
+return null;
+"""
+
+
+def wait_for_page(driver, kind, timeout=None, poll_interval=0.1):
+    """等待页面出现就绪信号，返回 'ready'/'captcha'/'complete'，超时返回None
+
+    不使用隐式等待：就绪元素一出现即返回，页面耗时取决于实际加载时间而不是固定上限；
+    超时不抛异常，由调用方根据页面内容（验证码检测、解析结果）判断。
+    """
+    if timeout is None:
+        timeout = READY_TIMEOUTS.get(kind, DEFAULT_TIMEOUT)
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=poll_interval,
+                             ignored_exceptions=(WebDriverException,)).until(
+            lambda d: d.execute_script(READY_SCRIPT, READY_SELECTORS.get(kind), list(CAPTCHA_MARKERS))
+        )
+    except TimeoutException:
+        return None
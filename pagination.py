@@ -0,0 +1,84 @@
+import re
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+from job_extractors import make_soup
+
+# 列表页分页链接中的页码，如 https://bj.58.com/hulianwangtx/pn2/?pid=...&PGTID=...
+PAGE_NUMBER_PATTERN = re.compile(r'/pn(\d+)/?')
+NEXT_PAGE_TEXTS = ('下一页', '下页', '>')
+
+
+def page_url(base_url, page_num):
+    """按58的 /pnN/ 规则生成第N页的链接（不带查询参数），第1页即基础链接"""
+    parts = urlsplit(base_url)
+    path = PAGE_NUMBER_PATTERN.sub('/', parts.path).rstrip('/') + '/'
+    if page_num > 1:
+        path += f'pn{page_num}/'
+    return urlunsplit((parts.scheme, parts.netloc, path, '', ''))
+
+
+def parse_pager(page_source, current_url=None, parser=None):
+    """一次解析分页区域(.pagesout)，返回 ({页码: 链接}, 是否有下一页)；没有分页区域时返回 (None, False)
+
+    page_source 也可以是已解析的soup（与提取职位链接共用，不再重复解析）。
+    """
+    soup = make_soup(page_source, parser)
+    pager = soup.select_one('.pagesout')
+    if pager is None:
+        return None, False
+
+    page_links = {}
+    has_next = False
+    for link in pager.select('a[href]'):
+        href = urljoin(current_url, link['href']) if current_url else link['href']
+        text = link.get_text().strip()
+        if text in NEXT_PAGE_TEXTS or 'next' in (link.get('class') or []):
+            has_next = True
+        match = PAGE_NUMBER_PATTERN.search(href)
+        if match:
+            page_links.setdefault(int(match.group(1)), href)
+        elif text.isdigit():
+            page_links.setdefault(int(text), href)
+    return page_links, has_next
+
+
+class PaginationPlanner:
+    """列表页分页规划
+
+    不再逐页点击"下一页"来获取链接：每抓取一个列表页，顺便从其分页区域读出后续页码的真实链接
+    （保留pid等参数），没有读到时按 /pnN/ 规则生成。迭代时按需逐页给出链接，
+    根据分页区域或空页判断最后一页，提前结束。
+    """
+
+    def __init__(self, base_url, max_pages=5):
+        self.base_url = base_url
+        self.max_pages = max_pages
+        self.page_links = {1: base_url}
+        self.last_page = None  # 检测到的最后一页页码，None表示未知
+
+    def __iter__(self):
+        """按顺序给出 (页码, 访问链接, 规范链接)，规范链接不带跟踪参数，用作抓取进度的键"""
+        page_num = 1
+        while page_num <= self.max_pages and (self.last_page is None or page_num <= self.last_page):
+            yield page_num, self.page_links.get(page_num) or page_url(self.base_url, page_num), page_url(self.base_url, page_num)
+            page_num += 1
+
+    def observe(self, page_num, page_source, job_count=None):
+        """读取第page_num页的分页区域，记录后续页链接并判断是否为最后一页"""
+        if job_count == 0 and page_num > 1:
+            # 空页说明已超过最后一页
+            self.last_page = page_num - 1
+            return
+        page_links, has_next = parse_pager(page_source, self.page_links.get(page_num))
+        if page_links is None:
+            return
+        for num, href in page_links.items():
+            if num > page_num:
+                # 以最近一页分页区域中的链接为准（pid等参数随页面更新）
+                self.page_links[num] = href
+        if not has_next and max(page_links, default=page_num) <= page_num:
+            self.last_page = page_num
+
+    def url_list(self):
+        """已知的全部页面链接（页码不超过max_pages和最后一页）"""
+        return [url for _, url, _ in self]
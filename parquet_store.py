@@ -0,0 +1,229 @@
+"""
+按列存储的职位数据（Parquet），按抓取城市和抓取日期分区：
+
+    job_store/抓取城市=北京/抓取日期=2024-05-01/part-....parquet
+
+分析时只读取需要的列，城市、日期条件直接跳过无关分区，薪资和发布时间条件利用行组统计信息
+跳过数据，不再每次用openpyxl解析整个Excel。需要原格式时再导出为Excel/JSON：
+
+    python parquet_store.py import 58同城多城市职位详细信息.json
+    python parquet_store.py scan --city 北京 上海 --salary-min 8000 --columns 企业名称 岗位名称 薪资范围起
+    python parquet_store.py export 北京职位.xlsx --city 北京
+"""
+
+import argparse
+import os
+import re
+import uuid
+from datetime import date
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+except ImportError:  # 可选依赖，只有使用Parquet存储时才需要
+    pa = None
+
+from job_sink import JOB_COLUMNS
+
+CITY_COLUMN = "抓取城市"
+DATE_COLUMN = "抓取日期"
+PARTITION_COLUMNS = [CITY_COLUMN, DATE_COLUMN]
+# 按数字存储的列，薪资范围可以直接做区间过滤
+SALARY_COLUMNS = ["薪资范围起", "薪资范围至"]
+INTEGER_COLUMNS = SALARY_COLUMNS + ["招聘人数"]
+# 取值重复率高的文本列，读取时使用字典编码（转为pandas时为category）
+DICTIONARY_COLUMNS = ["企业类型", "企业规模", "所属区域", "薪资类型", "工作地点", "岗位要求", "学历要求"]
+UNKNOWN_CITY = "未知"
+_DIGITS = re.compile(r'\d+')
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Parquet存储需要安装pyarrow: pip install pyarrow")
+
+
+def record_city(record, city=None):
+    """记录所属的抓取城市：记录中的抓取城市，其次为指定的城市，再次为工作地点中的城市（"北京 - 丰台"）"""
+    value = record.get(CITY_COLUMN) or city
+    if not value:
+        value = str(record.get("工作地点") or "").split(" - ")[0].strip()
+    return value or UNKNOWN_CITY
+
+
+def to_integer(value):
+    """薪资等数字列：取第一个整数（Excel读回的"3000.0"取3000），没有数字时为None"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return None if value != value else int(value)
+    match = _DIGITS.search(str(value))
+    return int(match.group(0)) if match else None
+
+
+def to_text(value):
+    """文本列：空值为空字符串，其余转为字符串（与Excel/JSON成品一致）"""
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    return str(value)
+
+
+def records_to_columns(records, city=None, crawl_date=None):
+    """把职位记录转为按列排列的数据 {列名: 值列表}，附加抓取城市和抓取日期"""
+    crawl_date = crawl_date or date.today().isoformat()
+    columns = {column: [] for column in JOB_COLUMNS + PARTITION_COLUMNS}
+    for record in records:
+        for column in JOB_COLUMNS:
+            convert = to_integer if column in INTEGER_COLUMNS else to_text
+            columns[column].append(convert(record.get(column)))
+        columns[CITY_COLUMN].append(record_city(record, city))
+        columns[DATE_COLUMN].append(crawl_date)
+    return columns
+
+
+def job_schema():
+    _require_pyarrow()
+    return pa.schema(
+        [pa.field(column, pa.int64() if column in INTEGER_COLUMNS else pa.string()) for column in JOB_COLUMNS]
+        + [pa.field(column, pa.string()) for column in PARTITION_COLUMNS]
+    )
+
+
+class ParquetJobStore:
+    """按抓取城市和抓取日期分区的Parquet职位数据集
+
+    每次append写入新的文件，不修改已有文件；scan读取时只加载需要的列，并把过滤条件下推到
+    分区目录（城市、日期）和Parquet行组统计信息（薪资、发布时间）。
+    """
+
+    def __init__(self, root="job_store"):
+        _require_pyarrow()
+        self.root = root
+        self.schema = job_schema()
+        self.partitioning = ds.partitioning(
+            pa.schema([pa.field(column, pa.string()) for column in PARTITION_COLUMNS]), flavor="hive")
+
+    def append(self, records, city=None, crawl_date=None, replace=False):
+        """写入一批职位记录，返回写入的条数
+
+        replace=True 时先删除本批数据涉及的（城市, 日期）分区，用于把同一天的完整结果重新写入。
+        """
+        records = list(records)
+        if not records:
+            return 0
+        table = pa.Table.from_pydict(records_to_columns(records, city, crawl_date), schema=self.schema)
+        file_format = ds.ParquetFileFormat()
+        ds.write_dataset(
+            table, self.root, format=file_format, partitioning=self.partitioning,
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            existing_data_behavior="delete_matching" if replace else "overwrite_or_ignore",
+            file_options=file_format.make_write_options(compression="zstd", use_dictionary=True),
+        )
+        return len(records)
+
+    def dataset(self):
+        file_format = ds.ParquetFileFormat(read_options=ds.ParquetReadOptions(dictionary_columns=DICTIONARY_COLUMNS))
+        return ds.dataset(self.root, format=file_format, partitioning=self.partitioning)
+
+    def scan(self, columns=None, cities=None, date_from=None, date_to=None, salary_min=None, salary_max=None,
+             published_from=None, published_to=None):
+        """读取满足条件的职位，返回pyarrow.Table
+
+        columns: 只读取的列；cities: 抓取城市列表；date_from/date_to: 抓取日期（YYYY-MM-DD）；
+        salary_min/salary_max: 薪资范围与该区间有交集；published_from/published_to: 发布时间（YYYY-MM-DD）。
+        """
+        if not os.path.isdir(self.root):
+            table = self.schema.empty_table()
+            return table.select(columns) if columns else table
+        conditions = []
+        if cities:
+            conditions.append(ds.field(CITY_COLUMN).isin(list(cities)))
+        if date_from:
+            conditions.append(ds.field(DATE_COLUMN) >= date_from)
+        if date_to:
+            conditions.append(ds.field(DATE_COLUMN) <= date_to)
+        if salary_min is not None:
+            conditions.append(ds.field("薪资范围至") >= salary_min)
+        if salary_max is not None:
+            conditions.append(ds.field("薪资范围起") <= salary_max)
+        if published_from:
+            conditions.append(ds.field("发布时间") >= published_from)
+        if published_to:
+            conditions.append((ds.field("发布时间") <= published_to) & (ds.field("发布时间") != ""))
+        condition = None
+        for expression in conditions:
+            condition = expression if condition is None else condition & expression
+        return self.dataset().to_table(columns=columns, filter=condition)
+
+    def scan_frame(self, **filters):
+        """同scan，返回pandas DataFrame（字典编码的列为category）"""
+        return self.scan(**filters).to_pandas()
+
+    def export(self, filename, include_city=False, **filters):
+        """把满足条件的职位导出为原来的Excel（.xlsx）或JSON格式，返回导出的条数"""
+        from batch_clean import write_table
+
+        columns = JOB_COLUMNS + ([CITY_COLUMN] if include_city else [])
+        table = self.scan(columns=columns, **filters)
+        # 薪资范围按原格式转回文本，招聘人数保持整数；空值在write_table中写为空字符串
+        for column in SALARY_COLUMNS:
+            index = table.schema.get_field_index(column)
+            table = table.set_column(index, column, pc.cast(table[column], pa.string()))
+        write_table(table.to_pandas(integer_object_nulls=True), filename)
+        return table.num_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parquet职位数据存储：导入、查询和导出")
+    parser.add_argument("--root", default="job_store", help="Parquet数据集目录")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="导入Excel或JSON成品文件")
+    import_parser.add_argument("files", nargs="+")
+    import_parser.add_argument("--city", default=None, help="记录中没有抓取城市时使用的城市（默认取工作地点中的城市）")
+    import_parser.add_argument("--date", default=None, help="抓取日期（YYYY-MM-DD，默认今天）")
+    import_parser.add_argument("--replace", action="store_true", help="替换同一城市同一天已有的数据")
+
+    for name, help_text in (("scan", "查询并打印职位"), ("export", "导出为Excel或JSON")):
+        sub = subparsers.add_parser(name, help=help_text)
+        if name == "export":
+            sub.add_argument("output", help="输出文件（.xlsx或.json）")
+            sub.add_argument("--include-city", action="store_true", help="导出时保留抓取城市列")
+        else:
+            sub.add_argument("--columns", nargs="+", default=None, help="只读取的列")
+            sub.add_argument("--limit", type=int, default=20, help="最多打印的行数")
+        sub.add_argument("--city", nargs="+", default=None, help="抓取城市")
+        sub.add_argument("--date-from", default=None)
+        sub.add_argument("--date-to", default=None)
+        sub.add_argument("--salary-min", type=int, default=None)
+        sub.add_argument("--salary-max", type=int, default=None)
+        sub.add_argument("--published-from", default=None)
+        sub.add_argument("--published-to", default=None)
+    args = parser.parse_args()
+
+    store = ParquetJobStore(args.root)
+    if args.command == "import":
+        from batch_clean import read_table
+
+        for path in args.files:
+            records = read_table(path).to_dict("records")
+            count = store.append(records, city=args.city, crawl_date=args.date, replace=args.replace)
+            print(f"已导入 {path}: {count} 条记录")
+        return
+
+    filters = dict(cities=args.city, date_from=args.date_from, date_to=args.date_to,
+                   salary_min=args.salary_min, salary_max=args.salary_max,
+                   published_from=args.published_from, published_to=args.published_to)
+    if args.command == "export":
+        count = store.export(args.output, include_city=args.include_city, **filters)
+        print(f"已导出 {count} 条记录到 {args.output}")
+    else:
+        df = store.scan_frame(columns=args.columns, **filters)
+        print(f"共 {len(df)} 条记录")
+        print(df.head(args.limit).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+from job_extractors import parse_job_detail_html, parse_company_detail_html, parse_job_list_html
+
+# 页面类型 -> 纯函数解析器（输入HTML，输出可pickle的结果），在子进程中执行
+PAGE_PARSERS = {
+    "detail": parse_job_detail_html,
+    "company": parse_company_detail_html,
+    "list": parse_job_list_html,
+}
+
+
+def parse_page(kind, page_source, parser=None):
+    """按页面类型解析HTML（子进程入口，必须是模块级函数才能被pickle）"""
+    return PAGE_PARSERS[kind](page_source, parser)
+
+
+class ParsePipeline:
+    """HTML解析进程池
+
+    抓取阶段只负责拿到(链接, HTML)，解析交给多进程执行：BeautifulSoup解析占用的CPU时间
+    不再叠加在浏览器的等待时间上，多个核心的解析也不受GIL限制。
+    """
+
+    def __init__(self, processes=2, parser=None):
+        self.processes = processes
+        self.parser = parser
+        self.executor = ProcessPoolExecutor(max_workers=processes)
+        logging.info(f"已启动 {processes} 个HTML解析进程")
+
+    def submit(self, kind, page_source):
+        """提交解析任务，立即返回Future"""
+        return self.executor.submit(parse_page, kind, page_source, self.parser)
+
+    def parse(self, kind, page_source):
+        """提交解析任务并等待结果（等待期间释放GIL，其他抓取线程可继续工作）"""
+        return self.submit(kind, page_source).result()
+
+    def close(self):
+        self.executor.shutdown(wait=True)
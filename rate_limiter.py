@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+class HostBucket:
+    """单个域名的令牌桶及AIMD状态"""
+
+    def __init__(self, rate, burst, now):
+        self.rate = rate  # 当前允许的请求速率（次/秒）
+        self.burst = burst
+        self.tokens = burst
+        self.updated_at = now
+        self.cooldown_until = 0.0
+        self.requests = 0
+        self.successes = 0
+        self.captchas = 0
+        self.waited = 0.0  # 累计等待时间（秒）
+
+    def refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+
+class AdaptiveRateLimiter:
+    """按域名的自适应访问频率控制（令牌桶 + AIMD）
+
+    每次请求前调用 wait(url) 取得令牌；页面正常时速率线性增加（加性增），
+    出现验证码时速率减半并暂停一段时间（乘性减）。多个浏览器工作线程共享同一个实例，
+    速率即整体的有效并发，取代各处固定的 time.sleep。
+    clock/sleep 为时间来源和等待函数（测试时可替换为手动推进的时钟）。
+    """
+
+    def __init__(self, rate=2.0, min_rate=0.2, max_rate=8.0, burst=2,
+                 increase=0.1, decrease=0.5, cooldown=10.0, clock=time.monotonic, sleep=time.sleep):
+        self.initial_rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.clock = clock
+        self.sleep = sleep
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, url):
+        host = urlsplit(url).netloc.lower()
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = HostBucket(self.initial_rate, self.burst, self.clock())
+        return bucket
+
+    def _take(self, url, waited):
+        """尝试取得令牌，成功返回None，否则返回还需等待的秒数"""
+        with self._lock:
+            bucket = self._bucket(url)
+            now = self.clock()
+            bucket.refill(now)
+            # 浮点误差可能让等待结束时差一点点才到点或补满1个令牌，按已到处理，避免反复极短的等待
+            if now < bucket.cooldown_until - 1e-9:
+                return bucket.cooldown_until - now
+            if bucket.tokens >= 1 - 1e-9:
+                bucket.tokens = max(0.0, bucket.tokens - 1)
+                bucket.requests += 1
+                bucket.waited += waited
+                return None
+            return (1 - bucket.tokens) / bucket.rate
+
+    def wait(self, url):
+        """阻塞直到该域名有可用令牌，返回本次等待的秒数"""
+        waited = 0.0
+        while True:
+            delay = self._take(url, waited)
+            if delay is None:
+                return waited
+            self.sleep(delay)
+            waited += delay
+
+    async def wait_async(self, url):
+        """wait的协程版本，等待期间不阻塞事件循环"""
+        waited = 0.0
+        while True:
+            delay = self._take(url, waited)
+            if delay is None:
+                return waited
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def record_success(self, url):
+        """页面正常返回：加性增加速率"""
+        with self._lock:
+            bucket = self._bucket(url)
+            bucket.successes += 1
+            bucket.rate = min(self.max_rate, bucket.rate + self.increase)
+
+    def record_captcha(self, url):
+        """遇到验证码：乘性降低速率，清空令牌并暂停cooldown秒"""
+        with self._lock:
+            bucket = self._bucket(url)
+            bucket.captchas += 1
+            bucket.rate = max(self.min_rate, bucket.rate * self.decrease)
+            bucket.tokens = 0
+            bucket.cooldown_until = self.clock() + self.cooldown
+
+    def metrics(self):
+        """各域名的当前速率和累计统计"""
+        with self._lock:
+            return {
+                host: {
+                    "rate": round(bucket.rate, 2),
+                    "requests": bucket.requests,
+                    "successes": bucket.successes,
+                    "captchas": bucket.captchas,
+                    "waited": round(bucket.waited, 1),
+                }
+                for host, bucket in self._buckets.items()
+            }
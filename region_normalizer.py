@@ -0,0 +1,227 @@
+import re
+from functools import lru_cache
+
+# 城市 -> 省份（直辖市不在其中，单独处理）
+CITY_TO_PROVINCE = {
+    '广州': '广东', '深圳': '广东', '东莞': '广东', '佛山': '广东', '中山': '广东', '珠海': '广东', '惠州': '广东', '江门': '广东', '湛江': '广东', '茂名': '广东', '肇庆': '广东', '梅州': '广东', '汕头': '广东', '河源': '广东', '阳江': '广东', '清远': '广东', '韶关': '广东', '揭阳': '广东', '潮州': '广东', '云浮': '广东', '汕尾': '广东',
+    '杭州': '浙江', '宁波': '浙江', '温州': '浙江', '嘉兴': '浙江', '湖州': '浙江', '绍兴': '浙江', '金华': '浙江', '衢州': '浙江', '舟山': '浙江', '台州': '浙江', '丽水': '浙江',
+    '南京': '江苏', '苏州': '江苏', '无锡': '江苏', '常州': '江苏', '镇江': '江苏', '南通': '江苏', '泰州': '江苏', '扬州': '江苏', '盐城': '江苏', '连云港': '江苏', '徐州': '江苏', '淮安': '江苏', '宿迁': '江苏',
+    '济南': '山东', '青岛': '山东', '淄博': '山东', '枣庄': '山东', '东营': '山东', '烟台': '山东', '潍坊': '山东', '济宁': '山东', '泰安': '山东', '威海': '山东', '日照': '山东', '临沂': '山东', '德州': '山东', '聊城': '山东', '滨州': '山东', '菏泽': '山东',
+    '郑州': '河南', '开封': '河南', '洛阳': '河南', '平顶山': '河南', '安阳': '河南', '鹤壁': '河南', '新乡': '河南', '焦作': '河南', '濮阳': '河南', '许昌': '河南', '漯河': '河南', '三门峡': '河南', '南阳': '河南', '商丘': '河南', '信阳': '河南', '周口': '河南', '驻马店': '河南',
+    '武汉': '湖北', '黄石': '湖北', '十堰': '湖北', '宜昌': '湖北', '襄阳': '湖北', '鄂州': '湖北', '荆门': '湖北', '孝感': '湖北', '荆州': '湖北', '黄冈': '湖北', '咸宁': '湖北', '随州': '湖北',
+    '长沙': '湖南', '株洲': '湖南', '湘潭': '湖南', '衡阳': '湖南', '邵阳': '湖南', '岳阳': '湖南', '常德': '湖南', '张家界': '湖南', '益阳': '湖南', '郴州': '湖南', '永州': '湖南', '怀化': '湖南', '娄底': '湖南',
+    '南昌': '江西', '景德镇': '江西', '萍乡': '江西', '九江': '江西', '新余': '江西', '鹰潭': '江西', '赣州': '江西', '吉安': '江西', '宜春': '江西', '抚州': '江西', '上饶': '江西',
+    '合肥': '安徽', '芜湖': '安徽', '蚌埠': '安徽', '淮南': '安徽', '马鞍山': '安徽', '淮北': '安徽', '铜陵': '安徽', '安庆': '安徽', '黄山': '安徽', '滁州': '安徽', '阜阳': '安徽', '宿州': '安徽', '六安': '安徽', '亳州': '安徽', '池州': '安徽', '宣城': '安徽',
+    '福州': '福建', '厦门': '福建', '莆田': '福建', '三明': '福建', '泉州': '福建', '漳州': '福建', '南平': '福建', '龙岩': '福建', '宁德': '福建',
+    '石家庄': '河北', '唐山': '河北', '秦皇岛': '河北', '邯郸': '河北', '邢台': '河北', '保定': '河北', '张家口': '河北', '承德': '河北', '沧州': '河北', '廊坊': '河北', '衡水': '河北',
+    '太原': '山西', '大同': '山西', '阳泉': '山西', '长治': '山西', '晋城': '山西', '朔州': '山西', '晋中': '山西', '运城': '山西', '忻州': '山西', '临汾': '山西', '吕梁': '山西',
+    '沈阳': '辽宁', '大连': '辽宁', '鞍山': '辽宁', '抚顺': '辽宁', '本溪': '辽宁', '丹东': '辽宁', '锦州': '辽宁', '营口': '辽宁', '阜新': '辽宁', '辽阳': '辽宁', '盘锦': '辽宁', '铁岭': '辽宁', '朝阳': '辽宁', '葫芦岛': '辽宁',
+    '长春': '吉林', '吉林': '吉林', '四平': '吉林', '辽源': '吉林', '通化': '吉林', '白山': '吉林', '松原': '吉林', '白城': '吉林',
+    '哈尔滨': '黑龙江', '齐齐哈尔': '黑龙江', '鸡西': '黑龙江', '鹤岗': '黑龙江', '双鸭山': '黑龙江', '大庆': '黑龙江', '伊春': '黑龙江', '佳木斯': '黑龙江', '七台河': '黑龙江', '牡丹江': '黑龙江', '黑河': '黑龙江', '绥化': '黑龙江',
+    '成都': '四川', '自贡': '四川', '攀枝花': '四川', '泸州': '四川', '德阳': '四川', '绵阳': '四川', '广元': '四川', '遂宁': '四川', '内江': '四川', '乐山': '四川', '南充': '四川', '眉山': '四川', '宜宾': '四川', '广安': '四川', '达州': '四川', '雅安': '四川', '巴中': '四川', '资阳': '四川',
+    '贵阳': '贵州', '六盘水': '贵州', '遵义': '贵州', '安顺': '贵州', '毕节': '贵州', '铜仁': '贵州',
+    '昆明': '云南', '曲靖': '云南', '玉溪': '云南', '保山': '云南', '昭通': '云南', '丽江': '云南', '普洱': '云南', '临沧': '云南',
+    '西安': '陕西', '铜川': '陕西', '宝鸡': '陕西', '咸阳': '陕西', '渭南': '陕西', '延安': '陕西', '汉中': '陕西', '榆林': '陕西', '安康': '陕西', '商洛': '陕西',
+    '兰州': '甘肃', '嘉峪关': '甘肃', '金昌': '甘肃', '白银': '甘肃', '天水': '甘肃', '武威': '甘肃', '张掖': '甘肃', '平凉': '甘肃', '酒泉': '甘肃', '庆阳': '甘肃', '定西': '甘肃', '陇南': '甘肃',
+    '西宁': '青海', '海东': '青海',
+    '银川': '宁夏', '石嘴山': '宁夏', '吴忠': '宁夏', '固原': '宁夏', '中卫': '宁夏',
+    '乌鲁木齐': '新疆', '克拉玛依': '新疆', '吐鲁番': '新疆', '哈密': '新疆',
+    '呼和浩特': '内蒙古', '包头': '内蒙古', '乌海': '内蒙古', '赤峰': '内蒙古', '通辽': '内蒙古', '鄂尔多斯': '内蒙古', '呼伦贝尔': '内蒙古', '巴彦淖尔': '内蒙古', '乌兰察布': '内蒙古',
+    '拉萨': '西藏', '日喀则': '西藏', '昌都': '西藏', '林芝': '西藏', '山南': '西藏', '那曲': '西藏',
+    '海口': '海南', '三亚': '海南', '三沙': '海南', '儋州': '海南'
+}
+PROVINCES = frozenset(CITY_TO_PROVINCE.values())
+MUNICIPALITIES = ('北京', '上海', '天津', '重庆')
+# 没有"XX区"时可识别的城市下属区域
+DISTRICT_SUFFIXES = ('高新区', '开发区', '经济区', '新区', '工业区', '科技园', '软件园')
+
+# 所属区域中出现即视为无效内容（招聘广告、福利描述、企业名称等）
+UNWANTED_KEYWORDS = ('找工作', '免费发布', '登记简历', '公司福利', '饭补', '加班补助',
+                     '交通便利', '餐补', '市中心区', '不匹配', '人公司', '福利', '补助', '便利',
+                     '有限公司', '科技有限公司', '信息科技', '华南地区', '华北地区', '华东地区',
+                     '华西地区', '在华', '地区', '公司在', '注册地位于', '注册地址', '营业执照', '工商注册')
+
+_CN = r'[\u4e00-\u9fa5]'
+# 省、市名本身不含"省""市""区"，避免把"广州市"整体当作城市名
+_NAME = r'(?:(?![省市区])[\u4e00-\u9fa5])'
+_MUNICIPALITY = '|'.join(MUNICIPALITIES)
+# 所有无效词合并为一个正则，一次扫描完成
+UNWANTED_PATTERN = re.compile('|'.join(map(re.escape, UNWANTED_KEYWORDS)))
+HEADQUARTERS_PREFIX = re.compile(r'^总部位于')
+MUNICIPALITY_DISTRICT = re.compile(rf'^({_MUNICIPALITY})({_CN}{{2,4}}区)$')
+CITY_DISTRICT = re.compile(rf'^({_NAME}{{2,4}})({_CN}{{2,4}}区)$')
+PROVINCE_CITY_DISTRICT = re.compile(rf'({_NAME}{{2,4}})(省)?({_NAME}{{2,4}})(市)?({_CN}{{2,4}}区)')
+PROVINCE_CITY_DISTRICT_FULL = re.compile(rf'{_CN}{{2,4}}省{_CN}{{2,4}}市{_CN}{{2,4}}区')
+CITY_DISTRICT_FULL = re.compile(rf'{_CN}{{2,4}}市{_CN}{{2,4}}区')
+MUNICIPALITY_ANYWHERE = re.compile(rf'({_MUNICIPALITY})({_CN}{{2,4}}区)')
+CITY_ZONE = re.compile(rf'({_CN}{{2,4}})({"|".join(DISTRICT_SUFFIXES)})')
+PROVINCE_CITY = re.compile(rf'({_CN}{{2,4}})省({_CN}{{2,4}})市')
+CITY_WITH_DISTRICT = re.compile(rf'({_CN}{{2,4}})市{_CN}{{2,4}}区')
+# 最终只接受"XX省XX市"、"XX市"和直辖市"XX市XX区"
+VALID_REGION = re.compile(rf'^{_CN}{{2,4}}省{_CN}{{2,4}}市$|^{_CN}{{2,4}}市$|^({_CN}{{2,4}})市{_CN}{{2,4}}区$')
+
+# 地名表中的标准结果："XX省XX市"和"XX市"，以及直辖市"XX市XX区"
+KNOWN_REGIONS = frozenset(
+    [f"{province}省{city}市" for city, province in CITY_TO_PROVINCE.items()]
+    + [f"{city}市" for city in CITY_TO_PROVINCE] + [f"{city}市" for city in MUNICIPALITIES]
+)
+KNOWN_MUNICIPALITY_DISTRICT = re.compile(rf'^({_MUNICIPALITY})市(?!市){_CN}{{2,4}}区$')
+
+
+def province_city(city):
+    """已知城市返回"XX省XX市"，未知城市返回None"""
+    province = CITY_TO_PROVINCE.get(city)
+    return f"{province}省{city}市" if province else None
+
+
+class RegionNormalizer:
+    """所属区域标准化：统一为"XX省XX市"、"XX市"或直辖市"XX市XX区"，无法识别的返回空字符串
+
+    地名表和正则在模块加载时构建一次；相同的输入直接返回缓存的结果（同一批职位的所属区域
+    重复率很高），单条记录的处理开销在微秒级。
+    """
+
+    def __init__(self, cache_size=65536):
+        self._resolve = lru_cache(maxsize=cache_size)(self._resolve_uncached)
+
+    def normalize(self, region, work_location=''):
+        """返回标准化后的所属区域"""
+        return self.resolve(region, work_location)[0]
+
+    def resolve(self, region, work_location=''):
+        """返回 (标准化后的所属区域, 处理说明)；所属区域为空时才使用工作地点"""
+        region = region if isinstance(region, str) else ''
+        if region.strip():
+            work_location = ''
+        return self._resolve(region, work_location if isinstance(work_location, str) else '')
+
+    def cache_info(self):
+        return self._resolve.cache_info()
+
+    def _resolve_uncached(self, region, work_location):
+        notes = []
+        if not region.strip():
+            if not work_location.strip():
+                return '', ()
+            # 去掉横线，将"北京 - 大兴"格式转换为"北京大兴区"格式
+            region = work_location.replace(' - ', '').replace('-', '').strip()
+            # 如果不包含"区"字且长度大于2，添加"区"
+            if '区' not in region and len(region) > 2:
+                region += '区'
+            notes.append(f"✓ 所属区域已从工作地点补充: {work_location} -> {region}")
+        if not region:
+            return '', tuple(notes)
+
+        cleaned = HEADQUARTERS_PREFIX.sub('', region).strip()
+        if UNWANTED_PATTERN.search(cleaned):
+            notes.append(f"× 所属区域包含无关内容已清空: {cleaned}")
+            return '', tuple(notes)
+
+        # 地名表中能确认的标准格式直接保留（保存过的数据再次清理时结果不变）
+        if cleaned in KNOWN_REGIONS or KNOWN_MUNICIPALITY_DISTRICT.match(cleaned):
+            return cleaned, tuple(notes)
+        fixed, note = self._fix(region, cleaned)
+        if note:
+            notes.append(note)
+        # 最终验证修复后的格式是否符合标准
+        if fixed and not self._is_standard(fixed):
+            notes.append(f"× 所属区域最终格式验证失败已清空: {fixed}")
+            fixed = ''
+        return fixed, tuple(notes)
+
+    @staticmethod
+    def _is_standard(region):
+        valid = VALID_REGION.match(region)
+        return bool(valid) and (valid.group(1) is None or valid.group(1) in MUNICIPALITIES)
+
+    def _fix(self, original, region):
+        """按格式逐级修复，返回 (修复结果, 处理说明)"""
+        match = MUNICIPALITY_DISTRICT.search(region)
+        if match:
+            fixed = f"{match.group(1)}市{match.group(2)}"
+            return fixed, f"✓ 所属区域已自动修复: {region} -> {fixed}"
+
+        # "广州荔湾区"这种格式（城市+区域，缺少"市"字）
+        match = CITY_DISTRICT.search(region)
+        if match:
+            city, district = match.groups()
+            fixed = province_city(city) or f"{city}市{district}"
+            return fixed, f"✓ 所属区域已自动修复: {region} -> {fixed}"
+
+        # "XX省XX区"、"XX市XX区"或"XXXX区"格式，自动补充"省"和"市"字；非直辖市去掉区级信息
+        match = PROVINCE_CITY_DISTRICT.search(region)
+        if match:
+            province, has_province, city, has_city_suffix, district = match.groups()
+            if has_province and not has_city_suffix:
+                # 没有"市"字时城市和区域的分界不确定，只接受地名表中的城市（"江苏省苏州工业园区"不能变成"苏州工市"）
+                # 不是已知城市时按后面的格式继续处理
+                fixed = self._known_city_prefix(city + district)
+            elif not has_province and not has_city_suffix:
+                fixed = province_city(city) or f"{city}市{district}"
+            elif not has_province:
+                if city in MUNICIPALITIES:
+                    fixed = f"{city}市{district}"
+                else:
+                    fixed = province_city(city) or f"{city}市{district}"
+            elif city in MUNICIPALITIES:
+                return region, None
+            else:
+                fixed = f"{province}省{city}市"
+            if fixed:
+                return fixed, f"✓ 所属区域已自动修复: {region} -> {fixed}"
+
+        # 优先查找"XX省XX市XX区"格式，然后查找"XX市XX区"格式
+        match = PROVINCE_CITY_DISTRICT_FULL.search(region) or CITY_DISTRICT_FULL.search(region)
+        if match:
+            clean_region = match.group(0)
+            # 统一将区级信息简化为省市级别
+            province_match = PROVINCE_CITY.search(clean_region)
+            if province_match:
+                clean_region = f"{province_match.group(1)}省{province_match.group(2)}市"
+            else:
+                city_match = CITY_WITH_DISTRICT.search(clean_region)
+                if city_match:
+                    city = city_match.group(1)
+                    clean_region = province_city(city) or f"{city}市"
+            if len(clean_region) > 10:
+                return '', f"× 所属区域长度异常已清空: {clean_region}"
+            if clean_region != original:
+                return clean_region, f"✓ 所属区域已清理: {original} -> {clean_region}"
+            return clean_region, None
+
+        # 直辖市格式"XX丰台区"，补充"市"字
+        match = MUNICIPALITY_ANYWHERE.search(region)
+        if match:
+            fixed = f"{match.group(1)}市{match.group(2)}"
+            return fixed, f"✓ 直辖市格式已标准化: {region} -> {fixed}"
+
+        # "XX高新区"、"XX开发区"等，简化为省市级别
+        match = CITY_ZONE.search(region)
+        if match:
+            city = match.group(1)
+            fixed = province_city(city) or f"{city}市"
+            return fixed, f"✓ 城市区域格式已标准化: {region} -> {fixed}"
+
+        return '', f"× 所属区域格式不标准已清空: {region}"
+
+    @staticmethod
+    def _known_city_prefix(text):
+        """text以地名表中的城市开头时返回"XX省XX市"，否则返回None"""
+        for length in (2, 3, 4):
+            fixed = province_city(text[:length])
+            if fixed:
+                return fixed
+        return None
+
+
+DEFAULT_NORMALIZER = RegionNormalizer()
+
+
+def normalize(region, work_location=''):
+    """使用共享的RegionNormalizer标准化所属区域"""
+    return DEFAULT_NORMALIZER.normalize(region, work_location)
+
+
+def resolve(region, work_location=''):
+    """使用共享的RegionNormalizer，返回 (标准化后的所属区域, 处理说明)"""
+    return DEFAULT_NORMALIZER.resolve(region, work_location)
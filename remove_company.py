@@ -1,46 +1,59 @@
-import pandas as pd
+import argparse
 import json
+import os
 
-# 要删除的公司名称
+from job_sink import JsonlJobSink
+from job_warehouse import JobWarehouse, import_files
+
+# 默认要删除的公司名称
 company_to_remove = '广东天杰国际人才科技有限公司'
 
-# 读取Excel文件
-print("正在读取Excel文件...")
-df = pd.read_excel('58同城多城市职位详细信息.xlsx')
-print(f"原始数据总记录数: {len(df)}")
-
-# 检查是否存在该公司的记录
-tianjie_data = df[df['企业名称'] == company_to_remove]
-print(f"\n{company_to_remove}的记录数: {len(tianjie_data)}")
-
-if len(tianjie_data) > 0:
-    print("\n具体记录:")
-    print(tianjie_data[['岗位名称', '所属区域', '薪资范围起', '薪资范围至']].to_string())
-    
-    # 删除该公司的记录
-    df_filtered = df[df['企业名称'] != company_to_remove]
-    print(f"\n删除后数据记录数: {len(df_filtered)}")
-    
-    # 保存更新后的Excel文件
-    df_filtered.to_excel('58同城多城市职位详细信息.xlsx', index=False)
-    print("Excel文件已更新")
-    
-    # 读取JSON文件
-    print("\n正在读取JSON文件...")
-    with open('58同城多城市职位详细信息.json', 'r', encoding='utf-8') as f:
-        json_data = json.load(f)
-    
-    print(f"原始JSON数据记录数: {len(json_data)}")
-    
-    # 删除JSON中该公司的记录
-    json_filtered = [record for record in json_data if record.get('企业名称') != company_to_remove]
-    print(f"删除后JSON数据记录数: {len(json_filtered)}")
-    
-    # 保存更新后的JSON文件
-    with open('58同城多城市职位详细信息.json', 'w', encoding='utf-8') as f:
-        json.dump(json_filtered, f, ensure_ascii=False, indent=2)
-    print("JSON文件已更新")
-    
-    print(f"\n✅ 成功删除 {company_to_remove} 的所有记录")
-else:
-    print(f"\n❌ 未找到 {company_to_remove} 的记录")
\ No newline at end of file
+EXCEL_FILE = '58同城多城市职位详细信息.xlsx'
+JSON_FILE = '58同城多城市职位详细信息.json'
+
+parser = argparse.ArgumentParser(description="删除某个企业的所有职位：重写增量日志、重新生成Excel和JSON文件，并同步到职位仓库")
+parser.add_argument("company", nargs="?", default=company_to_remove, help="要删除的企业名称")
+parser.add_argument("--db", default="job_warehouse.db", help="职位仓库文件（SQLite）")
+parser.add_argument("--no-export", action="store_true", help="只在仓库中删除，不修改增量日志、Excel和JSON文件")
+args = parser.parse_args()
+
+# Excel和JSON成品由增量日志生成，以日志为准
+sink = JsonlJobSink(EXCEL_FILE)
+if sink.is_empty() and os.path.exists(JSON_FILE):
+    # 成品来自没有增量日志的旧版本时，先把现有JSON写入日志
+    with open(JSON_FILE, 'r', encoding='utf-8') as f:
+        for record in json.load(f):
+            sink.append(record)
+    sink.flush()
+    print(f"增量日志为空，已从 {JSON_FILE} 生成")
+
+warehouse = JobWarehouse(args.db)
+try:
+    # 每次都先把当前成品同步到仓库（日志中带职位链接，主键与爬虫保存时相同），
+    # 避免仓库中的旧数据与成品不一致
+    import_files(warehouse, [sink.journal_filename])
+    all_records = sink.read_records()
+    records = [record for record in all_records if record.get('企业名称') == args.company]
+    print(f"原始数据总记录数: {len(all_records)}")
+    print(f"\n{args.company}的记录数: {len(records)}")
+
+    if records:
+        print("\n具体记录:")
+        for record in records:
+            print(f"  {record['岗位名称']} | {record['所属区域']} | {record['薪资范围起']}-{record['薪资范围至']}")
+
+        # 企业名称上有索引，仓库中删除只需一条SQL
+        deleted = warehouse.delete_company(name=args.company)
+        print(f"\n已从职位仓库删除 {deleted} 条记录，仓库中剩余 {warehouse.count()} 条记录")
+
+        if not args.no_export:
+            # 同时重写增量日志，之后的checkpoint不会再把删除的企业写回成品
+            sink.remove(lambda record: record.get('企业名称') == args.company)
+            print(f"增量日志已更新，删除后数据记录数: {sink.checkpoint()}")
+            print("Excel和JSON文件已更新")
+
+        print(f"\n✅ 成功删除 {args.company} 的所有记录")
+    else:
+        print(f"\n❌ 未找到 {args.company} 的记录")
+finally:
+    warehouse.close()
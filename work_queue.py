@@ -0,0 +1,177 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+from dedup_index import extract_job_id
+
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+
+LIST_QUEUE = 'list'
+JOB_QUEUE = 'job'
+
+# 一个待处理的任务：列表页或职位详情页
+Task = namedtuple("Task", ["id", "queue", "url", "city", "attempts"])
+
+
+def task_key(queue, url):
+    """任务去重键：职位按58信息ID（忽略跟踪参数），列表页按链接"""
+    return extract_job_id(url) if queue == JOB_QUEUE else url
+
+
+class WorkQueue:
+    """多机共享的任务队列（放在共享存储上的SQLite）
+
+    协调进程登记列表页，工作进程领取任务时取得有时限的租约（lease_seconds），处理期间定时
+    heartbeat续租；进程崩溃或断网导致租约过期的任务会重新分配给其他工作进程，尝试次数用完的
+    过期任务记为失败。工作进程把抓取结果写入results表，由协调进程作为唯一的写入者读取并保存。
+    """
+
+    def __init__(self, db_path="work_queue.db", lease_seconds=120, max_attempts=3, timeout=30, clock=time.time):
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        # 时间来源（各节点共用队列时间戳，默认墙上时间）
+        self.clock = clock
+        # 心跳线程与工作线程共用同一个连接
+        self._lock = threading.Lock()
+        # 自动提交模式，需要原子性的操作显式使用 BEGIN IMMEDIATE；timeout为等待其他节点写锁的秒数
+        self.conn = sqlite3.connect(db_path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, queue TEXT NOT NULL, task_key TEXT NOT NULL, url TEXT NOT NULL, "
+            "city TEXT, status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, worker TEXT, "
+            "lease_expires REAL, error TEXT, updated_at REAL NOT NULL, UNIQUE (queue, task_key))"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_queue_status ON tasks (queue, status, id)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, task_id INTEGER NOT NULL, url TEXT NOT NULL, "
+            "data TEXT NOT NULL, worker TEXT, created_at REAL NOT NULL)"
+        )
+
+    @contextmanager
+    def _transaction(self):
+        # BEGIN IMMEDIATE 立即取得写锁，多个节点同时领取任务时不会拿到同一个任务
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def put(self, queue, urls, city=None):
+        """登记任务（同一队列中已存在的键保持原状态），返回新登记的数量"""
+        now = self.clock()
+        with self._lock:
+            cursor = self.conn.executemany(
+                "INSERT OR IGNORE INTO tasks (queue, task_key, url, city, status, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                [(queue, task_key(queue, url), url, city, PENDING, now) for url in urls]
+            )
+        return cursor.rowcount
+
+    def _expire_exhausted(self, now):
+        """租约已过期且尝试次数用完的任务记为失败（不会再分配，否则一直停留在处理中）"""
+        self.conn.execute(
+            "UPDATE tasks SET status = ?, error = ?, updated_at = ? WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+            (FAILED, "租约过期且尝试次数已用完", now, LEASED, now, self.max_attempts)
+        )
+
+    def lease(self, queue, worker, n=1):
+        """领取最多n个任务：待处理的任务，或租约已过期的任务（重新分配）"""
+        now = self.clock()
+        with self._lock, self._transaction():
+            self._expire_exhausted(now)
+            rows = self.conn.execute(
+                "SELECT id, queue, url, city, attempts FROM tasks WHERE queue = ? AND attempts < ? AND "
+                "(status = ? OR (status = ? AND lease_expires < ?)) ORDER BY id LIMIT ?",
+                (queue, self.max_attempts, PENDING, LEASED, now, n)
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE tasks SET status = ?, worker = ?, lease_expires = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE id = ?",
+                [(LEASED, worker, now + self.lease_seconds, now, row[0]) for row in rows]
+            )
+        return [Task(task_id, queue, url, city, attempts + 1) for task_id, queue, url, city, attempts in rows]
+
+    def heartbeat(self, worker, task_ids):
+        """延长本进程持有的任务的租约，返回仍持有的任务数（租约已被重新分配的不再延长）"""
+        if not task_ids:
+            return 0
+        now = self.clock()
+        placeholders = ",".join("?" * len(task_ids))
+        with self._lock:
+            cursor = self.conn.execute(
+                f"UPDATE tasks SET lease_expires = ?, updated_at = ? WHERE status = ? AND worker = ? AND id IN ({placeholders})",
+                (now + self.lease_seconds, now, LEASED, worker, *task_ids)
+            )
+        return cursor.rowcount
+
+    def complete(self, task, worker, results=()):
+        """提交任务结果并标记完成；租约已被其他进程取得时放弃提交，返回False"""
+        now = self.clock()
+        with self._lock, self._transaction():
+            cursor = self.conn.execute(
+                "UPDATE tasks SET status = ?, error = NULL, updated_at = ? WHERE id = ? AND status = ? AND worker = ?",
+                (DONE, now, task.id, LEASED, worker)
+            )
+            if cursor.rowcount:
+                self.conn.executemany(
+                    "INSERT INTO results (task_id, url, data, worker, created_at) VALUES (?, ?, ?, ?, ?)",
+                    [(task.id, task.url, json.dumps(data, ensure_ascii=False), worker, now) for data in results]
+                )
+        return bool(cursor.rowcount)
+
+    def fail(self, task, worker, error):
+        """任务处理失败：尝试次数未用完时放回队列，否则记为失败"""
+        status = PENDING if task.attempts < self.max_attempts else FAILED
+        with self._lock:
+            self.conn.execute(
+                "UPDATE tasks SET status = ?, error = ?, updated_at = ? WHERE id = ? AND status = ? AND worker = ?",
+                (status, str(error)[:500], self.clock(), task.id, LEASED, worker)
+            )
+
+    def results(self, limit=100):
+        """读取尚未保存的结果 [(结果id, 链接, job_data)]，保存后调用ack_results删除"""
+        with self._lock:
+            rows = self.conn.execute("SELECT id, url, data FROM results ORDER BY id LIMIT ?", (limit,)).fetchall()
+        return [(result_id, url, json.loads(data)) for result_id, url, data in rows]
+
+    def ack_results(self, result_ids):
+        """删除已保存的结果"""
+        with self._lock:
+            self.conn.executemany("DELETE FROM results WHERE id = ?", [(result_id,) for result_id in result_ids])
+
+    def is_drained(self):
+        """没有待处理、处理中的任务，也没有未保存的结果"""
+        now = self.clock()
+        with self._lock:
+            self._expire_exhausted(now)
+            active = self.conn.execute(
+                "SELECT COUNT(*) FROM tasks WHERE (status = ? AND attempts < ?) OR status = ?",
+                (PENDING, self.max_attempts, LEASED)
+            ).fetchone()[0]
+            pending_results = self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return active == 0 and pending_results == 0
+
+    def clear(self):
+        """清空所有任务和结果"""
+        with self._lock:
+            self.conn.execute("DELETE FROM tasks")
+            self.conn.execute("DELETE FROM results")
+
+    def stats(self):
+        """返回 {(queue, status): 数量}"""
+        with self._lock:
+            rows = self.conn.execute("SELECT queue, status, COUNT(*) FROM tasks GROUP BY queue, status").fetchall()
+        return {(queue, status): count for queue, status, count in rows}
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
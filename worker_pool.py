@@ -0,0 +1,93 @@
+import queue
+import threading
+import time
+import logging
+
+
+class DetailWorkerPool:
+    """详情页并行抓取池
+
+    N个工作线程各自持有一个独立的爬虫实例（独立浏览器），从有界任务队列中
+    取职位链接抓取详情；抓取结果交给单一写入线程按原始顺序处理，
+    队列有界保证内存占用平稳。
+    """
+
+    def __init__(self, scraper_factory, workers=3, queue_size=None, job_delay=0.2):
+        self.scraper_factory = scraper_factory
+        self.workers = workers
+        self.job_delay = job_delay  # 每个工作线程处理完一个职位后的延时
+        size = queue_size or workers * 2
+        self.task_queue = queue.Queue(maxsize=size)
+        self.result_queue = queue.Queue(maxsize=size)
+        self.scrapers = []
+        self.threads = []
+
+    def start(self):
+        """启动浏览器和工作线程"""
+        for n in range(self.workers):
+            try:
+                self.scrapers.append(self.scraper_factory())
+            except Exception as e:
+                logging.error(f"启动第{n + 1}个浏览器工作线程失败: {e}")
+        if not self.scrapers:
+            raise RuntimeError("没有可用的浏览器工作线程")
+
+        for n, scraper in enumerate(self.scrapers, 1):
+            thread = threading.Thread(target=self._worker_loop, args=(scraper,), name=f"worker-{n}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        logging.info(f"已启动 {len(self.threads)} 个浏览器工作线程")
+
+    def _worker_loop(self, scraper):
+        while True:
+            task = self.task_queue.get()
+            if task is None:
+                break
+            index, url = task
+            job_data, error = None, None
+            try:
+                job_data = scraper.scrape_job_detail_page(url)
+            except Exception as e:
+                error = e
+            self.result_queue.put((index, url, job_data, error))
+            time.sleep(self.job_delay)
+
+    def _writer_loop(self, total, on_result):
+        # 结果可能乱序返回，缓存后按原始序号依次交给on_result
+        pending = {}
+        next_index = 1
+        while next_index <= total:
+            index, url, job_data, error = self.result_queue.get()
+            pending[index] = (url, job_data, error)
+            while next_index in pending:
+                url, job_data, error = pending.pop(next_index)
+                try:
+                    on_result(next_index, url, job_data, error)
+                except Exception as e:
+                    logging.error(f"处理第{next_index}个职位结果失败: {e}")
+                next_index += 1
+
+    def run(self, urls, on_result):
+        """抓取一批职位链接，on_result(序号, 链接, job_data, 异常)在写入线程中按顺序调用"""
+        if not self.threads:
+            self.start()
+
+        writer = threading.Thread(target=self._writer_loop, args=(len(urls), on_result), name="writer")
+        writer.start()
+        for index, url in enumerate(urls, 1):
+            self.task_queue.put((index, url))  # 队列已满时阻塞，控制内存占用
+        writer.join()
+
+    def close(self):
+        """停止工作线程并关闭所有浏览器"""
+        for _ in self.threads:
+            self.task_queue.put(None)
+        for thread in self.threads:
+            thread.join()
+        for scraper in self.scrapers:
+            try:
+                scraper.close()
+            except Exception as e:
+                logging.error(f"关闭浏览器工作线程失败: {e}")
+        self.threads = []
+        self.scrapers = []